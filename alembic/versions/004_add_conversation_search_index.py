@@ -0,0 +1,84 @@
+"""Add full-text search over conversation messages.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-16
+
+PostgreSQL gets a GIN expression index over ``to_tsvector`` of message content;
+the expression must stay identical to ``content_tsvector`` in
+atlas/modules/chat_history/models.py or queries will not use it.
+
+Other databases (DuckDB) search through the ``conversation_search_terms`` side
+table of per-message term postings, which this migration creates and backfills
+from the messages already stored. The table is created on PostgreSQL too so the
+schema matches the models everywhere; it simply stays empty there.
+
+``chat_history_data_migrations`` records that the backfill has run, so
+``init_database`` does not rescan every message on each startup.
+
+No database-level foreign key constraints for DuckDB compatibility.
+Referential integrity is enforced in the application/repository layer.
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from alembic import op
+
+revision = "004"
+down_revision = "003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_history_data_migrations",
+        sa.Column("name", sa.String(64), primary_key=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_table(
+        "conversation_search_terms",
+        sa.Column("message_id", sa.String(36), primary_key=True),
+        sa.Column("term", sa.String(64), primary_key=True),
+        sa.Column("conversation_id", sa.String(36), nullable=False, index=True),
+        sa.Column("user_email", sa.String(255), nullable=False),
+        sa.Column("tf", sa.Integer, nullable=False),
+    )
+    op.create_index(
+        "ix_conversation_search_terms_user_term",
+        "conversation_search_terms",
+        ["user_email", "term"],
+    )
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.create_index(
+            "ix_conversation_messages_content_fts",
+            "conversation_messages",
+            [sa.text("to_tsvector('english'::regconfig, coalesce(content, ''))")],
+            postgresql_using="gin",
+        )
+    else:
+        from atlas.modules.chat_history.search_index import (
+            backfill_search_index,
+            get_search_index,
+        )
+
+        session = Session(bind=bind)
+        backfill_search_index(session, get_search_index(bind.dialect.name))
+        session.flush()
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index(
+            "ix_conversation_messages_content_fts",
+            table_name="conversation_messages",
+        )
+    op.drop_index(
+        "ix_conversation_search_terms_user_term",
+        table_name="conversation_search_terms",
+    )
+    op.drop_table("conversation_search_terms")
+    op.drop_table("chat_history_data_migrations")
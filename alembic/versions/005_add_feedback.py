@@ -0,0 +1,43 @@
+"""Add feedback table.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-16
+
+User feedback used to be one JSON file per submission under
+RUNTIME_FEEDBACK_DIR, and every admin view opened all of them. Existing files
+are copied in by the application on its first start with chat history
+enabled, or with ``scripts/import_feedback_json.py``.
+
+No database-level foreign key constraints for DuckDB compatibility.
+Referential integrity is enforced in the application/repository layer.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "005"
+down_revision = "004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "feedback",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("user_email", sa.String(255), nullable=False),
+        sa.Column("rating", sa.Integer, nullable=True),
+        sa.Column("comment", sa.Text, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("session_info_json", sa.Text, nullable=True),
+        sa.Column("server_context_json", sa.Text, nullable=True),
+        sa.Column("conversation_history", sa.Text, nullable=True),
+    )
+    op.create_index("ix_feedback_created", "feedback", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_feedback_created", table_name="feedback")
+    op.drop_table("feedback")
@@ -77,6 +77,7 @@ class ChatService:
         event_publisher: Optional[EventPublisher] = None,
         session_repository: Optional[SessionRepository] = None,
         conversation_repository: Optional[Any] = None,
+        conversation_writer: Optional[Any] = None,
     ):
         """
         Initialize chat service with dependencies.
@@ -90,6 +91,10 @@ class ChatService:
             agent_loop_factory: Factory for creating agent loops (optional)
             event_publisher: Event publisher for UI updates (optional, will create default)
             session_repository: Session storage repository (optional, will create default)
+            conversation_repository: Chat history repository (None when persistence is disabled)
+            conversation_writer: Write-behind queue in front of ``conversation_repository``
+                (optional). When set, saves run off the event loop; otherwise they call
+                the repository directly.
         """
         self.llm = llm
         self.tool_manager = tool_manager
@@ -106,7 +111,14 @@ class ChatService:
         else:
             # Create default WebSocket publisher
             from atlas.infrastructure.events.websocket_publisher import WebSocketEventPublisher
-            self.event_publisher = WebSocketEventPublisher(connection=self.connection)
+            coalesce = {}
+            if self.config_manager is not None:
+                settings = self.config_manager.app_settings
+                coalesce = {
+                    "token_coalesce_window_ms": settings.token_stream_coalesce_window_ms,
+                    "token_coalesce_max_bytes": settings.token_stream_coalesce_max_bytes,
+                }
+            self.event_publisher = WebSocketEventPublisher(connection=self.connection, **coalesce)
 
         # Initialize or use provided session repository
         if session_repository is not None:
@@ -118,6 +130,7 @@ class ChatService:
 
         # Chat history persistence (None when feature disabled)
         self.conversation_repository = conversation_repository
+        self.conversation_writer = conversation_writer
         if self.conversation_repository is not None and not callable(
             getattr(self.conversation_repository, "get_conversation_owner", None)
         ):
@@ -656,13 +669,22 @@ class ChatService:
             and user_email
         ):
             try:
-                saved = self._save_conversation(
-                    session,
-                    user_email,
-                    model,
-                    start_index=save_floor,
-                    allow_shrink=allow_shrink,
-                )
+                if self.conversation_writer is not None:
+                    saved = await self._save_conversation_behind(
+                        session,
+                        user_email,
+                        model,
+                        start_index=save_floor,
+                        allow_shrink=allow_shrink,
+                    )
+                else:
+                    saved = self._save_conversation(
+                        session,
+                        user_email,
+                        model,
+                        start_index=save_floor,
+                        allow_shrink=allow_shrink,
+                    )
                 # Notify frontend only when persistence actually succeeded.
                 # When save_conversation returns None (the TOCTOU window
                 # between ownership validation and the upsert), surface
@@ -1181,12 +1203,50 @@ class ChatService:
         ``conversation_saved`` when this returns False, otherwise the
         client believes a turn was persisted that was not.
         """
-        if not session or not session.history.messages:
+        request = self._build_save_request(session, user_email, model, start_index, allow_shrink)
+        if request is None:
+            return False
+        record = self.conversation_repository.save_conversation(**request)
+        return self._save_accepted(record, request["conversation_id"])
+
+    async def _save_conversation_behind(
+        self,
+        session: Session,
+        user_email: str,
+        model: str,
+        start_index: int = 0,
+        allow_shrink: bool = False,
+    ) -> bool:
+        """``_save_conversation`` through the write-behind queue.
+
+        The database work runs on the writer thread, so the event loop keeps
+        streaming other users' turns meanwhile. Resolves only once the write
+        is committed, which keeps ``conversation_saved`` a durable promise.
+        """
+        request = self._build_save_request(session, user_email, model, start_index, allow_shrink)
+        if request is None:
             return False
+        record = await self.conversation_writer.save(**request)
+        return self._save_accepted(record, request["conversation_id"])
+
+    def _build_save_request(
+        self,
+        session: Session,
+        user_email: str,
+        model: str,
+        start_index: int,
+        allow_shrink: bool,
+    ) -> Optional[Dict[str, Any]]:
+        """Assemble ``save_conversation`` keyword arguments for ``session``.
+
+        Returns None when there is nothing savable.
+        """
+        if not session or not session.history.messages:
+            return None
 
         savable_messages = session.history.messages[start_index:]
         if not savable_messages:
-            return False
+            return None
 
         messages = []
         for msg in savable_messages:
@@ -1228,17 +1288,21 @@ class ChatService:
                     title = msg.content[:200]
                     break
 
-        record = self.conversation_repository.save_conversation(
-            conversation_id=conv_id,
-            user_email=normalize_user_email(user_email),
-            title=title,
-            model=model,
-            messages=messages,
-            metadata={
+        return {
+            "conversation_id": conv_id,
+            "user_email": normalize_user_email(user_email),
+            "title": title,
+            "model": model,
+            "messages": messages,
+            "metadata": {
                 "agent_mode": bool(session.context.get("agent_mode")),
             },
-            allow_shrink=allow_shrink,
-        )
+            "allow_shrink": allow_shrink,
+        }
+
+    @staticmethod
+    def _save_accepted(record: Any, conv_id: str) -> bool:
+        """Log a repository rejection; True when the save went through."""
         if record is None:
             logger.warning(
                 "Conversation %s save rejected by repository (owned by another "
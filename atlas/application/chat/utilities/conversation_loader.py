@@ -17,6 +17,7 @@ rewrite the stored record.
 import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
+from uuid import UUID
 
 from atlas.core.log_sanitizer import sanitize_for_logging
 from atlas.domain.messages.models import ConversationHistory, Message, MessageRole
@@ -39,6 +40,16 @@ def _parse_timestamp(value: Any) -> Optional[datetime]:
         return None
 
 
+def _parse_message_id(value: Any) -> Optional[UUID]:
+    """Parse a persisted message id; ``None`` when absent or not a UUID."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return UUID(value)
+    except ValueError:
+        return None
+
+
 def load_messages_into_history(
     history: ConversationHistory,
     messages: List[Dict[str, Any]],
@@ -85,6 +96,14 @@ def load_messages_into_history(
         timestamp = _parse_timestamp(msg_data.get("timestamp"))
         extra = {"timestamp": timestamp} if timestamp is not None else {}
 
+        # Keep the stored id as well. The repository appends only the new tail
+        # when the stored rows are an id-for-id prefix of the history it is
+        # handed, so a fresh id here would force the first save after every
+        # restore back onto the full rewrite.
+        message_id = _parse_message_id(msg_data.get("id"))
+        if message_id is not None:
+            extra["id"] = message_id
+
         history.add_message(
             Message(
                 role=message_role,
@@ -5,11 +5,14 @@ import hmac
 import logging
 import re
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
 import httpx
 import jwt
 
+from atlas.core.group_cache import GroupMembershipCache
+from atlas.core.http_client import http_clients
+from atlas.core.user_config_cache import invalidate_config_cache
 from atlas.modules.config.config_manager import config_manager
 
 logger = logging.getLogger(__name__)
@@ -38,6 +41,51 @@ def _prune_alb_cache() -> None:
         _alb_key_cache.pop(oldest, None)
 
 
+# Lazily created from settings by get_group_cache().
+_group_cache: Optional[GroupMembershipCache] = None
+
+
+def get_group_cache() -> GroupMembershipCache:
+    """Return the process-wide group-membership cache."""
+    global _group_cache
+    if _group_cache is None:
+        app_settings = config_manager.app_settings
+        _group_cache = GroupMembershipCache(
+            ttl_seconds=app_settings.auth_group_cache_ttl_seconds,
+            negative_ttl_seconds=app_settings.auth_group_cache_negative_ttl_seconds,
+        )
+    return _group_cache
+
+
+def invalidate_group_cache(user_id: str) -> int:
+    """Forget cached group decisions for ``user_id``; returns how many.
+
+    The user's cached ``/api/config`` response goes too, since it reflects
+    those decisions.
+    """
+    invalidate_config_cache(user_id)
+    if _group_cache is None:
+        return 0
+    return _group_cache.invalidate_user(user_id)
+
+
+async def _query_group_authorizer(user_id: str, group_id: str) -> bool:
+    """Ask ``AUTH_GROUP_CHECK_URL`` whether the user is in the group.
+
+    Raises on transport or HTTP errors so that failures are not cached.
+    """
+    app_settings = config_manager.app_settings
+    async with http_clients.client("auth_group_check") as client:
+        headers = {"Authorization": f"Bearer {app_settings.auth_group_check_api_key}"}
+        payload = {"user_id": user_id, "group_id": group_id}
+        response = await client.post(
+            app_settings.auth_group_check_url, json=payload, headers=headers, timeout=5.0
+        )
+        response.raise_for_status()
+        # Assuming the endpoint returns a simple JSON like {"is_member": true}
+        return response.json().get("is_member", False)
+
+
 async def is_user_in_group(user_id: str, group_id: str) -> bool:
     """
     Check if a user is in a specified group.
@@ -51,6 +99,7 @@ async def is_user_in_group(user_id: str, group_id: str) -> bool:
        only ever override the mock table below, never a real authorization service.
     2. External endpoint: when ``AUTH_GROUP_CHECK_URL`` and ``AUTH_GROUP_CHECK_API_KEY``
        are configured, query the HTTP authorization service for membership.
+       Answers are cached per (user, group) -- see ``get_group_cache``.
     3. Mock table (fallback for local development): everyone is in the ``users``
        group; the debug-only mock table grants admin to the configured test users.
 
@@ -88,15 +137,10 @@ async def is_user_in_group(user_id: str, group_id: str) -> bool:
     api_key = app_settings.auth_group_check_api_key
 
     if auth_url and api_key:
-        # Use the external HTTP endpoint for authorization
+        # Use the external HTTP endpoint for authorization, through the
+        # membership cache so repeated checks do not each cost a round-trip.
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {"Authorization": f"Bearer {api_key}"}
-                payload = {"user_id": user_id, "group_id": group_id}
-                response = await client.post(auth_url, json=payload, headers=headers, timeout=5.0)
-                response.raise_for_status()
-                # Assuming the endpoint returns a simple JSON like {"is_member": true}
-                return response.json().get("is_member", False)
+            return await get_group_cache().get_or_load(user_id, group_id, _query_group_authorizer)
         except httpx.RequestError as e:
             logger.error(f"HTTP request to auth endpoint failed: {e}", exc_info=True)
             return False
@@ -132,6 +176,17 @@ async def is_user_in_group(user_id: str, group_id: str) -> bool:
         return group_id in user_groups
 
 
+async def check_user_groups(user_id: str, group_ids: Iterable[str]) -> Dict[str, bool]:
+    """Check several groups at once; returns ``{group_id: is_member}``.
+
+    Each distinct group is checked concurrently through ``is_user_in_group``
+    (and so through the membership cache).
+    """
+    unique = list(dict.fromkeys(group_ids))
+    results = await asyncio.gather(*(is_user_in_group(user_id, group) for group in unique))
+    return dict(zip(unique, results))
+
+
 def _get_alb_public_key(kid: str, aws_region: str) -> Optional[str]:
     """
     Fetch and cache AWS ALB public key by key ID.
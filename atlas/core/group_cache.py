@@ -0,0 +1,58 @@
+"""TTL cache for group-membership decisions.
+
+``is_user_in_group`` asks the external authorizer (``AUTH_GROUP_CHECK_URL``)
+on every call, and a single page load or chat turn repeats the same
+(user, group) questions many times over. This cache remembers each answer --
+"yes" for ``ttl_seconds`` and "no" for the usually shorter
+``negative_ttl_seconds`` -- and collapses concurrent lookups of the same key
+into a single upstream request.
+
+Failed lookups are never cached, users are keyed by their normalized email,
+and invalidation is per process -- see ``SingleFlightTTLCache``. Other
+workers keep their answers until the TTL runs out.
+"""
+
+import logging
+from typing import Awaitable, Callable, Optional
+
+from atlas.core.ttl_cache import SingleFlightTTLCache
+
+logger = logging.getLogger(__name__)
+
+GroupLoader = Callable[[str, str], Awaitable[bool]]
+
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class GroupMembershipCache(SingleFlightTTLCache):
+    """Per-(user, group) membership cache with negative caching and
+    stampede protection."""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        super().__init__(ttl_seconds, max_entries)
+        self.negative_ttl_seconds = negative_ttl_seconds
+
+    def get(self, user_id: str, group_id: str) -> Optional[bool]:
+        """Return the cached decision, or None if absent or expired."""
+        return self._lookup((self.user_key(user_id), group_id))
+
+    def put(self, user_id: str, group_id: str, is_member: bool) -> None:
+        ttl = self.ttl_seconds if is_member else self.negative_ttl_seconds
+        self._store((self.user_key(user_id), group_id), is_member, ttl)
+
+    async def get_or_load(self, user_id: str, group_id: str, loader: GroupLoader) -> bool:
+        """Return the cached decision, calling ``loader`` at most once per key
+        however many callers are waiting for it."""
+        return bool(await self._get_or_load(
+            (self.user_key(user_id), group_id),
+            lambda: loader(user_id, group_id),
+            lambda is_member: self.put(user_id, group_id, bool(is_member)),
+        ))
+
+    def clear(self) -> None:
+        self.invalidate()
@@ -1,13 +1,155 @@
 """
-Minimal HTTP client stub for basic chat functionality.
-This is a temporary implementation for testing.
+Shared outbound HTTP clients.
+
+``http_clients`` keeps one pooled ``httpx.AsyncClient`` per upstream (RAG,
+auth group check, file extractors) so requests reuse keep-alive connections
+instead of paying TCP and TLS setup on every call. The registry is started
+and closed by the app lifespan; outside of it (CLIs, tests) ``client()``
+falls back to a one-shot client so callers never need to care.
+
+Also holds a minimal RAG client stub for basic chat functionality.
 """
 
+import asyncio
+import importlib.util
 import logging
-from typing import Any
+from contextlib import asynccontextmanager
+from http.cookiejar import CookieJar
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import httpx
 
 logger = logging.getLogger(__name__)
 
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _new_counters() -> Dict[str, int]:
+    return {"requests_total": 0, "in_flight": 0, "peak_in_flight": 0}
+
+
+class _NoCookieJar(CookieJar):
+    """Cookie jar that never stores anything.
+
+    A pooled client is shared by every user's requests, so a cookie set by
+    an upstream for one user must not be replayed on the next user's call.
+    """
+
+    def extract_cookies(self, response: Any, request: Any) -> None:
+        return None
+
+    def set_cookie(self, cookie: Any) -> None:
+        return None
+
+
+class HTTPClientRegistry:
+    """Lifecycle-managed, per-upstream pool of ``httpx.AsyncClient`` objects."""
+
+    def __init__(self) -> None:
+        self._clients: Dict[Tuple[str, Any], httpx.AsyncClient] = {}
+        self._create_locks: Dict[Tuple[str, Any], asyncio.Lock] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._started = False
+        self._limits: Optional[httpx.Limits] = None
+        self._http2 = False
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    def start(self, app_settings: Any = None) -> None:
+        """Enable pooling, sizing each upstream's pool from ``app_settings``."""
+        if app_settings is None:
+            from atlas.modules.config import config_manager
+            app_settings = config_manager.app_settings
+        self._limits = httpx.Limits(
+            max_connections=app_settings.http_client_max_connections,
+            max_keepalive_connections=app_settings.http_client_max_keepalive_connections,
+            keepalive_expiry=app_settings.http_client_keepalive_expiry_seconds,
+        )
+        self._http2 = bool(app_settings.http_client_http2) and _HTTP2_AVAILABLE
+        self._started = True
+        logger.info(
+            "Shared HTTP clients enabled (max_connections=%d per upstream, http2=%s)",
+            app_settings.http_client_max_connections,
+            self._http2,
+        )
+
+    async def aclose(self) -> None:
+        """Close every pooled client; later calls fall back to one-shot clients."""
+        self._started = False
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            try:
+                await client.aclose()
+            except Exception as e:  # noqa: BLE001
+                logger.warning("Error closing shared HTTP client: %s", e)
+
+    @asynccontextmanager
+    async def client(self, upstream: str, timeout: Any = None) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the pooled client for ``upstream`` (one per distinct timeout).
+
+        The client must not be closed by the caller.
+        """
+        stats = self._stats.setdefault(upstream, _new_counters())
+        stats["requests_total"] += 1
+        stats["in_flight"] += 1
+        stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+        try:
+            if not self._started:
+                async with httpx.AsyncClient(timeout=timeout) as one_shot:
+                    yield one_shot
+                return
+
+            key = (upstream, timeout)
+            client = self._clients.get(key)
+            if client is None or client.is_closed:
+                client = await self._create(key)
+            yield client
+        finally:
+            stats["in_flight"] -= 1
+
+    async def _create(self, key: Tuple[str, Any]) -> httpx.AsyncClient:
+        # Concurrent first requests for one upstream would each build a
+        # client across the await below; only one may win.
+        lock = self._create_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            client = self._clients.get(key)
+            if client is not None and not client.is_closed:
+                return client
+            client = httpx.AsyncClient(
+                timeout=key[1],
+                limits=self._limits,
+                http2=self._http2,
+                cookies=_NoCookieJar(),
+            )
+            # Enter once here and exit in aclose(), so the pool stays open
+            # for the app's lifetime.
+            client = await client.__aenter__()
+            self._clients[key] = client
+            return client
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-upstream request counters and pool utilization."""
+        result: Dict[str, Dict[str, int]] = {
+            upstream: {**counters, "connections": 0, "idle_connections": 0}
+            for upstream, counters in self._stats.items()
+        }
+        for (upstream, _timeout), client in self._clients.items():
+            # httpx does not expose its pool publicly; read httpcore's
+            # connection list when it is there and skip it otherwise.
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            connections = getattr(pool, "connections", None) or []
+            entry = result.setdefault(
+                upstream, {**_new_counters(), "connections": 0, "idle_connections": 0}
+            )
+            entry["connections"] += len(connections)
+            entry["idle_connections"] += sum(1 for c in connections if c.is_idle())
+        return result
+
+
+http_clients = HTTPClientRegistry()
+
 
 def create_rag_client(base_url: str = "", timeout: float = 30.0) -> Any:
     """
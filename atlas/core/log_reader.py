@@ -0,0 +1,304 @@
+"""Tail-seeking reads over the JSON Lines application log.
+
+The admin log viewer only ever wants the newest records, so instead of
+streaming ``app.jsonl`` from the top this module reads it backwards from EOF
+in fixed-size blocks and stops as soon as enough records match. Level and
+module filters are checked against the raw bytes before a line is parsed, so
+non-matching lines cost a substring test rather than a ``json.loads``.
+
+Positions handed to clients are plain byte offsets of line starts: reading
+``before=<offset>`` continues with older records, and ``read_since`` follows
+the file forward from an offset for the live stream. Only complete
+(newline-terminated) lines are returned; a line still being written is picked
+up on the next read.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+BLOCK_SIZE = 64 * 1024
+MAX_SCAN_BYTES = 32 * 1024 * 1024
+MAX_FOLLOW_BYTES = 1024 * 1024
+CLEAR_MARKER = "NEW LOG"
+
+_PLAIN_LINE = re.compile(
+    r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})[,\s-]*(\w+)[,\s-]*([^-]*)[,\s-]*(.*)"
+)
+
+
+@dataclass
+class LogPage:
+    """Newest-last slice of the log plus the offsets to continue from."""
+
+    entries: List[Dict[str, Any]] = field(default_factory=list)
+    # Pass as ``before`` to load older records; None once the start is reached.
+    next_cursor: Optional[int] = None
+    # End of the last complete line at read time; pass to ``read_since``.
+    end_offset: int = 0
+
+
+def _empty_entry() -> Dict[str, Any]:
+    return {
+        "timestamp": "",
+        "level": "INFO",
+        "module": "unknown",
+        "logger": "unknown",
+        "function": "",
+        "message": "",
+        "trace_id": "",
+        "span_id": "",
+        "line": "",
+        "thread_name": "",
+        "extras": {},
+    }
+
+
+def parse_log_line(raw: str) -> Optional[Dict[str, Any]]:
+    """Normalize one log line for the viewer; None for blanks and clear markers."""
+    raw = raw.strip()
+    if not raw or raw == CLEAR_MARKER:
+        return None
+    try:
+        entry = json.loads(raw)
+    except json.JSONDecodeError:
+        entry = None
+    if isinstance(entry, dict):
+        return {
+            "timestamp": entry.get("timestamp", ""),
+            "level": entry.get("level", "UNKNOWN"),
+            "module": entry.get("module", entry.get("logger", "")),
+            "logger": entry.get("logger", ""),
+            "function": entry.get("function", ""),
+            "message": entry.get("message", ""),
+            "trace_id": entry.get("trace_id", ""),
+            "span_id": entry.get("span_id", ""),
+            "line": entry.get("line", ""),
+            "thread_name": entry.get("thread_name", ""),
+            "extras": {k: v for k, v in entry.items() if k.startswith("extra_")},
+        }
+    processed = _empty_entry()
+    m = _PLAIN_LINE.match(raw)
+    if m:
+        ts, lvl, mod, msg = m.groups()
+        processed.update(
+            timestamp=ts.strip(), level=lvl.strip().upper(),
+            module=mod.strip(), logger=mod.strip(), message=msg.strip(),
+        )
+    else:
+        processed["message"] = raw
+    return processed
+
+
+class _LineFilter:
+    """Level/module filter with a raw-byte prefilter for JSON lines."""
+
+    def __init__(self, level: Optional[str] = None, module: Optional[str] = None):
+        self.level = level or None
+        self.module = module or None
+        self._needles = [
+            {json.dumps(v).encode(), json.dumps(v, ensure_ascii=False).encode("utf-8")}
+            for v in (self.level, self.module) if v
+        ]
+
+    def parse(self, raw: bytes) -> Optional[Dict[str, Any]]:
+        # JSON values appear verbatim as quoted strings, so a JSON line that
+        # lacks any of them cannot match. Plain-text lines are always parsed.
+        if raw.lstrip().startswith(b"{"):
+            for needles in self._needles:
+                if not any(n in raw for n in needles):
+                    return None
+        entry = parse_log_line(raw.decode("utf-8", errors="replace"))
+        if entry is None:
+            return None
+        if self.level and entry["level"] != self.level:
+            return None
+        if self.module and entry["module"] != self.module:
+            return None
+        return entry
+
+
+def _complete_end(fh: BinaryIO, end: int, block_size: int) -> int:
+    """Offset just past the last newline at or before ``end`` (0 if none)."""
+    pos = end
+    while pos > 0:
+        start = max(0, pos - block_size)
+        fh.seek(start)
+        idx = fh.read(pos - start).rfind(b"\n")
+        if idx >= 0:
+            return start + idx + 1
+        pos = start
+    return 0
+
+
+def iter_lines_backward(
+    fh: BinaryIO, end: int, block_size: int = BLOCK_SIZE
+) -> Iterator[Tuple[int, bytes]]:
+    """Yield ``(offset, line)`` for complete lines ending at or before ``end``, newest first."""
+    pos = _complete_end(fh, end, block_size)
+    buf = b""  # bytes from ``pos``; buf[:stop] always ends in a newline
+    if pos:
+        start = max(0, pos - block_size)
+        fh.seek(start)
+        buf, pos = fh.read(pos - start), start
+    stop = len(buf)
+    while stop:
+        idx = buf.rfind(b"\n", 0, stop - 1)
+        if idx < 0 and pos > 0:
+            start = max(0, pos - block_size)
+            fh.seek(start)
+            buf, pos = fh.read(pos - start) + buf[:stop], start
+            stop = len(buf)
+            continue
+        yield pos + idx + 1, buf[idx + 1:stop - 1]
+        stop = idx + 1
+
+
+def read_tail(
+    path: Path,
+    limit: int,
+    *,
+    level: Optional[str] = None,
+    module: Optional[str] = None,
+    before: Optional[int] = None,
+    max_scan_bytes: int = MAX_SCAN_BYTES,
+    block_size: int = BLOCK_SIZE,
+) -> LogPage:
+    """The newest ``limit`` matching records ending at or before ``before``.
+
+    The scan stops after ``max_scan_bytes`` even if fewer records matched, so a
+    filter that matches nothing never reads a huge file in one request; the
+    returned ``next_cursor`` lets the client keep going.
+    """
+    line_filter = _LineFilter(level, module)
+    page = LogPage()
+    with path.open("rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        page.end_offset = _complete_end(fh, size, block_size)
+        end = size if before is None else min(before, size)
+        newest_first: List[Dict[str, Any]] = []
+        scanned = 0
+        for offset, raw in iter_lines_backward(fh, end, block_size):
+            scanned += len(raw) + 1
+            entry = line_filter.parse(raw)
+            if entry is not None:
+                newest_first.append(entry)
+            if len(newest_first) >= limit or scanned >= max_scan_bytes:
+                page.next_cursor = offset or None
+                break
+    page.entries = newest_first[::-1]
+    return page
+
+
+def read_since(
+    path: Path,
+    offset: int,
+    *,
+    level: Optional[str] = None,
+    module: Optional[str] = None,
+    max_bytes: int = MAX_FOLLOW_BYTES,
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], int, bool]:
+    """Records appended after ``offset``, for following the log.
+
+    Returns ``(events, new_offset, reset)`` where each event is
+    ``(end_offset, entry)``. ``reset`` is True when the file shrank below
+    ``offset`` (cleared or rotated) and reading restarted from the top.
+    """
+    line_filter = _LineFilter(level, module)
+    with path.open("rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        reset = size < offset
+        if reset:
+            offset = 0
+        fh.seek(offset)
+        data = fh.read(min(size - offset, max_bytes))
+        if len(data) == max_bytes and b"\n" not in data:
+            data += fh.readline()  # finish an oversized line rather than stall on it
+    complete = data.rfind(b"\n") + 1
+    events: List[Tuple[int, Dict[str, Any]]] = []
+    pos = offset
+    for raw in data[:complete].split(b"\n")[:-1]:
+        pos += len(raw) + 1
+        entry = line_filter.parse(raw)
+        if entry is not None:
+            events.append((pos, entry))
+    return events, offset + complete, reset
+
+
+def tail_lines(path: Path, count: int, block_size: int = BLOCK_SIZE) -> List[bytes]:
+    """The last ``count`` non-blank complete lines, oldest first."""
+    lines: List[bytes] = []
+    if count <= 0:
+        return lines
+    with path.open("rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        for _offset, raw in iter_lines_backward(fh, size, block_size):
+            if raw.strip():
+                lines.append(raw)
+                if len(lines) >= count:
+                    break
+    return lines[::-1]
+
+
+class LineCounter:
+    """Line counts that only read bytes appended since the previous call.
+
+    Each path remembers its inode, the size counted so far and the bytes just
+    before that size; if any of those no longer match (rotation, truncation,
+    a cleared-then-regrown file) the file is recounted from the start.
+    """
+
+    _FINGERPRINT_BYTES = 64
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._state: Dict[str, Tuple[int, int, int, bytes]] = {}
+
+    def _fingerprint(self, fh: BinaryIO, size: int) -> bytes:
+        start = max(0, size - self._FINGERPRINT_BYTES)
+        fh.seek(start)
+        return fh.read(size - start)
+
+    def count(self, path: Path) -> int:
+        key = str(path)
+        with self._lock:
+            with path.open("rb") as fh:
+                st = os.fstat(fh.fileno())
+                size = st.st_size
+                start, newlines = 0, 0
+                state = self._state.get(key)
+                if state is not None:
+                    inode, counted, prev_newlines, fingerprint = state
+                    if (
+                        inode == st.st_ino
+                        and counted <= size
+                        and self._fingerprint(fh, counted) == fingerprint
+                    ):
+                        start, newlines = counted, prev_newlines
+                fh.seek(start)
+                remaining = size - start
+                while remaining > 0:
+                    chunk = fh.read(min(BLOCK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    newlines += chunk.count(b"\n")
+                    remaining -= len(chunk)
+                size -= remaining
+                fingerprint = self._fingerprint(fh, size)
+            self._state[key] = (st.st_ino, size, newlines, fingerprint)
+        # Match ``sum(1 for _ in f)``: an unterminated last line still counts.
+        return newlines + (1 if fingerprint and not fingerprint.endswith(b"\n") else 0)
+
+
+_line_counter = LineCounter()
+
+
+def count_lines(path: Path) -> int:
+    """Line count of ``path``, read incrementally across calls."""
+    return _line_counter.count(path)
@@ -13,6 +13,7 @@ import json
 import logging
 import os
 import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -25,6 +26,10 @@ from opentelemetry.sdk.resources import SERVICE_NAME, SERVICE_VERSION, Resource
 from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
 
+from atlas.core import log_reader, span_index
+from atlas.core.span_rollups import DEFAULT_FLUSH_SECONDS, SpanRollupProcessor
+from atlas.core.span_store import SegmentInfo, SpanStore, hour_bucket
+
 
 class JSONFormatter(logging.Formatter):
     """Format log records as JSON lines."""
@@ -68,6 +73,28 @@ class JSONFormatter(logging.Formatter):
         return json.dumps(entry, default=str)
 
 
+def span_to_record(span: ReadableSpan) -> Dict[str, Any]:
+    """The JSON record written per span (contract in ``docs/telemetry/README.md``)."""
+    ctx = span.get_span_context()
+    parent = span.parent
+    return {
+        "name": span.name,
+        "trace_id": f"{ctx.trace_id:032x}",
+        "span_id": f"{ctx.span_id:016x}",
+        "parent_span_id": f"{parent.span_id:016x}" if parent else None,
+        "start_time_ns": span.start_time,
+        "end_time_ns": span.end_time,
+        "duration_ns": (
+            span.end_time - span.start_time
+            if span.start_time and span.end_time
+            else None
+        ),
+        "status": span.status.status_code.name if span.status else None,
+        "kind": span.kind.name if span.kind else None,
+        "attributes": dict(span.attributes or {}),
+    }
+
+
 class JSONLSpanExporter(SpanExporter):
     """Append one JSON line per finished span to a file.
 
@@ -112,25 +139,7 @@ class JSONLSpanExporter(SpanExporter):
                 return SpanExportResult.FAILURE
             try:
                 for span in spans:
-                    ctx = span.get_span_context()
-                    parent = span.parent
-                    record: Dict[str, Any] = {
-                        "name": span.name,
-                        "trace_id": f"{ctx.trace_id:032x}",
-                        "span_id": f"{ctx.span_id:016x}",
-                        "parent_span_id": f"{parent.span_id:016x}" if parent else None,
-                        "start_time_ns": span.start_time,
-                        "end_time_ns": span.end_time,
-                        "duration_ns": (
-                            span.end_time - span.start_time
-                            if span.start_time and span.end_time
-                            else None
-                        ),
-                        "status": span.status.status_code.name if span.status else None,
-                        "kind": span.kind.name if span.kind else None,
-                        "attributes": dict(span.attributes or {}),
-                    }
-                    self._fh.write(json.dumps(record, default=str) + "\n")
+                    self._fh.write(json.dumps(span_to_record(span), default=str) + "\n")
                 self._fh.flush()
                 return SpanExportResult.SUCCESS
             except Exception as e:  # noqa: BLE001
@@ -176,6 +185,204 @@ class JSONLSpanExporter(SpanExporter):
                 return False
 
 
+class SegmentedSpanExporter(SpanExporter):
+    """Write spans into the rotated, indexed segments of a ``SpanStore``.
+
+    Same record format and durability semantics as ``JSONLSpanExporter``, but
+    output goes to an hourly segment file (rotated early at
+    ``store.max_segment_bytes``) whose time range and span names are kept in
+    the store manifest, so the telemetry dashboard reads only the segments a
+    query needs. Each span's trace/session/turn keys are appended to the
+    segment's live ID index, which is sorted when the segment is sealed.
+    Every rotation starts store maintenance (indexing, compaction,
+    retention) on a background thread.
+    """
+
+    def __init__(self, store: SpanStore) -> None:
+        self.store = store
+        self.store.ensure_dir()
+        self.store.migrate_legacy()
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._fh = None
+        self._index_fh = None
+        # False once an index append failed; sealing then rescans the segment.
+        self._index_complete = True
+        self._segment: Optional[SegmentInfo] = None
+        self._segment_path: Optional[Path] = None
+        self._bucket: Optional[str] = None
+        self._seq = 0
+        self._maintenance_thread: Optional[threading.Thread] = None
+        # Index whatever earlier runs left behind (including a migrated
+        # legacy file) without delaying startup.
+        self._start_maintenance()
+
+    @property
+    def segment_path(self) -> Optional[Path]:
+        """File currently being written, if any span has been exported yet."""
+        return self._segment_path
+
+    def _open_segment(self, now_ns: int) -> None:
+        bucket = hour_bucket(now_ns)
+        self._seq = self._seq + 1 if bucket == self._bucket else 0
+        self._bucket = bucket
+        # Containers restart with the same pid; never append to a segment a
+        # previous process indexed.
+        while True:
+            path = self.store.directory / f"spans-{bucket}-{os.getpid()}-{self._seq}.jsonl"
+            try:
+                fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_APPEND, 0o600)
+                break
+            except FileExistsError:
+                self._seq += 1
+        self._fh = os.fdopen(fd, "a", encoding="utf-8")
+        self._segment_path = path
+        self._segment = SegmentInfo(file=path.name)
+        self._index_complete = True
+        try:
+            index_fd = os.open(
+                str(self.store.index_path(path.name, live=True)),
+                os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND,
+                0o600,
+            )
+            self._index_fh = os.fdopen(index_fd, "ab")
+        except OSError as e:
+            logging.getLogger(__name__).warning("Could not open span ID index for %s: %s", path.name, e)
+            self._index_fh = None
+            self._index_complete = False
+
+    def _close_segment(self) -> None:
+        """Flush, fsync and close the current segment and seal its manifest entry."""
+        if self._fh is None:
+            return
+        try:
+            self._fh.flush()
+            try:
+                os.fsync(self._fh.fileno())
+            except (OSError, ValueError) as e:
+                logging.getLogger(__name__).debug("fsync of span segment failed: %s", e)
+            self._fh.close()
+        finally:
+            self._fh = None
+        self._seal_index()
+        if self._segment is not None and self._segment.span_count:
+            self._segment.sealed = True
+            self._save_segment()
+
+    def _seal_index(self) -> None:
+        live = self.store.index_path(self._segment_path.name, live=True)
+        try:
+            if self._index_fh is not None:
+                self._index_fh.close()
+            complete = self._index_complete and live.exists()
+            entries = span_index.read_entries(live) if complete else None
+            self.store.seal_index(self._segment_path, entries)
+        except OSError as e:
+            # Maintenance rebuilds it from the segment.
+            logging.getLogger(__name__).warning(
+                "Sealing span ID index for %s failed: %s", self._segment_path.name, e
+            )
+        finally:
+            self._index_fh = None
+
+    def _save_segment(self) -> None:
+        try:
+            self.store.update_manifest([self._segment])
+        except Exception as e:  # noqa: BLE001
+            # The segment stays readable without its entry; it is only
+            # scanned more often until maintenance indexes it.
+            logging.getLogger(__name__).warning("Span manifest update failed: %s", e)
+
+    def _start_maintenance(self) -> None:
+        if self._maintenance_thread is not None and self._maintenance_thread.is_alive():
+            return
+        self._maintenance_thread = threading.Thread(
+            target=self._run_maintenance, name="span-store-maintenance", daemon=True
+        )
+        self._maintenance_thread.start()
+
+    def _run_maintenance(self) -> None:
+        try:
+            self.store.maintain()
+        except Exception as e:  # noqa: BLE001
+            logging.getLogger(__name__).warning("Span store maintenance failed: %s", e)
+
+    def export(self, spans: list[ReadableSpan]) -> SpanExportResult:  # noqa: D401
+        with self._lock:
+            if self._shutdown:
+                return SpanExportResult.FAILURE
+            try:
+                now_ns = time.time_ns()
+                if self._fh is None:
+                    self._open_segment(now_ns)
+                elif hour_bucket(now_ns) != self._bucket or (
+                    self.store.max_segment_bytes
+                    and self._segment.size_bytes >= self.store.max_segment_bytes
+                ):
+                    self._close_segment()
+                    self._open_segment(now_ns)
+                    self._start_maintenance()
+                changed = False
+                entries = []
+                for span in spans:
+                    record = span_to_record(span)
+                    line = json.dumps(record, default=str) + "\n"
+                    self._fh.write(line)
+                    offset = self._segment.size_bytes
+                    entries.extend((key, offset) for key in span_index.record_keys(record))
+                    changed = self._segment.observe(record, len(line.encode("utf-8"))) or changed
+                self._fh.flush()
+                self._append_index(entries)
+                if changed:
+                    self._save_segment()
+                return SpanExportResult.SUCCESS
+            except Exception as e:  # noqa: BLE001
+                logging.getLogger(__name__).error("Segmented span export failed: %s", e)
+                return SpanExportResult.FAILURE
+
+    def _append_index(self, entries: list) -> None:
+        if self._index_fh is None or not entries:
+            return
+        try:
+            self._index_fh.write(span_index.format_entries(entries))
+            self._index_fh.flush()
+        except (OSError, ValueError) as e:
+            self._index_complete = False
+            logging.getLogger(__name__).warning("Span ID index append failed: %s", e)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            try:
+                self._close_segment()
+            except Exception as e:  # noqa: BLE001
+                logging.getLogger(__name__).debug(
+                    "SegmentedSpanExporter shutdown close failed: %s", e
+                )
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:  # noqa: ARG002
+        with self._lock:
+            if self._shutdown:
+                return False
+            if self._fh is None:
+                return True
+            try:
+                self._fh.flush()
+                try:
+                    os.fsync(self._fh.fileno())
+                except (OSError, ValueError):
+                    pass
+                self._save_segment()
+                return True
+            except Exception as e:  # noqa: BLE001
+                logging.getLogger(__name__).debug(
+                    "SegmentedSpanExporter force_flush failed: %s", e
+                )
+                return False
+
+
 class OpenTelemetryConfig:
     """Configure OpenTelemetry + structured logging."""
 
@@ -187,10 +394,13 @@ class OpenTelemetryConfig:
         # Resolve logs directory robustly: use config manager
         self.logs_dir = self._get_logs_dir()
         self.log_file = self.logs_dir / "app.jsonl"
+        # Pre-upgrade single-file trail; migrated into the segment store.
         self.spans_file = self.logs_dir / "spans.jsonl"
         self.logs_dir.mkdir(parents=True, exist_ok=True)
+        self.span_store = SpanStore.for_log_dir(self.logs_dir, self._get_app_settings())
         self._span_processor = None
         self._otlp_processor = None
+        self.span_rollups: Optional[SpanRollupProcessor] = None
         self._setup_telemetry()
         self._setup_logging()
 
@@ -211,6 +421,14 @@ class OpenTelemetryConfig:
         project_root = Path(__file__).resolve().parents[2]
         return project_root / "logs"
 
+    def _get_app_settings(self) -> Any:
+        try:
+            from atlas.modules.config import config_manager
+            return config_manager.app_settings
+        except Exception:
+            # Store falls back to its built-in defaults.
+            return None
+
     def _is_development(self) -> bool:
         try:
             from atlas.modules.config import config_manager
@@ -248,8 +466,8 @@ class OpenTelemetryConfig:
 
         # File-based JSONL exporter — always on; forms the audit trail
         # consumed by docs/telemetry/analysis_example.py and downstream
-        # dashboards.
-        jsonl_exporter = JSONLSpanExporter(self.spans_file)
+        # dashboards. Written as hourly segments under <logs>/spans/.
+        jsonl_exporter = SegmentedSpanExporter(self.span_store)
         self._span_processor = BatchSpanProcessor(jsonl_exporter)
         provider.add_span_processor(self._span_processor)
 
@@ -270,6 +488,21 @@ class OpenTelemetryConfig:
 
         trace.set_tracer_provider(provider)
 
+        # Streaming rollups for the admin dashboard. Only meaningful when this
+        # provider actually became the global one (the test suite installs
+        # its own first), otherwise they would claim coverage with no spans.
+        app_settings = self._get_app_settings()
+        if trace.get_tracer_provider() is provider and getattr(
+            app_settings, "telemetry_rollups_enabled", True
+        ):
+            self.span_rollups = SpanRollupProcessor(
+                self.span_store,
+                flush_seconds=getattr(
+                    app_settings, "telemetry_rollup_flush_seconds", DEFAULT_FLUSH_SECONDS
+                ),
+            )
+            provider.add_span_processor(self.span_rollups)
+
     def _setup_logging(self) -> None:
         root = logging.getLogger()
         for h in root.handlers[:]:
@@ -340,6 +573,9 @@ class OpenTelemetryConfig:
     def get_spans_file_path(self) -> Path:
         return self.spans_file
 
+    def get_spans_dir_path(self) -> Path:
+        return self.span_store.directory
+
     def flush_spans(self, timeout_millis: int = 30000) -> bool:
         """Force-flush pending spans to disk/OTLP. Used by tests and shutdown.
 
@@ -353,6 +589,8 @@ class OpenTelemetryConfig:
             ok = self._span_processor.force_flush(timeout_millis) and ok
         if self._otlp_processor is not None:
             ok = self._otlp_processor.force_flush(timeout_millis) and ok
+        if self.span_rollups is not None:
+            ok = self.span_rollups.force_flush(timeout_millis) and ok
         return ok
 
     def shutdown(self, timeout_millis: int = 30000) -> None:
@@ -366,7 +604,7 @@ class OpenTelemetryConfig:
             self.flush_spans(timeout_millis)
         except Exception:  # noqa: BLE001
             pass
-        for proc in (self._span_processor, self._otlp_processor):
+        for proc in (self._span_processor, self._otlp_processor, self.span_rollups):
             if proc is None:
                 continue
             try:
@@ -381,12 +619,7 @@ class OpenTelemetryConfig:
             return []
         out: list[Dict[str, Any]] = []
         try:
-            with self.log_file.open("r", encoding="utf-8") as f:
-                data = f.readlines()[-lines:]
-            for ln in data:
-                ln = ln.strip()
-                if not ln:
-                    continue
+            for ln in log_reader.tail_lines(self.log_file, lines):
                 try:
                     out.append(json.loads(ln))
                 except json.JSONDecodeError:
@@ -400,8 +633,7 @@ class OpenTelemetryConfig:
             return {"file_exists": False, "file_size": 0, "line_count": 0, "last_modified": None}
         try:
             stat = self.log_file.stat()
-            with self.log_file.open("r", encoding="utf-8") as f:
-                line_count = sum(1 for _ in f)
+            line_count = log_reader.count_lines(self.log_file)
             return {
                 "file_exists": True,
                 "file_size": stat.st_size,
@@ -0,0 +1,77 @@
+"""TTL cache for RAG data-source discovery results.
+
+Discovering a user's RAG sources asks every configured HTTP backend and
+every MCP RAG server what that user may see, and ``/api/config`` plus each
+RAG-enabled chat turn repeat the question. ``UnifiedRAGService`` and
+``RAGMCPService`` each keep one of these caches, keyed by (kind, user,
+compliance level), so a result is reused for ``ttl_seconds`` and concurrent
+discoveries of the same key share one run.
+
+Failed discoveries are never cached, and neither are incomplete ones
+(a loader reports a source that timed out or errored by returning
+``complete=False``). A discovery that started before a configuration change
+is returned to its waiters but never stored, and users are keyed by their
+normalized email (see ``SingleFlightTTLCache``).
+"""
+
+import logging
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from atlas.core.ttl_cache import SingleFlightTTLCache
+
+logger = logging.getLogger(__name__)
+
+# Returns (result, complete); incomplete results are not cached.
+DiscoveryLoader = Callable[[], Awaitable[Tuple[Any, bool]]]
+CacheKey = Tuple[str, str, Optional[str]]
+
+DEFAULT_MAX_ENTRIES = 5_000
+
+
+class RAGDiscoveryCache(SingleFlightTTLCache):
+    """Per-(kind, user, compliance level) discovery cache with stampede
+    protection."""
+
+    user_position = 1
+
+    def __init__(self, ttl_seconds: float, max_entries: int = DEFAULT_MAX_ENTRIES):
+        # Entries hold the loader's (result, complete) pair, so a hit and a
+        # shared in-flight discovery look the same to ``get_or_load``; only
+        # complete pairs are ever stored.
+        super().__init__(ttl_seconds, max_entries)
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """Return the cached result, or None if absent or expired."""
+        entry = self._lookup(self._normalize(key))
+        return None if entry is None else entry[0]
+
+    def put(self, key: CacheKey, result: Any) -> None:
+        self._store(self._normalize(key), (result, True))
+
+    def _normalize(self, key: CacheKey) -> CacheKey:
+        kind, user, compliance_level = key
+        return (kind, self.user_key(user), compliance_level)
+
+    async def get_or_load(
+        self,
+        kind: str,
+        user: str,
+        compliance_level: Optional[str],
+        loader: DiscoveryLoader,
+    ) -> Any:
+        """Return the cached result, running ``loader`` at most once per key
+        however many callers are waiting for it.
+
+        Results are shared between callers; treat them as read-only.
+        """
+        if self.ttl_seconds <= 0:
+            result, _complete = await loader()
+            return result
+        key = (kind, self.user_key(user), compliance_level)
+
+        def _store_complete(loaded: Tuple[Any, bool]) -> None:
+            if loaded[1]:
+                self._store(key, loaded)
+
+        result, _complete = await self._get_or_load(key, loader, _store_complete)
+        return result
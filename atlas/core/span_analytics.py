@@ -0,0 +1,448 @@
+"""Columnar analytics backend for the span audit trail.
+
+``DuckDBSpanReader`` answers the admin telemetry dashboard from DuckDB instead
+of scanning JSON lines in Python. Each sealed segment of a ``SpanStore`` is
+converted once into a Parquet file (sorted by ``start_time_ns``, with the
+attributes the dashboard groups and aggregates on extracted into typed
+columns) under ``<spans dir>/columnar/``. Segments that are still being
+written, or not yet indexed, are read straight from JSONL by DuckDB.
+
+Besides the plain ``SpanReader`` methods, the reader implements the rollups
+(``overview_stats``, ``tool_stats``, ``llm_stats``, ``rag_stats``) as single
+SQL queries, so time-range and span-name filters, group-bys and percentiles
+run vectorized inside DuckDB. Results match the Python aggregation in
+``atlas/routes/telemetry_routes.py`` field for field.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import duckdb
+
+from atlas.core.span_store import SpanStore
+
+logger = logging.getLogger(__name__)
+
+COLUMNAR_DIRNAME = "columnar"
+
+_JSON_COLUMNS = {
+    "name": "VARCHAR",
+    "trace_id": "VARCHAR",
+    "span_id": "VARCHAR",
+    "parent_span_id": "VARCHAR",
+    "start_time_ns": "BIGINT",
+    "end_time_ns": "BIGINT",
+    "duration_ns": "BIGINT",
+    "status": "VARCHAR",
+    "kind": "VARCHAR",
+    "attributes": "JSON",
+}
+
+_RECORD_FIELDS = tuple(_JSON_COLUMNS)
+
+
+def _str_attr(key: str) -> str:
+    # Non-empty strings only, mirroring ``_group_key`` in the routes.
+    return (
+        f"CASE WHEN json_type(attributes, '$.{key}') = 'VARCHAR' "
+        f"THEN NULLIF(json_extract_string(attributes, '$.{key}'), '') END"
+    )
+
+
+def _num_attr(key: str) -> str:
+    return (
+        f"CASE WHEN json_type(attributes, '$.{key}') IN ('BIGINT', 'UBIGINT', 'DOUBLE') "
+        f"THEN CAST(json_extract_string(attributes, '$.{key}') AS DOUBLE) END"
+    )
+
+
+def _bool_attr(key: str) -> str:
+    return (
+        f"CASE WHEN json_type(attributes, '$.{key}') = 'BOOLEAN' "
+        f"THEN CAST(json_extract_string(attributes, '$.{key}') AS BOOLEAN) END"
+    )
+
+
+def _len_attr(key: str) -> str:
+    return (
+        f"CASE WHEN json_type(attributes, '$.{key}') = 'ARRAY' "
+        f"THEN json_array_length(attributes, '$.{key}') END"
+    )
+
+
+# One row per span: the raw record plus typed columns for every attribute the
+# rollups touch. Shared by the Parquet conversion and the live JSONL scan so
+# both sides of the UNION have the same schema.
+_PROJECTION = ",\n".join(
+    [
+        *_RECORD_FIELDS[:-1],
+        "CAST(attributes AS VARCHAR) AS attributes",
+        f"{_str_attr('session_id')} AS session_id",
+        f"{_str_attr('tool_name')} AS tool_name",
+        f"{_str_attr('model')} AS model",
+        f"{_str_attr('data_source')} AS data_source",
+        f"{_bool_attr('success')} AS success",
+        f"{_num_attr('duration_ms')} AS duration_ms",
+        f"{_num_attr('latency_ms')} AS latency_ms",
+        f"{_num_attr('retry_count')} AS retry_count",
+        f"{_num_attr('input_tokens')} AS input_tokens",
+        f"{_num_attr('output_tokens')} AS output_tokens",
+        f"{_num_attr('total_tokens')} AS total_tokens",
+        f"{_num_attr('top_score')} AS top_score",
+        f"{_len_attr('doc_ids')} AS doc_ids_count",
+        f"{_len_attr('docs_used_in_context')} AS docs_used_count",
+        "json_extract_string(attributes, '$.error_type') AS error_type",
+    ]
+)
+
+# Python truthiness of the raw ``error_type`` attribute.
+_HAS_ERROR = "(error_type IS NOT NULL AND error_type NOT IN ('', 'false', '0', '0.0', '[]', '{}'))"
+
+_READ_JSON = "read_json($jsonl, format = 'newline_delimited', columns = $columns, ignore_errors = true)"
+
+
+class DuckDBSpanReader:
+    """``SpanReader`` over a ``SpanStore`` that pushes filtering and
+    aggregation down into DuckDB."""
+
+    def __init__(self, store: SpanStore, columnar_dir: Optional[Path] = None):
+        self.store = store
+        self.columnar_dir = columnar_dir or store.directory / COLUMNAR_DIRNAME
+        self._convert_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Parquet conversion
+    # ------------------------------------------------------------------
+    def _parquet_path(self, segment: Path, size_bytes: int) -> Path:
+        # The size is part of the name so a compacted day file that grows
+        # gets a fresh conversion instead of a stale one.
+        return self.columnar_dir / f"{segment.stem}-{size_bytes}.parquet"
+
+    def _convert(self, segment: Path, target: Path) -> bool:
+        self.columnar_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            os.chmod(self.columnar_dir, 0o700)
+        except OSError:
+            pass
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with duckdb.connect() as con:
+                con.execute(
+                    f"COPY (SELECT {_PROJECTION} FROM {_READ_JSON} "
+                    "WHERE start_time_ns IS NOT NULL ORDER BY start_time_ns) "
+                    f"TO '{_sql_literal(tmp)}' (FORMAT PARQUET, COMPRESSION ZSTD)",
+                    {"jsonl": [str(segment)], "columns": _JSON_COLUMNS},
+                )
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, target)
+            return True
+        except (duckdb.Error, OSError) as e:
+            logger.warning("Columnar conversion of span segment %s failed: %s", segment, e)
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return False
+
+    def _sources(
+        self,
+        since_ns: Optional[int] = None,
+        until_ns: Optional[int] = None,
+        names: Optional[Iterable[str]] = None,
+    ) -> Tuple[List[str], List[str]]:
+        """Split the selected segments into Parquet files and live JSONL files,
+        converting sealed segments that have no Parquet copy yet."""
+        manifest = self.store.load_manifest()
+        parquet: List[str] = []
+        jsonl: List[str] = []
+        for path in self.store.select(since_ns, until_ns, names):
+            info = manifest.get(path.name)
+            if info is None or not info.sealed:
+                jsonl.append(str(path))
+                continue
+            target = self._parquet_path(path, info.size_bytes)
+            if not target.exists():
+                with self._convert_lock:
+                    if not target.exists() and not self._convert(path, target):
+                        jsonl.append(str(path))
+                        continue
+            parquet.append(str(target))
+        self._prune(manifest)
+        return parquet, jsonl
+
+    def _prune(self, manifest: Dict[str, Any]) -> None:
+        """Drop Parquet copies of segments that were compacted or expired."""
+        if not self.columnar_dir.is_dir():
+            return
+        wanted = {
+            self._parquet_path(Path(name), info.size_bytes).name
+            for name, info in manifest.items()
+            if info.sealed
+        }
+        for path in self.columnar_dir.glob("*.parquet"):
+            if path.name not in wanted:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def sync(self) -> int:
+        """Convert every sealed segment now; returns how many Parquet files exist."""
+        parquet, _ = self._sources()
+        return len(parquet)
+
+    # ------------------------------------------------------------------
+    # Query helpers
+    # ------------------------------------------------------------------
+    def _query(
+        self,
+        select_sql: str,
+        *,
+        since_ns: Optional[int] = None,
+        until_ns: Optional[int] = None,
+        names: Optional[Iterable[str]] = None,
+        where: str = "",
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[str], List[Tuple[Any, ...]]]:
+        """Run ``select_sql`` against a ``spans`` relation holding the spans
+        that match the filters. Returns (column names, rows)."""
+        name_list = sorted(set(names)) if names else None
+        parquet, jsonl = self._sources(since_ns, until_ns, name_list)
+        parts = []
+        bind: Dict[str, Any] = dict(params or {})
+        if parquet:
+            parts.append("SELECT * FROM read_parquet($parquet)")
+            bind["parquet"] = parquet
+        if jsonl:
+            parts.append(f"SELECT {_PROJECTION} FROM {_READ_JSON}")
+            bind["jsonl"] = jsonl
+            bind["columns"] = _JSON_COLUMNS
+        if not parts:
+            # Keep the schema so aggregates still return their empty row.
+            parts.append(f"SELECT {_PROJECTION} FROM {_empty_relation()} LIMIT 0")
+
+        filters = ["start_time_ns IS NOT NULL"]
+        if since_ns is not None:
+            filters.append("start_time_ns >= $since_ns")
+            bind["since_ns"] = since_ns
+        if until_ns is not None:
+            filters.append("start_time_ns <= $until_ns")
+            bind["until_ns"] = until_ns
+        if name_list:
+            filters.append("list_contains($names, name)")
+            bind["names"] = name_list
+        if where:
+            filters.append(where)
+        sql = (
+            "WITH spans AS (SELECT * FROM ("
+            + " UNION ALL BY NAME ".join(parts)
+            + ") WHERE "
+            + " AND ".join(filters)
+            + ") "
+            + select_sql
+        )
+        with duckdb.connect() as con:
+            cursor = con.execute(sql, bind)
+            columns = [d[0] for d in cursor.description]
+            return columns, cursor.fetchall()
+
+    def _dicts(self, select_sql: str, **kwargs: Any) -> List[Dict[str, Any]]:
+        columns, rows = self._query(select_sql, **kwargs)
+        return [dict(zip(columns, row)) for row in rows]
+
+    # ------------------------------------------------------------------
+    # SpanReader
+    # ------------------------------------------------------------------
+    def _records(self, rows: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for row in rows:
+            try:
+                row["attributes"] = json.loads(row["attributes"]) if row["attributes"] else {}
+            except ValueError:
+                row["attributes"] = {}
+            yield row
+
+    def read(
+        self,
+        *,
+        since_ns: Optional[int] = None,
+        until_ns: Optional[int] = None,
+        names: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        rows = self._dicts(
+            f"SELECT {', '.join(_RECORD_FIELDS)} FROM spans",
+            since_ns=since_ns,
+            until_ns=until_ns,
+            names=names,
+        )
+        return self._records(rows)
+
+    def read_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        # Point lookups go through the store's ID index rather than a scan.
+        return self.store.find_trace(trace_id)
+
+    def find_turns(
+        self,
+        *,
+        session_id: Optional[str] = None,
+        turn_id: Optional[str] = None,
+        since_ns: Optional[int] = None,
+        until_ns: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        return self.store.find_turns(
+            session_id=session_id, turn_id=turn_id, since_ns=since_ns, until_ns=until_ns
+        )
+
+    # ------------------------------------------------------------------
+    # Pushed-down rollups
+    # ------------------------------------------------------------------
+    def overview_stats(self, since_ns: int, until_ns: int) -> Dict[str, Any]:
+        (row,) = self._dicts(
+            """
+            SELECT
+                count(*) FILTER (WHERE name = 'chat.turn') AS turns,
+                count(DISTINCT session_id) FILTER (WHERE name = 'chat.turn') AS sessions,
+                count(*) FILTER (WHERE name = 'tool.call') AS tool_calls,
+                count(*) FILTER (WHERE name = 'tool.call' AND success) AS tool_success,
+                count(*) FILTER (WHERE name = 'llm.call') AS llm_calls,
+                quantile_cont(latency_ms, 0.5) FILTER (WHERE name = 'llm.call') AS llm_latency_p50_ms,
+                quantile_cont(latency_ms, 0.95) FILTER (WHERE name = 'llm.call') AS llm_latency_p95_ms,
+                CAST(coalesce(sum(trunc(retry_count)) FILTER (WHERE name = 'llm.call'), 0) AS BIGINT)
+                    AS llm_retries_total,
+                count(*) FILTER (WHERE name = 'rag.query') AS rag_queries
+            FROM spans
+            """,
+            since_ns=since_ns,
+            until_ns=until_ns,
+            names=("chat.turn", "llm.call", "tool.call", "rag.query"),
+        )
+        tool_success = row.pop("tool_success")
+        tool_calls = row["tool_calls"]
+        return {
+            "turns": row["turns"],
+            "sessions": row["sessions"],
+            "tool_calls": tool_calls,
+            "tool_success_rate": (tool_success / tool_calls) if tool_calls else None,
+            "llm_calls": row["llm_calls"],
+            "llm_latency_p50_ms": row["llm_latency_p50_ms"],
+            "llm_latency_p95_ms": row["llm_latency_p95_ms"],
+            "llm_retries_total": row["llm_retries_total"],
+            "rag_queries": row["rag_queries"],
+        }
+
+    def tool_stats(self, since_ns: int, until_ns: int) -> List[Dict[str, Any]]:
+        rows = self._dicts(
+            f"""
+            SELECT
+                coalesce(tool_name, '<unknown>') AS tool_name,
+                count(*) AS call_count,
+                count(*) FILTER (WHERE success) AS success_count,
+                quantile_cont(duration_ms, 0.5) AS duration_p50_ms,
+                quantile_cont(duration_ms, 0.95) AS duration_p95_ms,
+                max(start_time_ns) FILTER (WHERE success = false) AS last_failure_start_ns,
+                arg_max(CASE WHEN {_HAS_ERROR} THEN error_type ELSE status END, start_time_ns)
+                    FILTER (WHERE success = false) AS last_failure_error_type
+            FROM spans
+            GROUP BY 1
+            ORDER BY call_count DESC, tool_name
+            """,
+            since_ns=since_ns,
+            until_ns=until_ns,
+            names=("tool.call",),
+        )
+        tools = []
+        for row in rows:
+            success = row.pop("success_count")
+            calls = row["call_count"]
+            tools.append({
+                "tool_name": row["tool_name"],
+                "call_count": calls,
+                "success_rate": (success / calls) if calls else None,
+                "failure_count": calls - success,
+                "duration_p50_ms": row["duration_p50_ms"],
+                "duration_p95_ms": row["duration_p95_ms"],
+                "last_failure_start_ns": row["last_failure_start_ns"],
+                "last_failure_error_type": row["last_failure_error_type"],
+            })
+        return tools
+
+    def llm_stats(self, since_ns: int, until_ns: int) -> List[Dict[str, Any]]:
+        rows = self._dicts(
+            f"""
+            SELECT
+                coalesce(model, '<unknown>') AS model,
+                count(*) AS call_count,
+                quantile_cont(latency_ms, 0.5) AS latency_p50_ms,
+                quantile_cont(latency_ms, 0.95) AS latency_p95_ms,
+                quantile_cont(latency_ms, 0.99) AS latency_p99_ms,
+                CAST(coalesce(sum(trunc(input_tokens)), 0) AS BIGINT) AS input_tokens_total,
+                CAST(coalesce(sum(trunc(output_tokens)), 0) AS BIGINT) AS output_tokens_total,
+                CAST(coalesce(sum(trunc(total_tokens)), 0) AS BIGINT) AS total_tokens_total,
+                CAST(coalesce(sum(trunc(retry_count)) FILTER (WHERE retry_count > 0), 0) AS BIGINT)
+                    AS retry_count_total,
+                count(*) FILTER (WHERE retry_count > 0) AS retry_calls,
+                count(*) FILTER (WHERE {_HAS_ERROR}) AS error_count
+            FROM spans
+            GROUP BY 1
+            ORDER BY call_count DESC, model
+            """,
+            since_ns=since_ns,
+            until_ns=until_ns,
+            names=("llm.call",),
+        )
+        models = []
+        for row in rows:
+            retry_calls = row.pop("retry_calls")
+            row["retry_rate"] = (retry_calls / row["call_count"]) if row["call_count"] else None
+            models.append(row)
+        return models
+
+    def rag_stats(self, since_ns: int, until_ns: int) -> List[Dict[str, Any]]:
+        rows = self._dicts(
+            """
+            SELECT
+                coalesce(data_source, '<unknown>') AS data_source,
+                count(*) AS query_count,
+                CAST(coalesce(sum(doc_ids_count), 0) AS BIGINT) AS docs_retrieved_total,
+                CAST(coalesce(sum(docs_used_count), 0) AS BIGINT) AS docs_used_total,
+                quantile_cont(top_score, 0.5) AS top_score_p50,
+                quantile_cont(top_score, 0.95) AS top_score_p95,
+                max(top_score) AS top_score_max
+            FROM spans
+            GROUP BY 1
+            ORDER BY query_count DESC, data_source
+            """,
+            since_ns=since_ns,
+            until_ns=until_ns,
+            names=("rag.query",),
+        )
+        for row in rows:
+            retrieved = row["docs_retrieved_total"]
+            row["retrieval_to_use_ratio"] = (row["docs_used_total"] / retrieved) if retrieved else None
+        return [
+            {
+                "data_source": row["data_source"],
+                "query_count": row["query_count"],
+                "docs_retrieved_total": row["docs_retrieved_total"],
+                "docs_used_total": row["docs_used_total"],
+                "retrieval_to_use_ratio": row["retrieval_to_use_ratio"],
+                "top_score_p50": row["top_score_p50"],
+                "top_score_p95": row["top_score_p95"],
+                "top_score_max": row["top_score_max"],
+            }
+            for row in rows
+        ]
+
+
+def _sql_literal(path: Path) -> str:
+    return str(path).replace("'", "''")
+
+
+def _empty_relation() -> str:
+    columns = ", ".join(f"NULL::{sql_type} AS {name}" for name, sql_type in _JSON_COLUMNS.items())
+    return f"(SELECT {columns})"
@@ -0,0 +1,170 @@
+"""Secondary index from trace/session/turn IDs to span byte offsets.
+
+Every segment ``spans/<stem>.jsonl`` gets an index under ``spans/index/``:
+fixed-width entries ``<key:016x> <offset:012x>\\n`` where ``key`` is a 64-bit
+hash of ``trace_id`` (every span), ``session_id`` or ``turn_id`` (``chat.turn``
+spans) and ``offset`` is where the span's JSON line starts in the segment.
+IDs are only stored hashed.
+
+While the exporter writes a segment it appends to ``<stem>.live`` in arrival
+order; when the segment is sealed the entries are sorted into ``<stem>.idx``,
+which lookups binary-search with a handful of seeks. Matches are hash hits,
+so callers re-check the record they read back.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+INDEX_DIRNAME = "index"
+SORTED_SUFFIX = ".idx"
+LIVE_SUFFIX = ".live"
+ENTRY_BYTES = 30  # 16 hex key + space + 12 hex offset + newline
+
+Entry = Tuple[int, int]
+
+
+def _key(kind: str, value: str) -> int:
+    digest = hashlib.blake2b(f"{kind}:{value}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def trace_key(trace_id: str) -> int:
+    return _key("trace", trace_id)
+
+
+def session_key(session_id: str) -> int:
+    return _key("session", session_id)
+
+
+def turn_key(turn_id: str) -> int:
+    return _key("turn", turn_id)
+
+
+def record_keys(record: Dict[str, Any]) -> List[int]:
+    """Index keys for one span record."""
+    keys = []
+    trace_id = record.get("trace_id")
+    if isinstance(trace_id, str) and trace_id:
+        keys.append(trace_key(trace_id))
+    if record.get("name") == "chat.turn":
+        attrs = record.get("attributes")
+        if isinstance(attrs, dict):
+            for attr, key_fn in (("session_id", session_key), ("turn_id", turn_key)):
+                value = attrs.get(attr)
+                if isinstance(value, str) and value:
+                    keys.append(key_fn(value))
+    return keys
+
+
+def format_entries(entries: Iterable[Entry]) -> bytes:
+    return b"".join(b"%016x %012x\n" % entry for entry in entries)
+
+
+def _parse(raw: bytes) -> Optional[Entry]:
+    try:
+        return int(raw[:16], 16), int(raw[17:29], 16)
+    except ValueError:
+        return None
+
+
+def read_entries(path: Path) -> List[Entry]:
+    """All entries of an index file (sorted or live); torn entries are skipped."""
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return []
+    entries = []
+    for start in range(0, len(data) - ENTRY_BYTES + 1, ENTRY_BYTES):
+        entry = _parse(data[start:start + ENTRY_BYTES])
+        if entry is not None:
+            entries.append(entry)
+    return entries
+
+
+def write_sorted(path: Path, entries: Iterable[Entry]) -> None:
+    """Atomically write ``entries`` sorted by key, then offset."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(format_entries(sorted(entries)))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def search_sorted(path: Path, key: int) -> List[int]:
+    """Offsets stored under ``key`` in a sorted index, via binary search."""
+    with path.open("rb") as fh:
+        count = os.fstat(fh.fileno()).st_size // ENTRY_BYTES
+
+        def key_at(i: int) -> int:
+            fh.seek(i * ENTRY_BYTES)
+            entry = _parse(fh.read(ENTRY_BYTES))
+            return entry[0] if entry is not None else -1
+
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        offsets = []
+        fh.seek(lo * ENTRY_BYTES)
+        while lo < count:
+            entry = _parse(fh.read(ENTRY_BYTES))
+            if entry is None or entry[0] != key:
+                break
+            offsets.append(entry[1])
+            lo += 1
+    return offsets
+
+
+def scan_entries(segment: Path) -> List[Entry]:
+    """Build the entries of a segment by reading it end to end."""
+    entries: List[Entry] = []
+    try:
+        fh = segment.open("rb")
+    except FileNotFoundError:
+        return entries
+    with fh:
+        offset = 0
+        for line in fh:
+            start, offset = offset, offset + len(line)
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if isinstance(record, dict):
+                entries.extend((key, start) for key in record_keys(record))
+    return entries
+
+
+def read_records_at(segment: Path, offsets: Iterable[int]) -> Iterator[Dict[str, Any]]:
+    """Yield the span records whose lines start at ``offsets``."""
+    try:
+        fh = segment.open("rb")
+    except FileNotFoundError:
+        return
+    with fh:
+        for offset in sorted(set(offsets)):
+            fh.seek(offset)
+            line = fh.readline()
+            try:
+                record = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if isinstance(record, dict):
+                yield record
@@ -0,0 +1,620 @@
+"""In-process streaming rollups of the span audit trail.
+
+``SpanRollupProcessor`` runs next to the exporter's ``BatchSpanProcessor``.
+As each span ends it folds the attributes the admin dashboard aggregates
+into a per-minute bucket: counts, success/failure, token totals, and
+mergeable quantile sketches (DDSketch) of latencies and scores, keyed by
+tool, model and data source. Minute buckets older than a day are folded into
+hourly buckets. Every ``flush_seconds`` the state is saved to
+``<APP_LOG_DIR>/spans/rollups/``, one file per process so several workers
+never contend for a file, and the overview/tools/llm/rag endpoints answer
+from the merged buckets of all processes in O(buckets) instead of O(spans).
+
+Rollups only know about spans that ended after the oldest rollup file was
+started; ``covers`` tells the endpoints when to fall back to the span reader.
+Percentiles are approximate to within ``SKETCH_RELATIVE_ACCURACY``, and the
+leading edge of a window is accurate to one bucket (a minute within the last
+day, an hour beyond).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor
+
+from atlas.core.span_store import SpanStore
+
+logger = logging.getLogger(__name__)
+
+ROLLUPS_DIRNAME = "rollups"
+DEFAULT_FLUSH_SECONDS = 60.0
+SKETCH_RELATIVE_ACCURACY = 0.01
+# Longest dashboard range is 30d; keep a day of slack.
+MAX_RETENTION_NS = 31 * 86400 * 1_000_000_000
+# Minute resolution is kept for the 1h and 24h ranges (plus slack).
+MINUTE_RESOLUTION_NS = 25 * 3600 * 1_000_000_000
+
+_MINUTE_NS = 60 * 1_000_000_000
+_HOUR_NS = 3600 * 1_000_000_000
+_FORMAT_VERSION = 1
+
+_GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+# Magnitudes below this all land in the zero bin.
+_MIN_INDEXABLE = 1e-9
+
+
+def _is_number(value: Any) -> bool:
+    # Same test the endpoints apply to raw attributes (bools included).
+    return isinstance(value, (int, float))
+
+
+def _group_key(value: Any) -> str:
+    # Mirrors ``_group_key`` in atlas/routes/telemetry_routes.py.
+    return value if isinstance(value, str) and value else "<unknown>"
+
+
+def _session_key(session_id: str) -> str:
+    # Only distinct counts are needed; don't persist raw session IDs.
+    return hashlib.blake2b(session_id.encode("utf-8"), digest_size=8).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Quantile sketch
+# ---------------------------------------------------------------------------
+
+
+class QuantileSketch:
+    """DDSketch: log-spaced bins with a guaranteed relative error.
+
+    Every quantile is within ``SKETCH_RELATIVE_ACCURACY`` of the exact value
+    (clamped to the exact min/max), and two sketches merge by adding their
+    bin counts, so per-minute sketches roll up into any window losslessly.
+    """
+
+    __slots__ = ("positive", "negative", "zero_count", "count", "min", "max")
+
+    def __init__(self) -> None:
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    @staticmethod
+    def _key(magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / _LOG_GAMMA)
+
+    @staticmethod
+    def _value(key: int) -> float:
+        return 2 * _GAMMA ** key / (_GAMMA + 1)
+
+    def add(self, value: float) -> None:
+        value = float(value)
+        if not math.isfinite(value):
+            return
+        if value > _MIN_INDEXABLE:
+            key = self._key(value)
+            self.positive[key] = self.positive.get(key, 0) + 1
+        elif value < -_MIN_INDEXABLE:
+            key = self._key(-value)
+            self.negative[key] = self.negative.get(key, 0) + 1
+        else:
+            self.zero_count += 1
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if not other.count:
+            return
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, n in theirs.items():
+                mine[key] = mine.get(key, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate ``q``-quantile on the same rank scale as ``_percentile``."""
+        if not self.count:
+            return None
+        if self.count == 1 or q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = 0
+        estimate = self.max
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                estimate = -self._value(key)
+                break
+        else:
+            seen += self.zero_count
+            if seen > rank:
+                estimate = 0.0
+            else:
+                for key in sorted(self.positive):
+                    seen += self.positive[key]
+                    if seen > rank:
+                        estimate = self._value(key)
+                        break
+        return min(max(estimate, self.min), self.max)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "p": sorted(self.positive.items()),
+            "n": sorted(self.negative.items()),
+            "z": self.zero_count,
+            "c": self.count,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls()
+        sketch.positive = {int(k): int(n) for k, n in raw.get("p") or ()}
+        sketch.negative = {int(k): int(n) for k, n in raw.get("n") or ()}
+        sketch.zero_count = int(raw.get("z") or 0)
+        sketch.count = int(raw.get("c") or 0)
+        sketch.min = raw.get("min")
+        sketch.max = raw.get("max")
+        return sketch
+
+
+# ---------------------------------------------------------------------------
+# Buckets
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _ToolRollup:
+    call_count: int = 0
+    success_count: int = 0
+    durations: QuantileSketch = field(default_factory=QuantileSketch)
+    last_failure_start_ns: Optional[int] = None
+    last_failure_error_type: Any = None
+
+    def merge(self, other: "_ToolRollup") -> None:
+        self.call_count += other.call_count
+        self.success_count += other.success_count
+        self.durations.merge(other.durations)
+        if other.last_failure_start_ns is not None and (
+            self.last_failure_start_ns is None or other.last_failure_start_ns > self.last_failure_start_ns
+        ):
+            self.last_failure_start_ns = other.last_failure_start_ns
+            self.last_failure_error_type = other.last_failure_error_type
+
+
+@dataclass
+class _ModelRollup:
+    call_count: int = 0
+    latencies: QuantileSketch = field(default_factory=QuantileSketch)
+    input_tokens_total: int = 0
+    output_tokens_total: int = 0
+    total_tokens_total: int = 0
+    retries: int = 0
+    retry_calls: int = 0
+    # Overview semantics: every numeric retry_count, not only positive ones.
+    retry_count_sum: int = 0
+    error_count: int = 0
+
+    def merge(self, other: "_ModelRollup") -> None:
+        self.call_count += other.call_count
+        self.latencies.merge(other.latencies)
+        self.input_tokens_total += other.input_tokens_total
+        self.output_tokens_total += other.output_tokens_total
+        self.total_tokens_total += other.total_tokens_total
+        self.retries += other.retries
+        self.retry_calls += other.retry_calls
+        self.retry_count_sum += other.retry_count_sum
+        self.error_count += other.error_count
+
+
+@dataclass
+class _RagRollup:
+    query_count: int = 0
+    docs_retrieved: int = 0
+    docs_used: int = 0
+    top_scores: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def merge(self, other: "_RagRollup") -> None:
+        self.query_count += other.query_count
+        self.docs_retrieved += other.docs_retrieved
+        self.docs_used += other.docs_used
+        self.top_scores.merge(other.top_scores)
+
+
+def _dump(obj: Any) -> Dict[str, Any]:
+    return {
+        key: value.to_dict() if isinstance(value, QuantileSketch) else value
+        for key, value in obj.__dict__.items()
+    }
+
+
+def _load(cls: type, raw: Dict[str, Any]) -> Any:
+    obj = cls()
+    for key, value in raw.items():
+        current = getattr(obj, key, None)
+        if isinstance(current, QuantileSketch):
+            value = QuantileSketch.from_dict(value or {})
+        elif not hasattr(obj, key):
+            continue
+        setattr(obj, key, value)
+    return obj
+
+
+@dataclass
+class RollupBucket:
+    """Aggregates of every dashboard span that started in one minute or hour."""
+
+    turns: int = 0
+    sessions: Set[str] = field(default_factory=set)
+    tools: Dict[str, _ToolRollup] = field(default_factory=dict)
+    models: Dict[str, _ModelRollup] = field(default_factory=dict)
+    sources: Dict[str, _RagRollup] = field(default_factory=dict)
+
+    def observe(self, name: str, attrs: Dict[str, Any], start_ns: int, status: Optional[str]) -> None:
+        """Fold one span in, applying the same rules as the raw-span endpoints."""
+        if name == "chat.turn":
+            self.turns += 1
+            sid = attrs.get("session_id")
+            if isinstance(sid, str) and sid:
+                self.sessions.add(_session_key(sid))
+        elif name == "llm.call":
+            s = self.models.setdefault(_group_key(attrs.get("model")), _ModelRollup())
+            s.call_count += 1
+            latency = attrs.get("latency_ms")
+            if _is_number(latency):
+                s.latencies.add(latency)
+            for token_attr, field_name in (
+                ("input_tokens", "input_tokens_total"),
+                ("output_tokens", "output_tokens_total"),
+                ("total_tokens", "total_tokens_total"),
+            ):
+                v = attrs.get(token_attr)
+                if _is_number(v):
+                    setattr(s, field_name, getattr(s, field_name) + int(v))
+            rc = attrs.get("retry_count")
+            if _is_number(rc):
+                s.retry_count_sum += int(rc)
+                if rc > 0:
+                    s.retries += int(rc)
+                    s.retry_calls += 1
+            if attrs.get("error_type"):
+                s.error_count += 1
+        elif name == "tool.call":
+            s = self.tools.setdefault(_group_key(attrs.get("tool_name")), _ToolRollup())
+            s.call_count += 1
+            success = attrs.get("success")
+            if success is True:
+                s.success_count += 1
+            dur = attrs.get("duration_ms")
+            if _is_number(dur):
+                s.durations.add(dur)
+            if success is False and (s.last_failure_start_ns is None or start_ns > s.last_failure_start_ns):
+                s.last_failure_start_ns = start_ns
+                s.last_failure_error_type = attrs.get("error_type") or status
+        elif name == "rag.query":
+            s = self.sources.setdefault(_group_key(attrs.get("data_source")), _RagRollup())
+            s.query_count += 1
+            doc_ids = attrs.get("doc_ids")
+            if isinstance(doc_ids, (list, tuple)):
+                s.docs_retrieved += len(doc_ids)
+            used = attrs.get("docs_used_in_context")
+            if isinstance(used, (list, tuple)):
+                s.docs_used += len(used)
+            top = attrs.get("top_score")
+            if _is_number(top):
+                s.top_scores.add(top)
+
+    def merge(self, other: "RollupBucket") -> None:
+        self.turns += other.turns
+        self.sessions |= other.sessions
+        for mine, theirs, cls in (
+            (self.tools, other.tools, _ToolRollup),
+            (self.models, other.models, _ModelRollup),
+            (self.sources, other.sources, _RagRollup),
+        ):
+            for key, stats in theirs.items():
+                mine.setdefault(key, cls()).merge(stats)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "turns": self.turns,
+            "sessions": sorted(self.sessions),
+            "tools": {k: _dump(v) for k, v in self.tools.items()},
+            "models": {k: _dump(v) for k, v in self.models.items()},
+            "sources": {k: _dump(v) for k, v in self.sources.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "RollupBucket":
+        return cls(
+            turns=int(raw.get("turns") or 0),
+            sessions=set(raw.get("sessions") or ()),
+            tools={k: _load(_ToolRollup, v) for k, v in (raw.get("tools") or {}).items()},
+            models={k: _load(_ModelRollup, v) for k, v in (raw.get("models") or {}).items()},
+            sources={k: _load(_RagRollup, v) for k, v in (raw.get("sources") or {}).items()},
+        )
+
+    # -- Dashboard rows (same fields and order as the SpanAnalytics backends) --
+
+    def overview(self) -> Dict[str, Any]:
+        tool_calls = sum(s.call_count for s in self.tools.values())
+        tool_success = sum(s.success_count for s in self.tools.values())
+        latencies = QuantileSketch()
+        for s in self.models.values():
+            latencies.merge(s.latencies)
+        return {
+            "turns": self.turns,
+            "sessions": len(self.sessions),
+            "tool_calls": tool_calls,
+            "tool_success_rate": (tool_success / tool_calls) if tool_calls else None,
+            "llm_calls": sum(s.call_count for s in self.models.values()),
+            "llm_latency_p50_ms": latencies.quantile(0.5),
+            "llm_latency_p95_ms": latencies.quantile(0.95),
+            "llm_retries_total": sum(s.retry_count_sum for s in self.models.values()),
+            "rag_queries": sum(s.query_count for s in self.sources.values()),
+        }
+
+    def tool_rows(self) -> List[Dict[str, Any]]:
+        rows = [
+            {
+                "tool_name": name,
+                "call_count": s.call_count,
+                "success_rate": (s.success_count / s.call_count) if s.call_count else None,
+                "failure_count": s.call_count - s.success_count,
+                "duration_p50_ms": s.durations.quantile(0.5),
+                "duration_p95_ms": s.durations.quantile(0.95),
+                "last_failure_start_ns": s.last_failure_start_ns,
+                "last_failure_error_type": s.last_failure_error_type,
+            }
+            for name, s in self.tools.items()
+        ]
+        rows.sort(key=lambda r: (-r["call_count"], r["tool_name"]))
+        return rows
+
+    def model_rows(self) -> List[Dict[str, Any]]:
+        rows = [
+            {
+                "model": model,
+                "call_count": s.call_count,
+                "latency_p50_ms": s.latencies.quantile(0.5),
+                "latency_p95_ms": s.latencies.quantile(0.95),
+                "latency_p99_ms": s.latencies.quantile(0.99),
+                "input_tokens_total": s.input_tokens_total,
+                "output_tokens_total": s.output_tokens_total,
+                "total_tokens_total": s.total_tokens_total,
+                "retry_count_total": s.retries,
+                "retry_rate": (s.retry_calls / s.call_count) if s.call_count else None,
+                "error_count": s.error_count,
+            }
+            for model, s in self.models.items()
+        ]
+        rows.sort(key=lambda r: (-r["call_count"], r["model"]))
+        return rows
+
+    def source_rows(self) -> List[Dict[str, Any]]:
+        rows = [
+            {
+                "data_source": source,
+                "query_count": s.query_count,
+                "docs_retrieved_total": s.docs_retrieved,
+                "docs_used_total": s.docs_used,
+                "retrieval_to_use_ratio": (s.docs_used / s.docs_retrieved) if s.docs_retrieved else None,
+                "top_score_p50": s.top_scores.quantile(0.5),
+                "top_score_p95": s.top_scores.quantile(0.95),
+                "top_score_max": s.top_scores.max,
+            }
+            for source, s in self.sources.items()
+        ]
+        rows.sort(key=lambda r: (-r["query_count"], r["data_source"]))
+        return rows
+
+
+# ---------------------------------------------------------------------------
+# Rollup state
+# ---------------------------------------------------------------------------
+
+
+class SpanRollups:
+    """Minute and hour buckets of one process, keyed by bucket start (ns)."""
+
+    def __init__(self, started_ns: int) -> None:
+        self.started_ns = started_ns
+        self.minutes: Dict[int, RollupBucket] = {}
+        self.hours: Dict[int, RollupBucket] = {}
+
+    def observe(self, name: str, attrs: Dict[str, Any], start_ns: int, status: Optional[str]) -> None:
+        key = start_ns - start_ns % _MINUTE_NS
+        bucket = self.minutes.get(key)
+        if bucket is None:
+            bucket = self.minutes[key] = RollupBucket()
+        bucket.observe(name, attrs, start_ns, status)
+
+    def roll(self, now_ns: int, retention_ns: int) -> None:
+        """Fold day-old minutes into hours and drop buckets past retention."""
+        fold_before = now_ns - MINUTE_RESOLUTION_NS
+        for key in [k for k in self.minutes if k < fold_before]:
+            hour = key - key % _HOUR_NS
+            self.hours.setdefault(hour, RollupBucket()).merge(self.minutes.pop(key))
+        cutoff = now_ns - retention_ns
+        for buckets, width in ((self.minutes, _MINUTE_NS), (self.hours, _HOUR_NS)):
+            for key in [k for k in buckets if k + width <= cutoff]:
+                del buckets[key]
+
+    def window(self, since_ns: int, until_ns: int, into: RollupBucket) -> None:
+        """Merge every bucket whose midpoint falls inside the window into ``into``."""
+        for buckets, width in ((self.minutes, _MINUTE_NS), (self.hours, _HOUR_NS)):
+            for key, bucket in buckets.items():
+                if key + width // 2 >= since_ns and key <= until_ns:
+                    into.merge(bucket)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": _FORMAT_VERSION,
+            "started_ns": self.started_ns,
+            "saved_ns": time.time_ns(),
+            "minutes": {str(k): b.to_dict() for k, b in self.minutes.items()},
+            "hours": {str(k): b.to_dict() for k, b in self.hours.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "SpanRollups":
+        rollups = cls(int(raw["started_ns"]))
+        rollups.minutes = {int(k): RollupBucket.from_dict(b) for k, b in (raw.get("minutes") or {}).items()}
+        rollups.hours = {int(k): RollupBucket.from_dict(b) for k, b in (raw.get("hours") or {}).items()}
+        return rollups
+
+
+class SpanRollupProcessor(SpanProcessor):
+    """Maintain ``SpanRollups`` for every ended span and serve them to the
+    dashboard (implements ``SpanAnalytics`` from the telemetry routes).
+    """
+
+    def __init__(
+        self,
+        store: SpanStore,
+        *,
+        flush_seconds: float = DEFAULT_FLUSH_SECONDS,
+        start_thread: bool = True,
+    ) -> None:
+        self.directory = store.directory / ROLLUPS_DIRNAME
+        self.flush_seconds = flush_seconds
+        retention_ns = int(store.retention_days * 86400 * 1_000_000_000)
+        self.retention_ns = min(retention_ns, MAX_RETENTION_NS) if retention_ns > 0 else MAX_RETENTION_NS
+        self._lock = threading.Lock()
+        self._rollups = SpanRollups(time.time_ns())
+        self.path = self.directory / f"rollup-{os.getpid()}-{self._rollups.started_ns}.json"
+        # Other processes' files, parsed once per modification.
+        self._peers: Dict[Path, Tuple[int, SpanRollups]] = {}
+        self._peers_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if start_thread:
+            self._thread = threading.Thread(target=self._run, name="span-rollups", daemon=True)
+            self._thread.start()
+
+    # -- SpanProcessor --------------------------------------------------
+
+    def on_start(self, span, parent_context=None) -> None:  # noqa: ANN001, ARG002
+        pass
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.name not in ("chat.turn", "llm.call", "tool.call", "rag.query") or not span.start_time:
+            return
+        status = span.status.status_code.name if span.status else None
+        try:
+            with self._lock:
+                self._rollups.observe(span.name, dict(span.attributes or {}), span.start_time, status)
+        except Exception as e:  # noqa: BLE001
+            logger.debug("Span rollup update failed: %s", e)
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.save()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:  # noqa: ARG002
+        return self.save()
+
+    # -- Persistence ----------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_seconds):
+            self.save()
+
+    def save(self) -> bool:
+        """Roll buckets up and write this process's file atomically."""
+        try:
+            with self._lock:
+                self._rollups.roll(time.time_ns(), self.retention_ns)
+                payload = json.dumps(self._rollups.to_dict(), separators=(",", ":"))
+            self.directory.mkdir(parents=True, exist_ok=True, mode=0o700)
+            tmp = self.path.with_suffix(".tmp")
+            fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp, self.path)
+            self._expire_peers()
+            return True
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Saving span rollups failed: %s", e)
+            return False
+
+    def _expire_peers(self) -> None:
+        cutoff_s = time.time() - self.retention_ns / 1e9
+        for path in self.directory.glob("rollup-*.json"):
+            try:
+                if path != self.path and path.stat().st_mtime < cutoff_s:
+                    path.unlink()
+            except OSError:
+                continue
+
+    def _load_peers(self) -> List[SpanRollups]:
+        with self._peers_lock:
+            return self._load_peers_locked()
+
+    def _load_peers_locked(self) -> List[SpanRollups]:
+        peers: Dict[Path, Tuple[int, SpanRollups]] = {}
+        if self.directory.is_dir():
+            for path in self.directory.glob("rollup-*.json"):
+                if path == self.path:
+                    continue
+                try:
+                    mtime = path.stat().st_mtime_ns
+                    cached = self._peers.get(path)
+                    if cached is None or cached[0] != mtime:
+                        cached = (mtime, SpanRollups.from_dict(json.loads(path.read_text(encoding="utf-8"))))
+                    peers[path] = cached
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    logger.debug("Skipping unreadable rollup file %s: %s", path, e)
+        self._peers = peers
+        return [rollups for _, rollups in peers.values()]
+
+    # -- Queries --------------------------------------------------------
+
+    def covered_since_ns(self) -> int:
+        """Start of the period the rollups (this process plus saved peers) cover."""
+        return min([self._rollups.started_ns] + [p.started_ns for p in self._load_peers()])
+
+    def covers(self, since_ns: int) -> bool:
+        return self.covered_since_ns() <= since_ns
+
+    def _window(self, since_ns: int, until_ns: int) -> RollupBucket:
+        total = RollupBucket()
+        for peer in self._load_peers():
+            peer.window(since_ns, until_ns, total)
+        with self._lock:
+            self._rollups.window(since_ns, until_ns, total)
+        return total
+
+    def overview_stats(self, since_ns: int, until_ns: int) -> Dict[str, Any]:
+        return self._window(since_ns, until_ns).overview()
+
+    def tool_stats(self, since_ns: int, until_ns: int) -> List[Dict[str, Any]]:
+        return self._window(since_ns, until_ns).tool_rows()
+
+    def llm_stats(self, since_ns: int, until_ns: int) -> List[Dict[str, Any]]:
+        return self._window(since_ns, until_ns).model_rows()
+
+    def rag_stats(self, since_ns: int, until_ns: int) -> List[Dict[str, Any]]:
+        return self._window(since_ns, until_ns).source_rows()
+
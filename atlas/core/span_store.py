@@ -0,0 +1,637 @@
+"""Time-partitioned on-disk store for the span audit trail.
+
+Spans are written as JSON lines into hourly segment files under
+``<APP_LOG_DIR>/spans/``; a segment is rotated early once it reaches
+``max_segment_bytes``. ``manifest.json`` next to them records each segment's
+min/max ``start_time_ns`` and the span names it holds, so readers open only
+the segments that can contain matching spans instead of parsing the whole
+audit trail on every query.
+
+Maintenance (``SpanStore.maintain``) indexes segments whose writer has moved
+on, merges hourly segments older than ``compact_after_hours`` into one file
+per day, and, when ``retention_days`` is set, deletes segments whose newest
+span has aged out. The exporter runs it in the background after every
+rotation; admins can also trigger it via ``POST /admin/telemetry/compact``.
+
+Segment files without a manifest entry (a crash before the manifest was
+written, a migrated pre-upgrade ``spans.jsonl``) are always read, so the
+index can make a query cheaper but never drops spans from it.
+
+``spans/index/`` holds a per-segment secondary index from hashed trace,
+session and turn IDs to byte offsets (see ``atlas.core.span_index``), so
+``find_trace``/``find_turns`` seek straight to the matching lines. Segments
+without an index are scanned instead.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from atlas.core import span_index
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_DIRNAME = "spans"
+MANIFEST_FILENAME = "manifest.json"
+LEGACY_SPANS_FILENAME = "spans.jsonl"
+
+DEFAULT_MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+DEFAULT_RETENTION_DAYS = 0.0
+DEFAULT_COMPACT_AFTER_HOURS = 24.0
+
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_HOUR = 3600 * _NS_PER_SECOND
+_NS_PER_DAY = 24 * _NS_PER_HOUR
+# A writer checks for rotation when a batch starts, so a batch begun just
+# before the hour boundary can still be landing just after it.
+_CLOSE_GRACE_NS = 60 * _NS_PER_SECOND
+
+# spans-20261016T13-<pid>-<seq>.jsonl (hourly) or spans-20261016.jsonl
+# (compacted day). Anything else, e.g. a migrated legacy file, is treated
+# as closed.
+_SEGMENT_RE = re.compile(r"^spans-(\d{8})(?:T(\d{2}))?(?:-[\w.-]+)?\.jsonl$")
+
+
+def hour_bucket(time_ns: int) -> str:
+    """UTC hour a segment opened at ``time_ns`` belongs to, e.g. ``20261016T13``."""
+    return datetime.fromtimestamp(time_ns / _NS_PER_SECOND, tz=timezone.utc).strftime("%Y%m%dT%H")
+
+
+def bucket_end_ns(filename: str) -> int:
+    """Wall-clock time after which nothing is appended to ``filename``.
+
+    Spans are exported after they start, so this also bounds the newest
+    ``start_time_ns`` a segment can hold. Returns 0 for files the exporter
+    never writes to (compacted days, migrated legacy files).
+    """
+    match = _SEGMENT_RE.match(filename)
+    if not match or match.group(2) is None:
+        return 0
+    start = datetime.strptime(match.group(1) + match.group(2), "%Y%m%d%H").replace(tzinfo=timezone.utc)
+    return int((start + timedelta(hours=1)).timestamp()) * _NS_PER_SECOND
+
+
+def _hourly_day(filename: str) -> Optional[str]:
+    match = _SEGMENT_RE.match(filename)
+    if not match or match.group(2) is None:
+        return None
+    return match.group(1)
+
+
+@dataclass
+class SegmentInfo:
+    """Manifest entry for one segment file."""
+
+    file: str
+    min_start_ns: Optional[int] = None
+    max_start_ns: Optional[int] = None
+    names: Set[str] = field(default_factory=set)
+    span_count: int = 0
+    size_bytes: int = 0
+    # False while a writer may still append; readers then cannot trust
+    # max_start_ns and fall back to the segment's bucket end.
+    sealed: bool = False
+
+    def observe(self, record: Dict[str, Any], line_bytes: int = 0) -> bool:
+        """Fold one span record into the stats.
+
+        Returns True when readers must see the updated entry to stay correct
+        (an earlier start time or a new span name); a later ``max_start_ns``
+        is covered by the unsealed-segment rule and needs no manifest write.
+        """
+        changed = False
+        start = record.get("start_time_ns")
+        if isinstance(start, int):
+            if self.min_start_ns is None or start < self.min_start_ns:
+                self.min_start_ns = start
+                changed = True
+            if self.max_start_ns is None or start > self.max_start_ns:
+                self.max_start_ns = start
+        name = record.get("name")
+        if isinstance(name, str) and name not in self.names:
+            self.names.add(name)
+            changed = True
+        self.span_count += 1
+        self.size_bytes += line_bytes
+        return changed
+
+    def merge(self, other: "SegmentInfo") -> None:
+        if other.min_start_ns is not None and (self.min_start_ns is None or other.min_start_ns < self.min_start_ns):
+            self.min_start_ns = other.min_start_ns
+        if other.max_start_ns is not None and (self.max_start_ns is None or other.max_start_ns > self.max_start_ns):
+            self.max_start_ns = other.max_start_ns
+        self.names |= other.names
+        self.span_count += other.span_count
+        self.size_bytes += other.size_bytes
+
+    def may_contain(
+        self,
+        since_ns: Optional[int],
+        until_ns: Optional[int],
+        names: Optional[Set[str]],
+    ) -> bool:
+        """Whether the segment can hold a span matching the filters."""
+        if names is not None and not (self.names & names):
+            return False
+        if self.min_start_ns is None:
+            return not self.sealed
+        if until_ns is not None and self.min_start_ns > until_ns:
+            return False
+        if since_ns is not None:
+            newest = self.max_start_ns if self.sealed else bucket_end_ns(self.file) or None
+            if newest is not None and newest < since_ns:
+                return False
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file": self.file,
+            "min_start_ns": self.min_start_ns,
+            "max_start_ns": self.max_start_ns,
+            "names": sorted(self.names),
+            "span_count": self.span_count,
+            "size_bytes": self.size_bytes,
+            "sealed": self.sealed,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "SegmentInfo":
+        return cls(
+            file=str(raw["file"]),
+            min_start_ns=raw.get("min_start_ns"),
+            max_start_ns=raw.get("max_start_ns"),
+            names=set(raw.get("names") or ()),
+            span_count=int(raw.get("span_count") or 0),
+            size_bytes=int(raw.get("size_bytes") or 0),
+            sealed=bool(raw.get("sealed")),
+        )
+
+
+def iter_segment_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the JSON records of one segment, skipping blank and corrupt lines."""
+    try:
+        fh = path.open("r", encoding="utf-8", errors="replace")
+    except FileNotFoundError:
+        # Compacted or expired between selection and read.
+        return
+    with fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def scan_segment(path: Path) -> SegmentInfo:
+    """Build a manifest entry by reading a segment end to end."""
+    info = SegmentInfo(file=path.name)
+    for record in iter_segment_records(path):
+        info.observe(record)
+    try:
+        info.size_bytes = path.stat().st_size
+    except OSError:
+        pass
+    return info
+
+
+class SpanStore:
+    """A directory of span segments plus the manifest that indexes them."""
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        legacy_path: Optional[Path] = None,
+        max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+        retention_days: float = DEFAULT_RETENTION_DAYS,
+        compact_after_hours: float = DEFAULT_COMPACT_AFTER_HOURS,
+    ) -> None:
+        self.directory = Path(directory)
+        self.legacy_path = legacy_path
+        self.max_segment_bytes = max_segment_bytes
+        self.retention_days = retention_days
+        self.compact_after_hours = compact_after_hours
+        self._manifest_lock = threading.Lock()
+        self._maintenance_lock = threading.Lock()
+
+    @classmethod
+    def for_log_dir(cls, log_dir: Path, app_settings: Any = None) -> "SpanStore":
+        """Store under ``<log_dir>/spans/`` configured from ``app_settings``."""
+        log_dir = Path(log_dir)
+        return cls(
+            log_dir / SEGMENT_DIRNAME,
+            legacy_path=log_dir / LEGACY_SPANS_FILENAME,
+            max_segment_bytes=getattr(app_settings, "spans_segment_max_bytes", DEFAULT_MAX_SEGMENT_BYTES),
+            retention_days=getattr(app_settings, "spans_retention_days", DEFAULT_RETENTION_DAYS),
+            compact_after_hours=getattr(app_settings, "spans_compact_after_hours", DEFAULT_COMPACT_AFTER_HOURS),
+        )
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / MANIFEST_FILENAME
+
+    @property
+    def index_dir(self) -> Path:
+        return self.directory / span_index.INDEX_DIRNAME
+
+    def ensure_dir(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        try:
+            os.chmod(self.directory, 0o700)
+        except OSError as e:
+            logger.debug("Could not restrict span directory permissions on %s: %s", self.directory, e)
+        self.index_dir.mkdir(mode=0o700, exist_ok=True)
+
+    def index_path(self, segment_name: str, *, live: bool = False) -> Path:
+        """Sorted (or, with ``live``, append-only) index file of a segment."""
+        stem = segment_name[: -len(".jsonl")] if segment_name.endswith(".jsonl") else segment_name
+        suffix = span_index.LIVE_SUFFIX if live else span_index.SORTED_SUFFIX
+        return self.index_dir / f"{stem}{suffix}"
+
+    def seal_index(self, segment: Path, entries: Optional[Iterable[span_index.Entry]] = None) -> None:
+        """Write the sorted index of a closed segment and drop its live index.
+
+        ``entries`` come from the writer's live index; without them the
+        segment is scanned.
+        """
+        if entries is None:
+            entries = span_index.scan_entries(segment)
+        self.index_dir.mkdir(mode=0o700, exist_ok=True)
+        span_index.write_sorted(self.index_path(segment.name), entries)
+        self._unlink(self.index_path(segment.name, live=True))
+
+    def segment_paths(self) -> List[Path]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(self.directory.glob("*.jsonl"))
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+    def load_manifest(self) -> Dict[str, SegmentInfo]:
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable span manifest %s: %s", self.manifest_path, e)
+            return {}
+        entries: Dict[str, SegmentInfo] = {}
+        for raw in data.get("segments", []) if isinstance(data, dict) else []:
+            try:
+                info = SegmentInfo.from_dict(raw)
+            except (KeyError, TypeError, ValueError):
+                continue
+            entries[info.file] = info
+        return entries
+
+    def update_manifest(
+        self,
+        updates: Iterable[SegmentInfo] = (),
+        removed: Iterable[str] = (),
+    ) -> None:
+        """Merge ``updates`` into the manifest and drop ``removed`` entries.
+
+        Several workers can share one log directory, so this re-reads the
+        manifest under a file lock instead of overwriting other writers'
+        entries with a stale copy.
+        """
+        with self._manifest_lock, self._file_lock(".manifest.lock"):
+            entries = self.load_manifest()
+            for name in removed:
+                entries.pop(name, None)
+            for info in updates:
+                entries[info.file] = info
+            payload = {
+                "version": 1,
+                "segments": [entries[name].to_dict() for name in sorted(entries)],
+            }
+            tmp = self.directory / f".{MANIFEST_FILENAME}.{os.getpid()}.tmp"
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(tmp, self.manifest_path)
+
+    @contextmanager
+    def _file_lock(self, name: str) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        with (self.directory / name).open("a") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def select(
+        self,
+        since_ns: Optional[int] = None,
+        until_ns: Optional[int] = None,
+        names: Optional[Iterable[str]] = None,
+    ) -> List[Path]:
+        """Files that may hold spans matching the filters."""
+        name_filter = set(names) if names else None
+        manifest = self.load_manifest()
+        selected: List[Path] = []
+        if self.legacy_path is not None and self.legacy_path.exists():
+            selected.append(self.legacy_path)
+        for path in self.segment_paths():
+            info = manifest.get(path.name)
+            if info is not None and not info.may_contain(since_ns, until_ns, name_filter):
+                continue
+            selected.append(path)
+        return selected
+
+    def find(
+        self,
+        key: int,
+        *,
+        since_ns: Optional[int] = None,
+        until_ns: Optional[int] = None,
+        names: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Records stored under index ``key`` in the segments ``select`` picks.
+
+        Index hits are hash matches (and unindexed segments are filtered by
+        recomputing the keys), so callers re-check the fields they need.
+        """
+        for path in self.select(since_ns, until_ns, names):
+            try:
+                offsets = span_index.search_sorted(self.index_path(path.name), key)
+            except FileNotFoundError:
+                live = self.index_path(path.name, live=True)
+                if not live.exists():
+                    for record in iter_segment_records(path):
+                        if key in span_index.record_keys(record):
+                            yield record
+                    continue
+                offsets = [offset for k, offset in span_index.read_entries(live) if k == key]
+            yield from span_index.read_records_at(path, offsets)
+
+    def find_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """Every span of one trace."""
+        return [
+            record
+            for record in self.find(span_index.trace_key(trace_id))
+            if record.get("trace_id") == trace_id
+        ]
+
+    def find_turns(
+        self,
+        *,
+        session_id: Optional[str] = None,
+        turn_id: Optional[str] = None,
+        since_ns: Optional[int] = None,
+        until_ns: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """``chat.turn`` spans with the given ``turn_id`` and/or ``session_id``."""
+        if turn_id:
+            key = span_index.turn_key(turn_id)
+        elif session_id:
+            key = span_index.session_key(session_id)
+        else:
+            raise ValueError("find_turns needs a session_id or turn_id")
+        out: List[Dict[str, Any]] = []
+        for record in self.find(key, since_ns=since_ns, until_ns=until_ns, names=("chat.turn",)):
+            attrs = record.get("attributes")
+            start = record.get("start_time_ns")
+            if record.get("name") != "chat.turn" or not isinstance(attrs, dict) or start is None:
+                continue
+            if (turn_id and attrs.get("turn_id") != turn_id) or (
+                session_id and attrs.get("session_id") != session_id
+            ):
+                continue
+            if (since_ns is not None and start < since_ns) or (until_ns is not None and start > until_ns):
+                continue
+            out.append(record)
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        manifest = self.load_manifest()
+        paths = self.segment_paths()
+        if self.legacy_path is not None and self.legacy_path.exists():
+            paths.append(self.legacy_path)
+        size_bytes = 0
+        last_modified: Optional[float] = None
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            size_bytes += stat.st_size
+            last_modified = max(last_modified or 0.0, stat.st_mtime)
+        return {
+            "segments": len(paths),
+            "indexed_segments": sum(1 for p in paths if p.name in manifest),
+            "size_bytes": size_bytes,
+            "last_modified": last_modified,
+        }
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def migrate_legacy(self) -> Optional[Path]:
+        """Move a pre-upgrade single ``spans.jsonl`` into the segment directory.
+
+        It is indexed (and eventually expired) like any closed segment on the
+        next maintenance pass.
+        """
+        if self.legacy_path is None or not self.legacy_path.exists():
+            return None
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        target = self.directory / f"spans-legacy-{stamp}.jsonl"
+        try:
+            os.replace(self.legacy_path, target)
+        except FileNotFoundError:
+            # Another worker migrated it first.
+            return None
+        except OSError as e:
+            logger.warning("Could not move %s into %s: %s", self.legacy_path, self.directory, e)
+            return None
+        logger.info("Moved legacy span file %s to %s", self.legacy_path, target)
+        return target
+
+    def maintain(self, now_ns: Optional[int] = None) -> Dict[str, int]:
+        """Index closed segments, compact old hourly ones and apply retention."""
+        now_ns = now_ns if now_ns is not None else time.time_ns()
+        if not self.directory.is_dir():
+            return {"indexed": 0, "compacted": 0, "deleted": 0}
+        with self._maintenance_lock, self._file_lock(".maintenance.lock"):
+            manifest = self.load_manifest()
+            updates: Dict[str, SegmentInfo] = {}
+            removed: List[str] = []
+            result = {"indexed": 0, "compacted": 0, "deleted": 0}
+
+            closed: Dict[str, Path] = {}
+            for path in self.segment_paths():
+                if bucket_end_ns(path.name) + _CLOSE_GRACE_NS > now_ns:
+                    continue
+                closed[path.name] = path
+                info = manifest.get(path.name)
+                if info is None or not info.sealed:
+                    # Written by a worker that has since rotated or died.
+                    info = scan_segment(path)
+                    info.sealed = True
+                    updates[path.name] = info
+                    result["indexed"] += 1
+                manifest[path.name] = info
+
+            cutoff_ns = now_ns - int(self.retention_days * _NS_PER_DAY) if self.retention_days > 0 else None
+            for name, path in list(closed.items()):
+                info = manifest[name]
+                expired = cutoff_ns is not None and info.max_start_ns is not None and info.max_start_ns < cutoff_ns
+                if info.span_count == 0 or expired:
+                    self._unlink(path)
+                    self._unlink_index(name)
+                    del closed[name]
+                    updates.pop(name, None)
+                    removed.append(name)
+                    result["deleted"] += 1
+
+            if self.compact_after_hours > 0:
+                compact_before_ns = now_ns - int(self.compact_after_hours * _NS_PER_HOUR)
+                by_day: Dict[str, List[Path]] = {}
+                for name, path in closed.items():
+                    day = _hourly_day(name)
+                    if day is not None and bucket_end_ns(name) <= compact_before_ns:
+                        by_day.setdefault(day, []).append(path)
+                for day, sources in sorted(by_day.items()):
+                    merged = self._compact_day(day, sorted(sources), manifest)
+                    if merged is None:
+                        continue
+                    for path in sources:
+                        updates.pop(path.name, None)
+                        removed.append(path.name)
+                        del closed[path.name]
+                    updates[merged.file] = merged
+                    closed[merged.file] = self.directory / merged.file
+                    result["compacted"] += len(sources)
+
+            for name, path in closed.items():
+                if not self.index_path(name).exists():
+                    # Closed by a worker that died, or written before the
+                    # ID index existed.
+                    try:
+                        self.seal_index(path)
+                    except OSError as e:
+                        logger.warning("Could not index span segment %s: %s", path, e)
+                        continue
+                    if name not in updates:
+                        result["indexed"] += 1
+            self._prune_indexes(now_ns)
+
+            if updates or removed:
+                self.update_manifest(updates.values(), removed)
+        if any(result.values()):
+            logger.info("Span store maintenance: %s", result)
+        return result
+
+    def _compact_day(
+        self,
+        day: str,
+        sources: List[Path],
+        manifest: Dict[str, SegmentInfo],
+    ) -> Optional[SegmentInfo]:
+        """Concatenate ``sources`` (plus any existing day file) into ``spans-<day>.jsonl``.
+
+        The day file is rebuilt in a temp file and swapped in atomically; the
+        hourly sources are deleted only after the swap, so a crash leaves at
+        worst duplicate spans, never missing ones.
+        """
+        target = self.directory / f"spans-{day}.jsonl"
+        inputs = ([target] if target.exists() else []) + sources
+        merged = SegmentInfo(file=target.name, sealed=True)
+        for path in inputs:
+            info = manifest.get(path.name)
+            merged.merge(info if info is not None and info.sealed else scan_segment(path))
+        tmp = self.directory / f".{target.name}.{os.getpid()}.tmp"
+        entries: List[span_index.Entry] = []
+        try:
+            fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as out:
+                for path in inputs:
+                    # Each input's index entries move by where it lands.
+                    base = out.tell()
+                    sorted_index = self.index_path(path.name)
+                    if sorted_index.exists():
+                        source_entries = span_index.read_entries(sorted_index)
+                    else:
+                        source_entries = span_index.scan_entries(path)
+                    entries.extend((key, base + offset) for key, offset in source_entries)
+                    with path.open("rb") as src:
+                        shutil.copyfileobj(src, out)
+                out.flush()
+                os.fsync(out.fileno())
+            # Index first: a crash in between leaves a stale index (missing
+            # offsets are simply not found) rather than a wrong one for the
+            # new file.
+            self.seal_index(tmp, entries)
+            os.replace(self.index_path(tmp.name), self.index_path(target.name))
+            os.replace(tmp, target)
+        except OSError as e:
+            logger.warning("Span segment compaction for %s failed: %s", day, e)
+            self._unlink(tmp)
+            self._unlink_index(tmp.name)
+            return None
+        for path in sources:
+            self._unlink(path)
+            self._unlink_index(path.name)
+        merged.size_bytes = target.stat().st_size
+        return merged
+
+    def _unlink_index(self, segment_name: str) -> None:
+        self._unlink(self.index_path(segment_name))
+        self._unlink(self.index_path(segment_name, live=True))
+
+    def _prune_indexes(self, now_ns: int) -> None:
+        """Drop index files whose segment no longer exists.
+
+        Live indexes are left alone for a while: a writer creates one right
+        after its segment, possibly after ``segment_paths`` was listed here.
+        """
+        if not self.index_dir.is_dir():
+            return
+        segments = {path.stem for path in self.segment_paths()}
+        stale_before = (now_ns - _NS_PER_HOUR) / _NS_PER_SECOND
+        for path in self.index_dir.iterdir():
+            if path.stem in segments:
+                continue
+            try:
+                if path.suffix == span_index.SORTED_SUFFIX or (
+                    path.suffix == span_index.LIVE_SUFFIX and path.stat().st_mtime < stale_before
+                ):
+                    self._unlink(path)
+            except OSError:
+                continue
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Could not remove span segment %s: %s", path, e)
@@ -0,0 +1,141 @@
+"""Shared machinery for the per-user TTL caches.
+
+``GroupMembershipCache``, ``ConfigResponseCache`` and ``RAGDiscoveryCache``
+all keep per-user results for a few seconds to minutes in front of slow
+upstream calls. ``SingleFlightTTLCache`` holds what they have in common:
+
+- LRU-bounded entries that expire ``ttl`` seconds after they are stored;
+- single flight: concurrent misses for one key share one loader call, and a
+  cancelled caller does not abort the call the others are waiting on;
+- a generation counter, so a load that raced an invalidation is returned to
+  its waiters but never stored;
+- per-user invalidation. Subclasses put the user's normalized email at
+  ``user_position`` in every key, so case and whitespace variants of one
+  address share entries and are dropped together.
+
+Failed loads are never cached: the loader raises, every waiter sees the
+error, and the next call asks again. Each cache lives in one worker process;
+invalidating it does not reach other workers.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from atlas.core.user_identity import normalize_user_email
+
+CacheKey = Tuple[Hashable, ...]
+
+
+class SingleFlightTTLCache:
+    """TTL + LRU cache with single-flight loads and per-user invalidation."""
+
+    # Index of the normalized user email in every key.
+    user_position = 0
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key -> (value, expires_at)
+        self._entries: "OrderedDict[CacheKey, Tuple[Any, float]]" = OrderedDict()
+        self._in_flight: Dict[CacheKey, "asyncio.Future[Any]"] = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def user_key(user: Optional[str]) -> str:
+        """The form of ``user`` stored in keys."""
+        return normalize_user_email(user)
+
+    def _lookup(self, key: CacheKey) -> Optional[Any]:
+        """Return the cached value, or None if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: CacheKey, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl is None else ttl
+        if ttl <= 0:
+            return
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _get_or_load(
+        self,
+        key: CacheKey,
+        loader: Callable[[], Awaitable[Any]],
+        on_loaded: Callable[[Any], None],
+    ) -> Any:
+        """Return the cached value for ``key``, else the result of ``loader``.
+
+        ``loader`` runs at most once per key however many callers are
+        waiting. ``on_loaded`` receives its result unless an invalidation
+        happened meanwhile, and decides whether (and how) to store it.
+        """
+        cached = self._lookup(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+
+        pending = self._in_flight.get(key)
+        if pending is None:
+            generation = self.generation
+            pending = asyncio.ensure_future(loader())
+            self._in_flight[key] = pending
+
+            def _settle(done: "asyncio.Future[Any]") -> None:
+                if self._in_flight.get(key) is done:
+                    del self._in_flight[key]
+                if done.cancelled() or done.exception() is not None:
+                    return
+                # A load that raced an invalidation may hold stale data.
+                if generation == self.generation:
+                    on_loaded(done.result())
+
+            pending.add_done_callback(_settle)
+        # Shield so one cancelled caller does not abort the load the others
+        # are waiting on.
+        return await asyncio.shield(pending)
+
+    def invalidate(self) -> None:
+        """Drop every cached value, including loads still in flight."""
+        self.generation += 1
+        self._entries.clear()
+        self._in_flight.clear()
+
+    def invalidate_user(self, user: str) -> int:
+        """Drop every cached value for ``user``; returns how many.
+
+        Only this process's entries are dropped.
+        """
+        user = self.user_key(user)
+        position = self.user_position
+        keys = [key for key in self._entries if key[position] == user]
+        for key in keys:
+            del self._entries[key]
+        if any(key[position] == user for key in self._in_flight):
+            # Generations are not tracked per user; this only costs other
+            # users' in-flight loads their cache write.
+            self.generation += 1
+            self._in_flight = {k: f for k, f in self._in_flight.items() if k[position] != user}
+        return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,102 @@
+"""Per-user cache for the ``/api/config`` response.
+
+Building the config response runs HTTP and MCP RAG discovery, resolves the
+user's authorized MCP servers and checks model access -- several upstream
+round trips -- while the result rarely changes between page loads. This cache
+keeps the rendered response per (user, compliance level) for
+``ttl_seconds``, collapses concurrent builds for the same key into one, and
+tags each response with an ETag so unchanged configs can be answered with
+``304 Not Modified``.
+
+Anything that can change the response invalidates it: MCP discovery and
+reload, configuration reloads (RAG sources, models, settings), group-cache
+invalidation, and storing or removing a user's tokens. A build that started
+before the change is returned to its waiters but never stored (see
+``SingleFlightTTLCache``).
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from atlas.core.ttl_cache import SingleFlightTTLCache
+
+logger = logging.getLogger(__name__)
+
+ConfigBuilder = Callable[[], Awaitable[Dict[str, Any]]]
+
+DEFAULT_MAX_ENTRIES = 5_000
+
+
+@dataclass(frozen=True)
+class CachedConfig:
+    """A rendered config response and its ETag."""
+
+    body: bytes
+    etag: str
+
+
+def render_config(payload: Dict[str, Any]) -> CachedConfig:
+    """Serialize ``payload`` the way the route sends it and tag it."""
+    body = json.dumps(
+        payload, ensure_ascii=False, separators=(",", ":"), default=str
+    ).encode("utf-8")
+    return CachedConfig(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
+class ConfigResponseCache(SingleFlightTTLCache):
+    """Per-(user, compliance level) response cache with stampede protection."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = DEFAULT_MAX_ENTRIES):
+        super().__init__(ttl_seconds, max_entries)
+
+    def get(self, user: str, compliance_level: Optional[str] = None) -> Optional[CachedConfig]:
+        """Return the cached response, or None if absent or expired."""
+        return self._lookup((self.user_key(user), compliance_level))
+
+    def put(self, user: str, compliance_level: Optional[str], config: CachedConfig) -> None:
+        self._store((self.user_key(user), compliance_level), config)
+
+    async def get_or_build(
+        self, user: str, compliance_level: Optional[str], builder: ConfigBuilder
+    ) -> CachedConfig:
+        """Return the cached response, running ``builder`` at most once per key
+        however many callers are waiting for it."""
+
+        async def _build() -> CachedConfig:
+            return render_config(await builder())
+
+        return await self._get_or_load(
+            (self.user_key(user), compliance_level),
+            _build,
+            lambda config: self.put(user, compliance_level, config),
+        )
+
+
+# Lazily created from settings by get_config_cache().
+_config_cache: Optional[ConfigResponseCache] = None
+
+
+def get_config_cache() -> ConfigResponseCache:
+    """Return the process-wide ``/api/config`` response cache."""
+    global _config_cache
+    if _config_cache is None:
+        from atlas.modules.config.config_manager import config_manager
+
+        _config_cache = ConfigResponseCache(
+            ttl_seconds=config_manager.app_settings.config_cache_ttl_seconds,
+        )
+    return _config_cache
+
+
+def invalidate_config_cache(user: Optional[str] = None) -> None:
+    """Forget cached config responses for ``user``, or for everyone."""
+    if _config_cache is None:
+        return
+    if user is None:
+        _config_cache.invalidate()
+        logger.debug("Config response cache cleared")
+    else:
+        _config_cache.invalidate_user(user)
@@ -4,16 +4,23 @@ Aggregates discovery of RAG resources from authorized MCP servers that expose
 the `rag_discover_resources` tool. Returns a flat list of data source IDs for
 backward-compatible UI, with server-qualified IDs to avoid collisions.
 
+RAG servers from ``rag_mcp_config`` are connected by ``ensure_rag_servers`` at
+startup and retried by a background refresher, never on the request path.
+Discovery fans out to the servers concurrently and is cached per (user,
+compliance level).
+
 Future phases will add search/synthesis and richer shapes.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from atlas.core.compliance import get_compliance_manager
 from atlas.core.log_sanitizer import sanitize_for_logging
+from atlas.core.rag_discovery_cache import RAGDiscoveryCache
 
 logger = logging.getLogger(__name__)
 
@@ -21,10 +28,130 @@ logger = logging.getLogger(__name__)
 class RAGMCPService:
     """Aggregator for RAG over MCP servers."""
 
-    def __init__(self, mcp_manager, config_manager, auth_check_func) -> None:
+    def __init__(
+        self,
+        mcp_manager,
+        config_manager,
+        auth_check_func,
+        discovery_cache_ttl_seconds: float = 0.0,
+        discovery_timeout_seconds: Optional[float] = None,
+    ) -> None:
         self.mcp_manager = mcp_manager
         self.config_manager = config_manager
         self.auth_check_func = auth_check_func
+        self.discovery_timeout_seconds = discovery_timeout_seconds
+        # Discovery results per (shape, user, compliance level)
+        self._discovery_cache = RAGDiscoveryCache(discovery_cache_ttl_seconds)
+        self._bootstrap_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------ server bootstrap
+
+    def _missing_rag_servers(self) -> List[str]:
+        rag_servers = self.config_manager.rag_mcp_config.servers
+        clients = getattr(self.mcp_manager, "clients", {})
+        tools = getattr(self.mcp_manager, "available_tools", {})
+        # A fleet-wide discover_tools() drops tools of servers outside
+        # servers_config, so a connected RAG server can still need rediscovery.
+        return [
+            name for name, cfg in rag_servers.items()
+            if getattr(cfg, "enabled", True) and (name not in clients or name not in tools)
+        ]
+
+    async def ensure_rag_servers(self) -> List[str]:
+        """Connect RAG servers from ``rag_mcp_config`` that have no client or
+        no discovered tools yet.
+
+        Only those servers are initialized (if needed) and have their tools
+        discovered; the rest of the MCP fleet is left alone. The servers are
+        never added to ``servers_config``, which keeps them out of the general
+        tools panel and leaves a concurrent ``reload_config()`` untouched.
+        Returns the servers that were connected; discovery results are
+        invalidated when any were.
+        """
+        async with self._bootstrap_lock:
+            missing = self._missing_rag_servers()
+            if not missing:
+                return []
+            rag_servers = self.config_manager.rag_mcp_config.servers
+            manager = self.mcp_manager
+            connected: List[str] = []
+            try:
+                for name in missing:
+                    server_config = rag_servers[name].model_dump()
+                    client = manager.clients.get(name)
+                    if client is None:
+                        client = await manager._initialize_single_client(name, server_config)
+                    if client is None:
+                        logger.warning("RAG MCP server %s is not reachable yet", sanitize_for_logging(name))
+                        continue
+                    manager.clients[name] = client
+                    manager.available_tools[name] = await manager._discover_tools_for_server(
+                        name, client, server_config
+                    )
+                    connected.append(name)
+            except Exception as e:
+                logger.warning("RAG MCP server bootstrap failed: %s", e)
+            if connected:
+                manager._invalidate_tool_schemas()
+                self.invalidate_cache()
+                logger.info("Connected RAG MCP servers: %s", sanitize_for_logging(", ".join(connected)))
+            return connected
+
+    def start_background_refresh(self, interval_seconds: float) -> None:
+        """Retry unconnected RAG servers every ``interval_seconds`` (0 disables)."""
+        if interval_seconds <= 0 or self._refresh_task is not None:
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_loop(interval_seconds))
+        logger.info("Started RAG MCP background refresh (every %ss)", interval_seconds)
+
+    async def stop_background_refresh(self) -> None:
+        """Stop the background refresher started by ``start_background_refresh``."""
+        task, self._refresh_task = self._refresh_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            # Expected: we just cancelled it.
+            pass
+
+    async def _refresh_loop(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.ensure_rag_servers()
+            except Exception as e:
+                logger.warning("RAG MCP background refresh failed: %s", e)
+
+    def invalidate_cache(self) -> None:
+        """Drop cached discovery results for every user.
+
+        Call this when RAG servers or their tools change.
+        """
+        self._discovery_cache.invalidate()
+
+    def invalidate_user_cache(self, username: str) -> int:
+        """Drop cached discovery results for one user, e.g. after their
+        group membership changed; returns how many."""
+        return self._discovery_cache.invalidate_user(username)
+
+    # ------------------------------------------------------------- discovery
+
+    async def _call_discovery(self, server: str, username: str) -> List[Dict[str, Any]]:
+        """Call ``rag_discover_resources`` on one server, bounded by the
+        discovery timeout, and return its resources."""
+        raw = await asyncio.wait_for(
+            self.mcp_manager.call_tool(
+                server_name=server,
+                tool_name="rag_discover_resources",
+                arguments={"_atlas_user": username},
+            ),
+            timeout=self.discovery_timeout_seconds,
+        )
+        structured = self._extract_structured_result(raw)
+        return self._extract_resources(structured)
 
     async def _get_authorized_rag_servers(self, username: str, rag_servers: dict) -> List[str]:
         """Get list of RAG servers the user is authorized to access.
@@ -33,54 +160,43 @@ class RAGMCPService:
         independent of mcp_manager.servers_config (which excludes RAG servers
         to keep them separate from the tools panel).
         """
-        authorized = []
-        for server_name, server_config in rag_servers.items():
-            if not server_config.enabled:
-                continue
-
-            required_groups = server_config.groups or []
-            if not required_groups:
-                # No group restriction - available to all
-                authorized.append(server_name)
-                continue
-
-            # Check if user is in any of the required groups
-            group_checks = [
-                await self.auth_check_func(username, group)
-                for group in required_groups
-            ]
-            if any(group_checks):
-                authorized.append(server_name)
-
-        return authorized
+        enabled = {
+            name: list(cfg.groups or [])
+            for name, cfg in rag_servers.items()
+            if cfg.enabled
+        }
+        # Check each distinct group once, all concurrently
+        groups = sorted({group for required in enabled.values() for group in required})
+        results = await asyncio.gather(*(self.auth_check_func(username, group) for group in groups))
+        member_of = {group for group, ok in zip(groups, results) if ok}
+
+        # No group restriction - available to all; otherwise any required group
+        return [
+            name for name, required in enabled.items()
+            if not required or member_of.intersection(required)
+        ]
 
     async def discover_data_sources(self, username: str, user_compliance_level: Optional[str] = None) -> List[str]:
         """Discover data sources across authorized MCP RAG servers.
 
         Phase 1 returns a flat list of strings for backward compatibility.
         Uses server-qualified IDs: "{server}:{resource_id}" to avoid collisions.
+        Complete results are cached per (user, compliance level).
         """
-        # Ensure RAG servers are initialized from rag_mcp_config, without polluting tool inventory
-        try:
-            rag_servers = self.config_manager.rag_mcp_config.servers
-            # If these servers aren't in mcp_manager.clients, initialize just these
-            missing = [name for name in rag_servers.keys() if name not in getattr(self.mcp_manager, "clients", {})]
-            if missing:
-                # Temporarily extend servers_config with rag servers and initialize them
-                original = dict(getattr(self.mcp_manager, "servers_config", {}))
-                try:
-                    self.mcp_manager.servers_config.update({name: cfg.model_dump() for name, cfg in rag_servers.items()})
-                    await self.mcp_manager.initialize_clients()
-                    await self.mcp_manager.discover_tools()
-                finally:
-                    # Restore original list for general tools panel separation
-                    self.mcp_manager.servers_config = original
-        except Exception:
-            # If anything goes wrong, fallback silently to existing clients
-            pass
+        return await self._discovery_cache.get_or_load(
+            "flat",
+            username,
+            user_compliance_level,
+            lambda: self._discover_data_sources(username, user_compliance_level),
+        )
+
+    async def _discover_data_sources(
+        self, username: str, user_compliance_level: Optional[str]
+    ) -> Tuple[List[str], bool]:
+        """Returns the sources and whether every server answered."""
         try:
             # Determine RAG servers current user can see
-            # Use rag_mcp_config directly since servers_config was restored above
+            # Use rag_mcp_config directly; RAG servers are kept out of servers_config
             rag_servers = self.config_manager.rag_mcp_config.servers
             authorized_servers: List[str] = await self._get_authorized_rag_servers(
                 username, rag_servers
@@ -88,7 +204,7 @@ class RAGMCPService:
 
             if not authorized_servers:
                 logger.info("No authorized MCP servers for user %s", sanitize_for_logging(username))
-                return []
+                return [], True
 
             # --- Compliance Filtering (Step 2) ---
             if user_compliance_level:
@@ -111,7 +227,7 @@ class RAGMCPService:
                 authorized_servers = filtered_servers
                 if not authorized_servers:
                     logger.info("No authorized MCP servers remain after compliance filtering for user %s", sanitize_for_logging(username))
-                    return []
+                    return [], True
             # -------------------------------------
 
             # Filter to servers that advertise the discovery tool
@@ -124,33 +240,31 @@ class RAGMCPService:
 
             if not servers_with_discovery:
                 logger.info("No servers implement rag_discover_resources for user %s", sanitize_for_logging(username))
-                return []
+                return [], True
 
-            # Fan out discovery calls
+            # Fan out discovery calls concurrently
+            results = await asyncio.gather(
+                *(self._call_discovery(server, username) for server in servers_with_discovery),
+                return_exceptions=True,
+            )
             sources: List[str] = []
-            for server in servers_with_discovery:
-                try:
-                    raw = await self.mcp_manager.call_tool(
-                        server_name=server,
-                        tool_name="rag_discover_resources",
-                        arguments={"_atlas_user": username},
-                    )
-
-                    structured = self._extract_structured_result(raw)
-                    resources = self._extract_resources(structured)
-                    for r in resources:
-                        rid = r.get("id") or r.get("name")
-                        if not isinstance(rid, str):
-                            continue
-                        # Qualify with server to avoid collisions across providers
-                        sources.append(f"{server}:{rid}")
-                except Exception as e:
+            complete = True
+            for server, resources in zip(servers_with_discovery, results):
+                if isinstance(resources, BaseException):
                     logger.warning(
                         "Discovery failed on server %s for user %s: %s",
                         sanitize_for_logging(server),
                         sanitize_for_logging(username),
-                        e,
+                        resources if str(resources) else type(resources).__name__,
                     )
+                    complete = False
+                    continue
+                for r in resources:
+                    rid = r.get("id") or r.get("name")
+                    if not isinstance(rid, str):
+                        continue
+                    # Qualify with server to avoid collisions across providers
+                    sources.append(f"{server}:{rid}")
 
             # De-dupe while preserving order
             seen = set()
@@ -159,11 +273,11 @@ class RAGMCPService:
                 if s not in seen:
                     seen.add(s)
                     deduped.append(s)
-            return deduped
+            return deduped, complete
 
         except Exception as e:
             logger.error("Error during RAG MCP discovery: %s", e, exc_info=True)
-            return []
+            return [], False
 
     async def discover_servers(self, username: str, user_compliance_level: Optional[str] = None) -> List[Dict[str, Any]]:
         """Return richer per-server discovery structure for UI (rag_servers).
@@ -179,28 +293,26 @@ class RAGMCPService:
             ]
           }
         ]
+
+        Complete results are cached per (user, compliance level).
         """
-        # Ensure RAG servers are initialized from rag_mcp_config, without polluting tool inventory
-        try:
-            rag_cfg_servers = self.config_manager.rag_mcp_config.servers
-            missing = [name for name in rag_cfg_servers.keys() if name not in getattr(self.mcp_manager, "clients", {})]
-            if missing:
-                original = dict(getattr(self.mcp_manager, "servers_config", {}))
-                try:
-                    self.mcp_manager.servers_config.update({name: cfg.model_dump() for name, cfg in rag_cfg_servers.items()})
-                    await self.mcp_manager.initialize_clients()
-                    await self.mcp_manager.discover_tools()
-                finally:
-                    self.mcp_manager.servers_config = original
-        except Exception:
-            # Fallback silently if RAG config init fails; we'll just return empty set
-            pass
+        return await self._discovery_cache.get_or_load(
+            "servers",
+            username,
+            user_compliance_level,
+            lambda: self._discover_servers(username, user_compliance_level),
+        )
 
+    async def _discover_servers(
+        self, username: str, user_compliance_level: Optional[str]
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Returns the servers and whether every server answered."""
         rag_servers: List[Dict[str, Any]] = []
+        complete = True
         try:
             compliance_mgr = get_compliance_manager() if user_compliance_level else None
 
-            # Use rag_mcp_config directly since servers_config was restored above
+            # Use rag_mcp_config directly; RAG servers are kept out of servers_config
             rag_cfg_servers = self.config_manager.rag_mcp_config.servers
             authorized_servers: List[str] = await self._get_authorized_rag_servers(
                 username, rag_cfg_servers
@@ -226,24 +338,28 @@ class RAGMCPService:
                 authorized_servers = filtered_servers
             # -------------------------------------
 
-            for server in authorized_servers:
-                server_data = self.mcp_manager.available_tools.get(server)
-                tools = (server_data or {}).get("tools", [])
-                if not any(getattr(t, "name", None) == "rag_discover_resources" for t in tools):
-                    continue
+            servers_with_discovery = [
+                server for server in authorized_servers
+                if any(
+                    getattr(t, "name", None) == "rag_discover_resources"
+                    for t in (self.mcp_manager.available_tools.get(server) or {}).get("tools", [])
+                )
+            ]
 
-                # Call discovery
-                try:
-                    raw = await self.mcp_manager.call_tool(
-                        server_name=server,
-                        tool_name="rag_discover_resources",
-                        arguments={"_atlas_user": username},
+            # Call discovery on every server concurrently
+            results = await asyncio.gather(
+                *(self._call_discovery(server, username) for server in servers_with_discovery),
+                return_exceptions=True,
+            )
+            for server, resources in zip(servers_with_discovery, results):
+                if isinstance(resources, BaseException):
+                    logger.warning(
+                        "Discovery failed for server %s: %s",
+                        sanitize_for_logging(server),
+                        resources if str(resources) else type(resources).__name__,
                     )
-                    structured = self._extract_structured_result(raw)
-                    resources = self._extract_resources(structured)
-                except Exception as e:
-                    logger.warning("Discovery failed for server %s: %s", server, e)
                     resources = []
+                    complete = False
 
                 # Build UI sources array
                 ui_sources: List[Dict[str, Any]] = []
@@ -295,8 +411,9 @@ class RAGMCPService:
                 })
         except Exception as e:
             logger.error("discover_servers error: %s", e, exc_info=True)
+            complete = False
 
-        return rag_servers
+        return rag_servers, complete
 
     async def search_raw(
         self,
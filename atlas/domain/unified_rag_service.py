@@ -7,8 +7,9 @@ This service provides a single interface for:
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from atlas.core.compliance import (
     get_active_compliance_context,
@@ -17,6 +18,7 @@ from atlas.core.compliance import (
     set_active_compliance_context,
 )
 from atlas.core.log_sanitizer import sanitize_for_logging
+from atlas.core.rag_discovery_cache import RAGDiscoveryCache
 from atlas.core.telemetry import (
     LABEL_MAX_CHARS,
     hash_short,
@@ -127,6 +129,8 @@ class UnifiedRAGService:
         mcp_manager: Optional[Any] = None,
         auth_check_func: Optional[Callable] = None,
         rag_mcp_service: Optional[Any] = None,
+        discovery_cache_ttl_seconds: float = 0.0,
+        discovery_timeout_seconds: Optional[float] = None,
     ) -> None:
         """Initialize the unified RAG service.
 
@@ -135,14 +139,21 @@ class UnifiedRAGService:
             mcp_manager: MCP tool manager for MCP-based RAG sources.
             auth_check_func: Function to check user authorization for groups.
             rag_mcp_service: Optional RAGMCPService instance for MCP RAG queries.
+            discovery_cache_ttl_seconds: How long a user's discovered sources
+                are reused (0 disables caching).
+            discovery_timeout_seconds: How long one source may take to answer
+                discovery before it is left out (None waits indefinitely).
         """
         self.config_manager = config_manager
         self.mcp_manager = mcp_manager
         self.auth_check_func = auth_check_func
         self.rag_mcp_service = rag_mcp_service
+        self.discovery_timeout_seconds = discovery_timeout_seconds
 
         # Cache of HTTP RAG clients by source name
         self._http_clients: Dict[str, AtlasRAGClient] = {}
+        # Discovery results per (user, compliance level)
+        self._discovery_cache = RAGDiscoveryCache(discovery_cache_ttl_seconds)
 
     # ----------------------------------------------------- RAG hooks (GH #713)
 
@@ -389,61 +400,112 @@ class UnifiedRAGService:
                 ]
             }
         ]
+
+        Sources are discovered concurrently, each bounded by
+        ``discovery_timeout_seconds``; a source that fails or times out is left
+        out. Complete results are cached per (user, compliance level) until
+        they expire or ``invalidate_cache`` is called.
+        """
+        return await self._discovery_cache.get_or_load(
+            "http",
+            username,
+            user_compliance_level,
+            lambda: self._discover_all_sources(username, user_compliance_level),
+        )
+
+    async def _discover_all_sources(
+        self,
+        username: str,
+        user_compliance_level: Optional[str],
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Discover every configured source concurrently, in config order.
+
+        Returns the discovered servers and whether every source answered.
         """
-        rag_servers: List[Dict[str, Any]] = []
         rag_config = self.config_manager.rag_sources_config
+        results = await asyncio.gather(*(
+            self._discover_source_bounded(source_name, source_config, username, user_compliance_level)
+            for source_name, source_config in rag_config.sources.items()
+        ))
+        servers = [server_info for server_info, _ok in results if server_info]
+        return servers, all(ok for _info, ok in results)
+
+    async def _discover_source_bounded(
+        self,
+        source_name: str,
+        source_config: RAGSourceConfig,
+        username: str,
+        user_compliance_level: Optional[str],
+    ) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Discover one source under the per-source timeout; never raises.
 
-        for source_name, source_config in rag_config.sources.items():
-            try:
-                if not source_config.enabled:
-                    continue
-
-                # Check group authorization
-                if not await self._is_user_authorized(username, source_config.groups):
-                    logger.debug(
-                        "User %s not authorized for RAG source %s (groups: %s)",
-                        sanitize_for_logging(username),
-                        sanitize_for_logging(source_name),
-                        source_config.groups,
-                    )
-                    continue
-
-                # Check compliance level filtering
-                if user_compliance_level and source_config.compliance_level:
-                    compliance_mgr = get_compliance_manager()
-                    if not compliance_mgr.is_accessible(
-                        user_level=user_compliance_level,
-                        resource_level=source_config.compliance_level,
-                    ):
-                        logger.info(
-                            "Skipping RAG source %s due to compliance level mismatch (user: %s, source: %s)",
-                            sanitize_for_logging(source_name),
-                            sanitize_for_logging(user_compliance_level),
-                            sanitize_for_logging(source_config.compliance_level),
-                        )
-                        continue
-
-                if source_config.type == "http":
-                    # Discover from HTTP RAG API
-                    server_info = await self._discover_http_source(
-                        source_name, source_config, username
-                    )
-                    if server_info:
-                        rag_servers.append(server_info)
+        The flag is False when the source timed out or failed.
+        """
+        try:
+            server_info = await asyncio.wait_for(
+                self._discover_source(source_name, source_config, username, user_compliance_level),
+                timeout=self.discovery_timeout_seconds,
+            )
+            return server_info, True
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Discovery of RAG source %s timed out after %ss, continuing with remaining sources",
+                sanitize_for_logging(source_name),
+                self.discovery_timeout_seconds,
+            )
+        except Exception as e:
+            logger.error(
+                "Error discovering RAG source %s, continuing with remaining sources: %s",
+                sanitize_for_logging(source_name),
+                e,
+            )
+        return None, False
+
+    async def _discover_source(
+        self,
+        source_name: str,
+        source_config: RAGSourceConfig,
+        username: str,
+        user_compliance_level: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
+        """Authorize ``username`` for one source and, if allowed, discover it."""
+        if not source_config.enabled:
+            return None
 
-                elif source_config.type == "mcp":
-                    # MCP sources from rag-sources.json are handled by RAGMCPService
-                    # which reads them via config_manager.rag_mcp_config
-                    logger.debug("Skipping MCP source %s (handled by RAGMCPService)", source_name)
+        # Check group authorization
+        if not await self._is_user_authorized(username, source_config.groups):
+            logger.debug(
+                "User %s not authorized for RAG source %s (groups: %s)",
+                sanitize_for_logging(username),
+                sanitize_for_logging(source_name),
+                source_config.groups,
+            )
+            return None
 
-            except Exception as e:
-                logger.error(
-                    "Error discovering RAG source %s, continuing with remaining sources: %s",
+        # Check compliance level filtering
+        if user_compliance_level and source_config.compliance_level:
+            compliance_mgr = get_compliance_manager()
+            if not compliance_mgr.is_accessible(
+                user_level=user_compliance_level,
+                resource_level=source_config.compliance_level,
+            ):
+                logger.info(
+                    "Skipping RAG source %s due to compliance level mismatch (user: %s, source: %s)",
                     sanitize_for_logging(source_name),
-                    e,
+                    sanitize_for_logging(user_compliance_level),
+                    sanitize_for_logging(source_config.compliance_level),
                 )
+                return None
 
-        return rag_servers
+        if source_config.type == "http":
+            # Discover from HTTP RAG API
+            return await self._discover_http_source(source_name, source_config, username)
+
+        if source_config.type == "mcp":
+            # MCP sources from rag-sources.json are handled by RAGMCPService
+            # which reads them via config_manager.rag_mcp_config
+            logger.debug("Skipping MCP source %s (handled by RAGMCPService)", source_name)
+        return None
 
     async def _discover_http_source(
         self,
@@ -995,14 +1057,18 @@ class UnifiedRAGService:
         }
 
     def invalidate_cache(self, source_name: Optional[str] = None) -> None:
-        """Invalidate cached HTTP clients.
+        """Invalidate cached HTTP clients and discovery results.
 
-        Call this when configuration changes to ensure clients are recreated
-        with updated settings (URLs, tokens, etc.).
+        Call this when configuration or group membership changes to ensure
+        clients are recreated with updated settings (URLs, tokens, etc.) and
+        users see an up-to-date list of sources. Discovery results are
+        aggregated across sources, so they are dropped for every user either
+        way.
 
         Args:
             source_name: Specific source to invalidate, or None to invalidate all.
         """
+        self._discovery_cache.invalidate()
         if source_name:
             if source_name in self._http_clients:
                 del self._http_clients[source_name]
@@ -1011,5 +1077,10 @@ class UnifiedRAGService:
             self._http_clients.clear()
             logger.info("Invalidated all HTTP client caches")
 
+    def invalidate_user_cache(self, username: str) -> int:
+        """Drop cached discovery results for one user, e.g. after their
+        group membership changed; returns how many."""
+        return self._discovery_cache.invalidate_user(username)
+
 
 __all__ = ["UnifiedRAGService"]
@@ -1,6 +1,7 @@
 """Application factory for dependency injection and wiring."""
 
 import logging
+from pathlib import Path
 from typing import Optional
 
 from atlas.application.chat.service import ChatService
@@ -30,12 +31,15 @@ class AppFactory:
 
         # Only initialize general RAG services when the RAG feature flag is enabled
         if self.config_manager.app_settings.feature_rag_enabled:
+            app_settings = self.config_manager.app_settings
             # atlas_rag pseudo-tools/MCP-backed RAG are independently gated.
-            if self.config_manager.app_settings.feature_atlas_rag_tools_enabled:
+            if app_settings.feature_atlas_rag_tools_enabled:
                 self.rag_mcp_service = RAGMCPService(
                     mcp_manager=self.mcp_tools,
                     config_manager=self.config_manager,
                     auth_check_func=is_user_in_group,
+                    discovery_cache_ttl_seconds=app_settings.rag_discovery_cache_ttl_seconds,
+                    discovery_timeout_seconds=app_settings.rag_discovery_timeout_seconds,
                 )
             else:
                 self.rag_mcp_service = None
@@ -46,6 +50,8 @@ class AppFactory:
                 mcp_manager=self.mcp_tools,
                 auth_check_func=is_user_in_group,
                 rag_mcp_service=self.rag_mcp_service,
+                discovery_cache_ttl_seconds=app_settings.rag_discovery_cache_ttl_seconds,
+                discovery_timeout_seconds=app_settings.rag_discovery_timeout_seconds,
             )
             logger.info(
                 "RAG services initialized (FEATURE_RAG_ENABLED=true, FEATURE_ATLAS_RAG_TOOLS_ENABLED=%s)",
@@ -77,29 +83,51 @@ class AppFactory:
 
         # Chat history persistence (feature-flagged)
         self.conversation_repository = None
+        self.conversation_writer = None
         self.user_prompt_repository = None
         self.workspace_repository = None
+        self.feedback_repository = None
         if self.config_manager.app_settings.feature_chat_history_enabled:
             try:
                 from atlas.modules.chat_history import (
                     ConversationRepository,
+                    ConversationWriteBehind,
+                    FeedbackRepository,
                     UserPromptRepository,
                     WorkspaceRepository,
                     get_session_factory,
+                    import_feedback_files_once,
                     init_database,
                 )
                 db_url = self.config_manager.app_settings.chat_history_db_url
                 init_database(db_url)
                 session_factory = get_session_factory()
                 self.conversation_repository = ConversationRepository(session_factory)
+                # Turn saves go through the write-behind queue so the
+                # synchronous SQLAlchemy work stays off the event loop.
+                self.conversation_writer = ConversationWriteBehind(self.conversation_repository)
                 self.user_prompt_repository = UserPromptRepository(session_factory)
                 self.workspace_repository = WorkspaceRepository(session_factory)
+                self.feedback_repository = FeedbackRepository(session_factory)
                 logger.info("Chat history persistence initialized")
+                try:
+                    # Feedback submitted while chat history was off lives in
+                    # JSON files the admin views no longer read.
+                    import_feedback_files_once(self.feedback_repository, self._feedback_directory())
+                except Exception as e:
+                    logger.warning("Importing legacy feedback files failed; will retry on next start: %s", e)
             except Exception as e:
                 logger.error("Failed to initialize chat history: %s", e, exc_info=True)
 
         logger.info("AppFactory initialized")
 
+    def _feedback_directory(self) -> Path:
+        """Where feedback JSON files are written while chat history is off."""
+        feedback_dir = self.config_manager.app_settings.runtime_feedback_dir
+        if feedback_dir:
+            return Path(feedback_dir)
+        return Path(__file__).resolve().parents[2] / "runtime" / "feedback"
+
     async def initialize(self) -> None:
         """Initialize async resources (MCP clients, tool discovery) for headless use."""
         try:
@@ -121,6 +149,7 @@ class AppFactory:
             file_manager=self.file_manager,
             session_repository=self.session_repository,
             conversation_repository=self.conversation_repository,
+            conversation_writer=self.conversation_writer,
         )
 
     def create_headless_chat_service(
@@ -136,6 +165,7 @@ class AppFactory:
             session_repository=self.session_repository,
             event_publisher=event_publisher,
             conversation_repository=self.conversation_repository,
+            conversation_writer=self.conversation_writer,
         )
 
     # Accessors
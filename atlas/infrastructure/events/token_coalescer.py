@@ -0,0 +1,178 @@
+"""Coalescing of streamed LLM tokens into fewer WebSocket frames.
+
+Providers deliver a response a few characters at a time, and every chunk used
+to become its own ``token_stream`` frame: one ``send_json`` -- one JSON encode
+on the server and one parse and re-render in the browser -- per chunk. Fast
+models produce hundreds of those a second per user.
+
+``TokenFrameCoalescer`` sits between the publisher and the socket and merges
+consecutive chunks into one frame, sent when the oldest buffered chunk has
+waited ``window_ms`` or the buffer reaches ``max_bytes``, whichever is first.
+Frame semantics are unchanged for the client:
+
+* the ``is_first`` chunk is sent on its own, immediately, so time to first
+  token does not grow by the window;
+* ``is_last`` sends whatever is buffered, then the terminator as its own frame
+  (the client ignores the text of an ``is_last`` frame);
+* ``flush()`` sends the buffer now -- the publisher calls it before any other
+  event (tool calls, chat responses, errors), so text never arrives after an
+  event that followed it.
+
+Each stream's frame rate is recorded when it ends, so the effect is visible in
+``stats()`` and the metrics log.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from atlas.core.metrics_logger import log_metric
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_MS = 25
+DEFAULT_MAX_BYTES = 2048
+
+SendFrame = Callable[[str, bool, bool], Awaitable[None]]
+
+
+class TokenFrameCoalescer:
+    """Buffers ``token_stream`` chunks and sends them as merged frames."""
+
+    def __init__(
+        self,
+        send_frame: SendFrame,
+        window_ms: float = DEFAULT_WINDOW_MS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        user_email: Optional[str] = None,
+    ):
+        """
+        Args:
+            send_frame: ``(token, is_first, is_last)`` coroutine that puts one
+                frame on the wire.
+            window_ms: Longest a chunk waits in the buffer. 0 disables
+                coalescing: every chunk is sent as it arrives.
+            max_bytes: Buffer size (UTF-8) that triggers an immediate send.
+            user_email: Attributed in the per-stream metric.
+        """
+        self._send_frame = send_frame
+        self._window_s = max(0.0, float(window_ms)) / 1000.0
+        self._max_bytes = max(1, int(max_bytes))
+        self._user_email = user_email
+        self._buffer: List[str] = []
+        self._buffered_bytes = 0
+        self._timer: Optional[asyncio.Task] = None
+        # Frames must reach the socket in order whether the stream or the
+        # timer sends them.
+        self._send_lock = asyncio.Lock()
+        # Current stream
+        self._stream_started: Optional[float] = None
+        self._stream_chunks = 0
+        self._stream_frames = 0
+        # Totals for the session
+        self._streams = 0
+        self._chunks_in = 0
+        self._frames_out = 0
+        self._last_stream_fps = 0.0
+        self._last_stream_chunks_per_s = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self._window_s > 0
+
+    async def push(self, token: str, is_first: bool = False, is_last: bool = False) -> None:
+        """Accept one chunk from the stream."""
+        if is_first or self._stream_started is None:
+            self._start_stream()
+        if token:
+            self._stream_chunks += 1
+            self._chunks_in += 1
+
+        if is_last:
+            await self.flush()
+            await self._send(token, is_first, True)
+            self._end_stream()
+            return
+
+        if is_first or not self.enabled:
+            # The first chunk skips the buffer so time to first token is not
+            # delayed; anything left from an unterminated stream goes first.
+            await self.flush()
+            await self._send(token, is_first, False)
+            return
+
+        if not token:
+            return
+        self._buffer.append(token)
+        self._buffered_bytes += len(token.encode("utf-8"))
+        if self._buffered_bytes >= self._max_bytes:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().create_task(self._flush_after_window())
+
+    async def flush(self) -> None:
+        """Send any buffered text as one frame now."""
+        timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        if not self._buffer:
+            return
+        text = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered_bytes = 0
+        await self._send(text, False, False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Frame counts for this session and the rate of its last stream."""
+        return {
+            "streams": self._streams,
+            "chunks_in": self._chunks_in,
+            "frames_out": self._frames_out,
+            "chunks_per_frame": round(self._chunks_in / self._frames_out, 2) if self._frames_out else 0.0,
+            "last_stream_frames_per_s": round(self._last_stream_fps, 1),
+            "last_stream_chunks_per_s": round(self._last_stream_chunks_per_s, 1),
+        }
+
+    async def _flush_after_window(self) -> None:
+        try:
+            await asyncio.sleep(self._window_s)
+        except asyncio.CancelledError:
+            return
+        # Past the window this task is no longer cancellable: a flush from the
+        # stream must not abort a frame already on its way out.
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning("Failed to send coalesced token frame: %s", e)
+
+    async def _send(self, token: str, is_first: bool, is_last: bool) -> None:
+        async with self._send_lock:
+            await self._send_frame(token, is_first, is_last)
+        self._frames_out += 1
+        self._stream_frames += 1
+
+    def _start_stream(self) -> None:
+        self._stream_started = time.monotonic()
+        self._stream_chunks = 0
+        self._stream_frames = 0
+
+    def _end_stream(self) -> None:
+        started, self._stream_started = self._stream_started, None
+        if started is None:
+            return
+        elapsed = max(time.monotonic() - started, 1e-3)
+        self._streams += 1
+        self._last_stream_fps = self._stream_frames / elapsed
+        self._last_stream_chunks_per_s = self._stream_chunks / elapsed
+        if self._stream_chunks:
+            log_metric(
+                "token_stream",
+                self._user_email,
+                chunks=self._stream_chunks,
+                frames=self._stream_frames,
+                duration_ms=int(elapsed * 1000),
+                frames_per_s=round(self._last_stream_fps, 1),
+                chunks_per_s=round(self._last_stream_chunks_per_s, 1),
+            )
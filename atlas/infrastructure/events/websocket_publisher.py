@@ -6,6 +6,8 @@ from typing import Any, Dict, Optional
 from atlas.application.chat.utilities import event_notifier
 from atlas.interfaces.transport import ChatConnectionProtocol
 
+from .token_coalescer import TokenFrameCoalescer
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,17 +16,35 @@ class WebSocketEventPublisher:
     WebSocket implementation of EventPublisher.
 
     Wraps event_notifier and ChatConnectionProtocol to publish
-    events to connected WebSocket clients.
+    events to connected WebSocket clients. Streamed tokens can be merged
+    into fewer frames; every other event first sends any buffered tokens,
+    so the client sees events in the order they were published.
     """
 
-    def __init__(self, connection: Optional[ChatConnectionProtocol] = None):
+    def __init__(
+        self,
+        connection: Optional[ChatConnectionProtocol] = None,
+        token_coalesce_window_ms: float = 0,
+        token_coalesce_max_bytes: int = 2048,
+    ):
         """
         Initialize WebSocket event publisher.
 
         Args:
             connection: WebSocket connection for sending messages
+            token_coalesce_window_ms: Merge streamed tokens arriving within this
+                window into one frame (see ``TokenFrameCoalescer``). 0 sends
+                every token as its own frame.
+            token_coalesce_max_bytes: Send a merged frame early once it reaches
+                this many bytes.
         """
         self.connection = connection
+        self.token_coalescer = TokenFrameCoalescer(
+            self._send_token_frame,
+            window_ms=token_coalesce_window_ms,
+            max_bytes=token_coalesce_max_bytes,
+            user_email=getattr(connection, "user_email", None),
+        )
 
     async def publish_warning(
         self,
@@ -32,6 +52,7 @@ class WebSocketEventPublisher:
     ) -> None:
         """Publish a warning message to the client."""
         if self.connection:
+            await self.token_coalescer.flush()
             await self.connection.send_json({
                 "type": "warning",
                 "message": message,
@@ -44,6 +65,7 @@ class WebSocketEventPublisher:
     ) -> None:
         """Publish a chat response message."""
         if self.connection:
+            await self.token_coalescer.flush()
             await event_notifier.notify_chat_response(
                 message=message,
                 has_pending_tools=has_pending_tools,
@@ -53,6 +75,7 @@ class WebSocketEventPublisher:
     async def publish_response_complete(self) -> None:
         """Signal that the response is complete."""
         if self.connection:
+            await self.token_coalescer.flush()
             await event_notifier.notify_response_complete(
                 self.connection.send_json
             )
@@ -64,6 +87,7 @@ class WebSocketEventPublisher:
     ) -> None:
         """Publish an agent-specific update."""
         if self.connection:
+            await self.token_coalescer.flush()
             await event_notifier.notify_agent_update(
                 update_type=update_type,
                 connection=self.connection,
@@ -77,6 +101,7 @@ class WebSocketEventPublisher:
     ) -> None:
         """Publish notification that a tool is starting."""
         if self.connection:
+            await self.token_coalescer.flush()
             await event_notifier.notify_agent_update(
                 update_type="tool_start",
                 connection=self.connection,
@@ -92,6 +117,7 @@ class WebSocketEventPublisher:
     ) -> None:
         """Publish notification that a tool has completed."""
         if self.connection:
+            await self.token_coalescer.flush()
             await event_notifier.notify_agent_update(
                 update_type="tool_complete",
                 connection=self.connection,
@@ -106,6 +132,7 @@ class WebSocketEventPublisher:
     ) -> None:
         """Publish update about session files."""
         if self.connection:
+            await self.token_coalescer.flush()
             await self.connection.send_json({
                 "type": "files_update",
                 "files": files
@@ -119,6 +146,7 @@ class WebSocketEventPublisher:
     ) -> None:
         """Publish content for canvas display."""
         if self.connection:
+            await self.token_coalescer.flush()
             await self.connection.send_json({
                 "type": "canvas_content",
                 "content": content,
@@ -132,7 +160,11 @@ class WebSocketEventPublisher:
         is_first: bool = False,
         is_last: bool = False,
     ) -> None:
-        """Publish a streaming token chunk."""
+        """Publish a streaming token chunk (coalesced when configured)."""
+        if self.connection:
+            await self.token_coalescer.push(token, is_first=is_first, is_last=is_last)
+
+    async def _send_token_frame(self, token: str, is_first: bool, is_last: bool) -> None:
         if self.connection:
             await event_notifier.notify_token_stream(
                 token=token,
@@ -144,6 +176,7 @@ class WebSocketEventPublisher:
     async def send_json(self, data: Dict[str, Any]) -> None:
         """Send raw JSON message."""
         if self.connection:
+            await self.token_coalescer.flush()
             await self.connection.send_json(data)
 
     async def publish_elicitation_request(
@@ -156,6 +189,7 @@ class WebSocketEventPublisher:
     ) -> None:
         """Publish an elicitation request to the user."""
         if self.connection:
+            await self.token_coalescer.flush()
             await self.connection.send_json({
                 "type": "elicitation_request",
                 "elicitation_id": elicitation_id,
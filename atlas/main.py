@@ -40,6 +40,7 @@ from starlette.websockets import WebSocketState
 
 from atlas.core.auth import resolve_user_from_auth_header_async
 from atlas.core.domain_whitelist_middleware import DomainWhitelistMiddleware
+from atlas.core.http_client import http_clients
 from atlas.core.log_sanitizer import sanitize_for_logging, summarize_tool_approval_response_for_logging
 from atlas.core.metrics_logger import log_metric
 
@@ -278,13 +279,35 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to start MCP user client cache sweeper: {e}", exc_info=True)
 
+    # Outbound HTTP calls (RAG, auth group check, extractors) share pooled
+    # keep-alive clients for the app's lifetime.
+    http_clients.start(config.app_settings)
+
+    # Connect MCP RAG servers once here, and retry unreachable ones in the
+    # background, so RAG discovery never (re)initializes clients per request.
+    rag_mcp_service = app_factory.get_rag_mcp_service()
+    if rag_mcp_service is not None:
+        try:
+            await rag_mcp_service.ensure_rag_servers()
+            rag_mcp_service.start_background_refresh(
+                config.app_settings.rag_mcp_refresh_interval_seconds
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialize MCP RAG servers: {e}", exc_info=True)
+
     yield
 
     logger.info("Shutting down Chat UI Backend")
+    if rag_mcp_service is not None:
+        await rag_mcp_service.stop_background_refresh()
+    await http_clients.aclose()
     # Stop auto-reconnect task
     await mcp_manager.stop_auto_reconnect()
     # Cleanup MCP clients
     await mcp_manager.cleanup()
+    # Flush conversation saves still queued for the database
+    if app_factory.conversation_writer is not None:
+        await app_factory.conversation_writer.stop()
 
 
 # Create FastAPI app with minimal setup
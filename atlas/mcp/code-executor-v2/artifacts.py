@@ -1,20 +1,39 @@
 """Artifact discovery + base64 + MIME packaging.
 
-After every ``python`` call we walk the workspace, compare each file's
-mtime to the snapshot we took before the call, and package any new or
-modified files into v2 artifacts (``{name, b64, mime, size, viewer}``).
+Each session keeps a ``WorkspaceTracker``: an index of ``(mtime, size)``
+per workspace file, kept current between calls. Around every ``python``
+call the tracker reports which files are new or modified, and those are
+packaged into v2 artifacts (``{name, b64, mime, size, viewer}``).
+
+The tracker learns about changes from inotify where it can, so it only
+stats the paths that had events; when inotify is unavailable (or lost
+events) it rescans the workspace and diffs against the index. In that
+fallback the index is carried over from the previous call, so the
+pre-call walk is skipped unless another tool touched the workspace in
+between (``invalidate()``).
 
 A per-artifact size cap prevents inlining huge files into the websocket
-frame; oversized files are listed as references for the user to fetch
-explicitly via ``download_file``.
+frame, and a per-response byte budget bounds the inlined total; files
+over either are listed as references for the user to fetch explicitly
+via ``download_file``.
 """
 
 from __future__ import annotations
 
 import base64
+import logging
 import os
+import stat
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from inotify import InotifyUnavailable, InotifyWatcher
+
+logger = logging.getLogger(__name__)
+
+# (st_mtime_ns, st_size) of a regular file.
+FileStamp = Tuple[int, int]
 
 
 _MIME = {
@@ -48,38 +67,160 @@ def mime_for(path: str) -> Tuple[str, str]:
     return _MIME.get(ext, ("application/octet-stream", "auto"))
 
 
-def snapshot_mtimes(workspace: Path) -> Dict[str, float]:
-    """Map of relative-path -> mtime for every file in the workspace."""
-    workspace = workspace.resolve()
-    out: Dict[str, float] = {}
+def scan_workspace(workspace: Path) -> Dict[str, FileStamp]:
+    """Map of relative-path -> ``FileStamp`` for every regular file.
+
+    Symlinks are skipped: the server, unlike the sandbox, could follow
+    them out of the workspace.
+    """
+    workspace = Path(workspace)
+    out: Dict[str, FileStamp] = {}
     for root, _, files in os.walk(workspace):
         for name in files:
-            full = Path(root) / name
+            full = os.path.join(root, name)
             try:
-                rel = str(full.relative_to(workspace))
-                out[rel] = full.stat().st_mtime
+                st = os.lstat(full)
             except OSError:
                 continue
+            if stat.S_ISREG(st.st_mode):
+                out[os.path.relpath(full, workspace)] = (st.st_mtime_ns, st.st_size)
     return out
 
 
-def diff_artifacts(
+class WorkspaceTracker:
+    """Change tracking for one session workspace; see the module docstring.
+
+    Call ``begin()`` before a run and ``changes()`` after it. Both do
+    file I/O and are meant to run in a worker thread.
+    """
+
+    def __init__(self, workspace: Path, *, use_inotify: bool = True) -> None:
+        self.workspace = Path(workspace).resolve()
+        self.rescans = 0
+        self._index: Dict[str, FileStamp] = {}
+        self._stale = True
+        self._watcher: Optional[InotifyWatcher] = None
+        self._lock = threading.Lock()
+        if use_inotify:
+            try:
+                self._watcher = InotifyWatcher(str(self.workspace))
+            except (InotifyUnavailable, OSError) as e:
+                logger.info("inotify unavailable for %s, rescanning instead: %s", self.workspace, e)
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._watcher is not None else "scan"
+
+    @property
+    def bytes_used(self) -> int:
+        """Total size of the workspace's regular files as of the last update."""
+        return sum(size for _, size in self._index.values())
+
+    def invalidate(self) -> None:
+        """Note that the workspace changed outside a tracked run."""
+        self._stale = True
+
+    def begin(self) -> None:
+        """Absorb changes made since the last run so they are not reported."""
+        with self._lock:
+            if self._watcher is not None or self._stale:
+                self._update()
+
+    def changes(self) -> List[str]:
+        """Relative paths of files added or modified since ``begin()``."""
+        with self._lock:
+            return sorted(self._update())
+
+    def close(self) -> None:
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+
+    def _update(self) -> Set[str]:
+        if self._watcher is not None:
+            paths = self._watcher.drain()
+            if paths is not None and not self._stale:
+                return self._apply(paths)
+            try:
+                self._watcher.rewatch()
+            except (InotifyUnavailable, OSError) as e:
+                logger.info("inotify lost for %s, rescanning from now on: %s", self.workspace, e)
+                self.close()
+        return self._rescan()
+
+    def _rescan(self) -> Set[str]:
+        self.rescans += 1
+        after = scan_workspace(self.workspace)
+        changed = {rel for rel, st in after.items() if self._index.get(rel) != st}
+        self._index = after
+        self._stale = False
+        return changed
+
+    def _apply(self, paths: Iterable[str]) -> Set[str]:
+        changed: Set[str] = set()
+        for rel in paths:
+            if rel.endswith(os.sep):
+                changed |= self._apply_dir(rel.rstrip(os.sep))
+                continue
+            try:
+                st = os.lstat(self.workspace / rel)
+            except OSError:
+                st = None
+            if st is not None and stat.S_ISREG(st.st_mode):
+                stamp = (st.st_mtime_ns, st.st_size)
+                if self._index.get(rel) != stamp:
+                    changed.add(rel)
+                    self._index[rel] = stamp
+            else:
+                self._index.pop(rel, None)
+        return changed
+
+    def _apply_dir(self, rel: str) -> Set[str]:
+        """Re-read a created or deleted directory's subtree.
+
+        A new directory may have been filled before its watch was added.
+        """
+        prefix = rel + os.sep
+        previous = {
+            k: self._index.pop(k) for k in list(self._index) if k.startswith(prefix)
+        }
+        full = self.workspace / rel
+        changed: Set[str] = set()
+        if full.is_dir() and not full.is_symlink():
+            for sub, stamp in scan_workspace(full).items():
+                key = os.path.join(rel, sub)
+                self._index[key] = stamp
+                if previous.get(key) != stamp:
+                    changed.add(key)
+        return changed
+
+
+def package_artifacts(
     workspace: Path,
+    paths: Iterable[str],
     *,
-    before: Dict[str, float],
     artifact_cap_bytes: int,
-) -> List[Dict[str, Any]]:
-    """Return v2 artifact dicts for files added or modified since ``before``.
+    budget_bytes: Optional[int] = None,
+    max_count: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Build v2 artifact dicts for ``paths``; return them and the number left out.
 
-    Sizes are checked via ``stat()`` *before* reading so an oversize file
-    never gets fully loaded into memory.
+    Files are inlined in order until ``budget_bytes`` of content has been
+    inlined; later ones, and any over ``artifact_cap_bytes``, become
+    references. At most ``max_count`` artifacts are returned. Sizes are
+    checked via ``stat()`` *before* reading so an oversize file never
+    gets fully loaded into memory.
     """
     workspace = workspace.resolve()
-    after = snapshot_mtimes(workspace)
+    paths = list(paths)
+    if max_count is not None and len(paths) > max_count:
+        omitted = len(paths) - max_count
+        paths = paths[:max_count]
+    else:
+        omitted = 0
+    inlined = 0
     artifacts: List[Dict[str, Any]] = []
-    for rel, mtime in sorted(after.items()):
-        if before.get(rel) == mtime:
-            continue
+    for rel in paths:
         full = workspace / rel
         try:
             size = full.stat().st_size
@@ -99,10 +240,24 @@ def diff_artifacts(
                 "oversize": True,
             })
             continue
+        if budget_bytes is not None and inlined + size > budget_bytes:
+            artifacts.append({
+                "name": rel,
+                "size": size,
+                "mime": mime,
+                "viewer": viewer,
+                "description": (
+                    f"Generated file (not inlined: response budget of "
+                    f"{budget_bytes} bytes used up); use download_file to fetch"
+                ),
+                "over_budget": True,
+            })
+            continue
         try:
             data = full.read_bytes()
         except OSError:
             continue
+        inlined += len(data)
         artifacts.append({
             "name": rel,
             "b64": base64.b64encode(data).decode("ascii"),
@@ -111,7 +266,7 @@ def diff_artifacts(
             "viewer": viewer,
             "description": f"Generated by code execution: {rel}",
         })
-    return artifacts
+    return artifacts, omitted
 
 
 def pick_primary(artifacts: List[Dict[str, Any]]) -> str | None:
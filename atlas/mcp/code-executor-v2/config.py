@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from typing import Tuple
 
 
 def _env_int(name: str, default: int) -> int:
@@ -27,6 +28,13 @@ def _env_bool(name: str, default: bool) -> bool:
     return raw.strip().lower() in ("1", "true", "yes", "on")
 
 
+def _env_csv(name: str, default: str) -> Tuple[str, ...]:
+    raw = os.environ.get(name)
+    if raw is None:
+        raw = default
+    return tuple(item.strip() for item in raw.split(",") if item.strip())
+
+
 @dataclass(frozen=True)
 class ExecutorConfig:
     host: str
@@ -44,6 +52,18 @@ class ExecutorConfig:
     enable_git_clone: bool
     allow_unsafe_no_sandbox: bool
     reaper_interval_s: int
+    max_concurrent_runs: int
+    max_runs_per_session: int
+    run_queue_max: int
+    zygote_enabled: bool
+    zygote_preload: Tuple[str, ...]
+    persistent_kernel: bool
+    kernel_idle_s: int
+    kernel_mem_budget_mb: int
+    kernel_cpu_s: int
+    artifact_budget_mb: int
+    max_artifacts: int
+    artifact_inotify: bool
 
     @property
     def workspace_cap_bytes(self) -> int:
@@ -53,6 +73,10 @@ class ExecutorConfig:
     def artifact_cap_bytes(self) -> int:
         return self.artifact_cap_mb * 1024 * 1024
 
+    @property
+    def artifact_budget_bytes(self) -> int:
+        return self.artifact_budget_mb * 1024 * 1024
+
 
 def load_config() -> ExecutorConfig:
     return ExecutorConfig(
@@ -75,4 +99,22 @@ def load_config() -> ExecutorConfig:
             "CODE_EXECUTOR_V2_ALLOW_UNSAFE_NO_SANDBOX", False
         ),
         reaper_interval_s=_env_int("CODE_EXECUTOR_V2_REAPER_INTERVAL_S", 300),
+        max_concurrent_runs=_env_int(
+            "CODE_EXECUTOR_V2_MAX_CONCURRENT", os.cpu_count() or 4
+        ),
+        max_runs_per_session=_env_int(
+            "CODE_EXECUTOR_V2_MAX_CONCURRENT_PER_SESSION", 1
+        ),
+        run_queue_max=_env_int("CODE_EXECUTOR_V2_RUN_QUEUE_MAX", 64),
+        zygote_enabled=_env_bool("CODE_EXECUTOR_V2_ZYGOTE", False),
+        zygote_preload=_env_csv(
+            "CODE_EXECUTOR_V2_ZYGOTE_PRELOAD", "numpy,pandas,matplotlib.pyplot"
+        ),
+        persistent_kernel=_env_bool("CODE_EXECUTOR_V2_PERSISTENT_KERNEL", False),
+        kernel_idle_s=_env_int("CODE_EXECUTOR_V2_KERNEL_IDLE_S", 900),
+        kernel_mem_budget_mb=_env_int("CODE_EXECUTOR_V2_KERNEL_MEM_BUDGET_MB", 4096),
+        kernel_cpu_s=_env_int("CODE_EXECUTOR_V2_KERNEL_CPU_S", 600),
+        artifact_budget_mb=_env_int("CODE_EXECUTOR_V2_ARTIFACT_BUDGET_MB", 20),
+        max_artifacts=_env_int("CODE_EXECUTOR_V2_MAX_ARTIFACTS", 50),
+        artifact_inotify=_env_bool("CODE_EXECUTOR_V2_ARTIFACT_INOTIFY", True),
     )
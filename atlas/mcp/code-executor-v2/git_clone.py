@@ -20,7 +20,7 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 from urllib.parse import urlparse
 
-from sandbox.launcher import SandboxLimits, run_sandboxed
+from sandbox.launcher import SandboxLimits, run_sandboxed_async
 
 
 _REPO_BASENAME = re.compile(r"[^/\\]+?(?:\.git)?$")
@@ -51,7 +51,7 @@ def _safe_subdir(workspace: Path, subdir: str) -> Path:
 def _wrapper_script(repo_url: str, ref: str, target: str, depth: int) -> str:
     """Build a small Python snippet that runs the actual clone.
 
-    The PAT is read from ``$GIT_PAT`` (set by ``run_sandboxed``'s
+    The PAT is read from ``$GIT_PAT`` (set by ``run_sandboxed_async``'s
     ``extra_env``) inside the sandboxed child, then injected into the URL
     at clone time. After the clone succeeds, the wrapper:
 
@@ -113,7 +113,7 @@ def _wrapper_script(repo_url: str, ref: str, target: str, depth: int) -> str:
     )
 
 
-def run_git_clone(
+async def run_git_clone(
     *,
     workspace: Path,
     repo_url: str,
@@ -150,7 +150,7 @@ def run_git_clone(
     if pat:
         extra_env["GIT_PAT"] = pat
 
-    result = run_sandboxed(
+    result = await run_sandboxed_async(
         ["python", "-c", script],
         workdir=str(workspace),
         limits=limits,
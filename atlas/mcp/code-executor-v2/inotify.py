@@ -0,0 +1,183 @@
+"""Minimal recursive inotify watcher for a session workspace.
+
+Linux-only and stdlib-only (``ctypes`` onto libc). ``InotifyWatcher``
+watches every directory under the workspace and reports which relative
+paths had events since the last ``drain()``, so the caller can stat just
+those instead of walking the tree. Directories created or deleted are
+reported with a trailing ``os.sep``.
+
+``drain()`` returns ``None`` whenever the event stream cannot be trusted
+-- the kernel queue overflowed, the watch limit was hit, a directory was
+renamed (the per-watch path map would be stale) or the workspace root
+itself went away. The caller then rescans and calls ``rewatch()``.
+fanotify would avoid per-directory watches but needs CAP_SYS_ADMIN,
+which this server does not have.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+from typing import Dict, Optional, Set
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+    | IN_ONLYDIR | IN_DONT_FOLLOW
+)
+_EVENT = struct.Struct("iIII")
+
+_libc = None
+
+
+class InotifyUnavailable(Exception):
+    """inotify cannot be used here; fall back to scanning."""
+
+
+def _lib():
+    global _libc
+    if _libc is None:
+        name = ctypes.util.find_library("c")
+        if name is None:
+            raise InotifyUnavailable("libc not found")
+        lib = ctypes.CDLL(name, use_errno=True)
+        if not hasattr(lib, "inotify_init1"):
+            raise InotifyUnavailable("libc has no inotify")
+        lib.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        _libc = lib
+    return _libc
+
+
+class InotifyWatcher:
+    """Recursive watch over ``root``; see the module docstring."""
+
+    def __init__(self, root: str) -> None:
+        self.root = os.path.realpath(root)
+        self._fd = -1
+        self._dirs: Dict[int, str] = {}
+        self._lost = False
+        self.rewatch()
+
+    def rewatch(self) -> None:
+        """(Re)create the inotify instance and watch the whole tree.
+
+        Raises ``InotifyUnavailable`` if inotify or enough watches are
+        not available.
+        """
+        self.close()
+        fd = _lib().inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise InotifyUnavailable(os.strerror(ctypes.get_errno()))
+        self._fd = fd
+        self._lost = False
+        try:
+            self._watch_tree("")
+        except InotifyUnavailable:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+        self._fd = -1
+        self._dirs = {}
+
+    def drain(self) -> Optional[Set[str]]:
+        """Relative paths with events since the last drain, or ``None``."""
+        if self._fd < 0:
+            return None
+        changed: Set[str] = set()
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not buf:
+                break
+            self._parse(buf, changed)
+        if self._lost:
+            return None
+        return changed
+
+    def _parse(self, buf: bytes, changed: Set[str]) -> None:
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _cookie, length = _EVENT.unpack_from(buf, offset)
+            offset += _EVENT.size
+            name = buf[offset:offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                self._lost = True
+                continue
+            parent = self._dirs.get(wd)
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                if parent == "":
+                    # The workspace root itself was removed.
+                    self._lost = True
+                continue
+            if parent is None:
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                if parent == "" or mask & IN_MOVE_SELF:
+                    self._lost = True
+                continue
+            if not name:
+                continue
+            rel = os.path.join(parent, name) if parent else name
+            if mask & IN_ISDIR:
+                if mask & (IN_MOVED_FROM | IN_MOVED_TO):
+                    self._lost = True
+                    continue
+                if mask & IN_CREATE:
+                    try:
+                        self._watch_tree(rel)
+                    except InotifyUnavailable:
+                        self._lost = True
+                if mask & (IN_CREATE | IN_DELETE):
+                    # Reported with a trailing separator: the caller
+                    # rereads the whole subtree, which also picks up
+                    # files created before the watch landed.
+                    changed.add(rel + os.sep)
+                continue
+            changed.add(rel)
+
+    def _watch_tree(self, rel: str) -> None:
+        top = os.path.join(self.root, rel) if rel else self.root
+        self._add(rel, top)
+        for dirpath, dirnames, _ in os.walk(top):
+            for d in dirnames:
+                full = os.path.join(dirpath, d)
+                if os.path.islink(full):
+                    continue
+                self._add(os.path.relpath(full, self.root), full)
+
+    def _add(self, rel: str, path: str) -> None:
+        wd = _lib().inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                # Removed (or replaced) while we were walking.
+                return
+            raise InotifyUnavailable(os.strerror(err))
+        self._dirs[wd] = "" if rel in ("", ".") else rel
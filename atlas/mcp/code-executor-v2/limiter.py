@@ -0,0 +1,99 @@
+"""Concurrency limits for sandboxed runs.
+
+Every ``python`` / ``git_clone`` call holds a slot for the duration of its
+sandboxed subprocess. Slots are bounded two ways:
+
+* **globally** (``CODE_EXECUTOR_V2_MAX_CONCURRENT``) so a burst of
+  sessions cannot fork more interpreters than the pod has CPU and memory
+  for, and
+* **per session** (``CODE_EXECUTOR_V2_MAX_CONCURRENT_PER_SESSION``,
+  default 1) so one conversation cannot take every global slot, and so
+  the before/after artifact snapshots of one call are not muddled by a
+  concurrent call in the same workspace.
+
+Callers that cannot start immediately wait in FIFO order. At most
+``CODE_EXECUTOR_V2_RUN_QUEUE_MAX`` callers may wait at once; beyond that
+``ExecutorBusy`` is raised so the tool can answer straight away instead
+of piling up requests. A call's wall-clock timeout starts when it gets
+its slot, not while it is queued.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+
+class ExecutorBusy(RuntimeError):
+    """Raised when the run queue is full."""
+
+
+class ExecutionLimiter:
+    def __init__(
+        self,
+        *,
+        max_concurrent: int,
+        max_per_session: int = 1,
+        max_queued: int = 64,
+    ) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_per_session = max(1, max_per_session)
+        self.max_queued = max(0, max_queued)
+        self._global = asyncio.Semaphore(self.max_concurrent)
+        self._sessions: Dict[str, asyncio.Semaphore] = {}
+        # Callers currently inside ``slot()`` per session, so idle
+        # semaphores can be dropped.
+        self._session_users: Dict[str, int] = {}
+        self.running = 0
+        self.queued = 0
+
+    @asynccontextmanager
+    async def slot(self, session_id: str) -> AsyncIterator[None]:
+        """Hold one global and one per-session slot for the block."""
+        session_sem = self._sessions.get(session_id)
+        if session_sem is None:
+            session_sem = asyncio.Semaphore(self.max_per_session)
+            self._sessions[session_id] = session_sem
+        must_wait = session_sem.locked() or self._global.locked()
+        if must_wait and self.queued >= self.max_queued:
+            if not self._session_users.get(session_id):
+                del self._sessions[session_id]
+            raise ExecutorBusy(
+                f"code executor is busy ({self.running} running, "
+                f"{self.queued} queued); try again shortly"
+            )
+
+        self._session_users[session_id] = self._session_users.get(session_id, 0) + 1
+        self.queued += 1
+        started = False
+        try:
+            # Per-session first: a session waiting on its own earlier call
+            # must not sit on a global slot meanwhile.
+            async with session_sem:
+                async with self._global:
+                    self.queued -= 1
+                    started = True
+                    self.running += 1
+                    try:
+                        yield
+                    finally:
+                        self.running -= 1
+        finally:
+            if not started:
+                self.queued -= 1
+            remaining = self._session_users[session_id] - 1
+            if remaining:
+                self._session_users[session_id] = remaining
+            else:
+                del self._session_users[session_id]
+                self._sessions.pop(session_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "max_concurrent": self.max_concurrent,
+            "max_per_session": self.max_per_session,
+            "max_queued": self.max_queued,
+        }
@@ -20,16 +20,19 @@ Tool surface:
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import ipaddress
 import logging
 import os
+import shutil
 import socket
 import sys
+import tempfile
 import time
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Annotated, Any, AsyncIterator, Dict, Optional
+from typing import Annotated, Any, AsyncIterator, Dict, Optional, Tuple
 from urllib.parse import urlparse
 from urllib.request import Request, urlopen
 
@@ -40,7 +43,7 @@ from fastmcp import Context, FastMCP
 # image can be built from *this directory alone* without the rest of the
 # Atlas monorepo).
 # ---------------------------------------------------------------------------
-from artifacts import diff_artifacts, mime_for, pick_primary, snapshot_mtimes
+from artifacts import WorkspaceTracker, mime_for, package_artifacts, pick_primary
 from config import load_config
 from file_ops import (
     WorkspaceError,
@@ -51,8 +54,11 @@ from file_ops import (
     write_file as fs_write_file,
 )
 from git_clone import run_git_clone
+from limiter import ExecutionLimiter, ExecutorBusy
+from sandbox.kernel import KernelPool
 from sandbox.kernel_probe import probe_kernel
-from sandbox.launcher import SandboxLimits, run_sandboxed
+from sandbox.launcher import SandboxLimits, SandboxResult, run_sandboxed_async
+from sandbox.zygote import LatencyStats, Zygote, ZygoteUnavailable
 from session import SessionRegistry
 from state_store import get_state_store
 
@@ -89,12 +95,31 @@ def _enforce_kernel_precondition() -> None:
 _enforce_kernel_precondition()
 
 
+KERNELS = KernelPool(
+    limits=SandboxLimits(
+        mem_mb=CONFIG.mem_mb,
+        cpu_s=CONFIG.kernel_cpu_s,
+        fsize_mb=CONFIG.fsize_mb,
+        nproc=CONFIG.nproc,
+    ),
+    idle_s=CONFIG.kernel_idle_s,
+    mem_budget_mb=CONFIG.kernel_mem_budget_mb,
+) if CONFIG.persistent_kernel else None
 REGISTRY = SessionRegistry(
     workspaces_dir=Path(CONFIG.workspaces_dir),
     ttl_s=CONFIG.session_ttl_s,
     max_sessions=CONFIG.max_sessions,
     reaper_interval_s=CONFIG.reaper_interval_s,
+    on_destroy=KERNELS.discard if KERNELS is not None else None,
+    on_sweep=KERNELS.sweep if KERNELS is not None else None,
 )
+LIMITER = ExecutionLimiter(
+    max_concurrent=CONFIG.max_concurrent_runs,
+    max_per_session=CONFIG.max_runs_per_session,
+    max_queued=CONFIG.run_queue_max,
+)
+ZYGOTE = Zygote(CONFIG.zygote_preload) if CONFIG.zygote_enabled else None
+RUN_LATENCY = LatencyStats()
 
 
 @asynccontextmanager
@@ -107,15 +132,46 @@ async def _lifespan(server: "FastMCP") -> AsyncIterator[Dict[str, Any]]:
     so it actually executes.
     """
     await REGISTRY.start()
+    probe_task = None
+    if ZYGOTE is not None:
+        try:
+            await ZYGOTE.start()
+            probe_task = asyncio.create_task(_probe_zygote())
+        except Exception as e:
+            logger.warning("zygote failed to start, using cold starts: %s", e)
     try:
         yield {"registry": REGISTRY}
     finally:
+        if probe_task is not None:
+            probe_task.cancel()
+        if ZYGOTE is not None:
+            try:
+                await ZYGOTE.stop()
+            except Exception as e:
+                logger.warning("zygote shutdown error: %s", e)
+        if KERNELS is not None:
+            KERNELS.close()
         try:
             await REGISTRY.stop()
         except Exception as e:
             logger.warning("registry shutdown error: %s", e)
 
 
+async def _probe_zygote() -> None:
+    """Once the zygote is warm, time one cold and one warm start for ``info()``."""
+    if not await ZYGOTE.wait_ready(timeout=300):
+        logger.warning("zygote not ready after 300s; calls use cold starts")
+        return
+    probe_dir = tempfile.mkdtemp(prefix=".zygote-probe-", dir=CONFIG.workspaces_dir)
+    try:
+        async with LIMITER.slot(os.path.basename(probe_dir)):
+            await ZYGOTE.measure_startup(probe_dir, _limits())
+    except Exception as e:
+        logger.warning("zygote startup probe failed: %s", e)
+    finally:
+        shutil.rmtree(probe_dir, ignore_errors=True)
+
+
 mcp = FastMCP(
     "Code Executor v2",
     session_state_store=get_state_store(),
@@ -136,6 +192,85 @@ def _limits() -> SandboxLimits:
     )
 
 
+# Saves any open matplotlib figures after each call.
+_SAVE_FIGURES = (
+    "try:\n"
+    "    import matplotlib.pyplot as _plt\n"
+    "    for _n in _plt.get_fignums():\n"
+    "        try:\n"
+    "            _plt.figure(_n).savefig(f'plot_{_n}.png')\n"
+    "        except Exception:\n"
+    "            pass\n"
+    "    _plt.close('all')\n"
+    "except Exception:\n"
+    "    pass\n"
+)
+
+
+def _cold_script(code: str) -> str:
+    """Wrap user code for a fresh interpreter, with auto-savefig of figures."""
+    return (
+        "import sys, traceback\n"
+        "_user_src = " + repr(code) + "\n"
+        "_g = {'__name__': '__main__'}\n"
+        "try:\n"
+        "    exec(compile(_user_src, '<user>', 'exec'), _g)\n"
+        "except SystemExit:\n"
+        "    raise\n"
+        "except BaseException:\n"
+        "    traceback.print_exc()\n"
+        "    sys.exit(1)\n"
+        + _SAVE_FIGURES
+    )
+
+
+async def _execute(record, code: str, limits: SandboxLimits) -> Tuple[SandboxResult, str]:
+    """Run ``code`` for the session in the best available mode.
+
+    That is the session's persistent kernel when enabled, else warm
+    through the zygote if possible, else cold. Returns the result and the
+    mode used (``"persistent"`` / ``"warm"`` / ``"cold"``).
+    """
+    workdir = str(record.workspace)
+    if KERNELS is not None:
+        result = await KERNELS.run(
+            record.session_id, workdir, code, limits, epilogue=_SAVE_FIGURES,
+        )
+        RUN_LATENCY.record("persistent", result.wall_seconds)
+        return result, "persistent"
+    source = _cold_script(code)
+    if ZYGOTE is not None:
+        try:
+            result = await ZYGOTE.run(source, workdir, limits)
+        except ZygoteUnavailable:
+            pass
+        else:
+            RUN_LATENCY.record("warm", result.wall_seconds)
+            return result, "warm"
+    result = await run_sandboxed_async(
+        ["python", "-c", source], workdir=workdir, limits=limits,
+    )
+    RUN_LATENCY.record("cold", result.wall_seconds)
+    return result, "cold"
+
+
+def _begin_tracking(record) -> WorkspaceTracker:
+    """Return the session's tracker, brought up to date before a run."""
+    if record.tracker is None:
+        record.tracker = WorkspaceTracker(
+            record.workspace, use_inotify=CONFIG.artifact_inotify,
+        )
+    tracker = record.tracker
+    tracker.begin()
+    return tracker
+
+
+def _workspace_touched(record) -> None:
+    """Tell the tracker a tool other than ``python`` changed the workspace."""
+    if record.tracker is not None:
+        record.tracker.invalidate()
+
+
 async def _session_for(ctx: Context):
     """Resolve the FastMCP session id for this call.
 
@@ -181,6 +316,19 @@ def _envelope(
     return out
 
 
+def _busy_envelope(record, error: ExecutorBusy) -> Dict[str, Any]:
+    return _envelope(
+        results={"error": str(error)},
+        meta={
+            "is_error": True,
+            "session_id": record.session_id,
+            "execution": LIMITER.stats(),
+            "zygote": ZYGOTE.stats() if ZYGOTE is not None else {"enabled": False},
+            "run_latency": RUN_LATENCY.snapshot(),
+        },
+    )
+
+
 def _truncate(s: str, max_chars: int = 4000) -> str:
     if len(s) <= max_chars:
         return s
@@ -296,22 +444,44 @@ async def python(
 ) -> Dict[str, Any]:
     """Execute Python in the session's sandboxed workspace.
 
-    Each call is a fresh subprocess under Landlock + network namespace +
-    rlimits; **state survives across calls only via files in the
-    workspace**, not Python globals. Returns stdout/stderr/returncode
-    plus any files newly created or modified during this call as v2
-    artifacts.
+    Code runs under Landlock + network namespace + rlimits. Unless the
+    server runs persistent kernels (``info()`` reports
+    ``persistent_kernel.enabled``), **state survives across calls only
+    via files in the workspace**, not Python globals. With persistent
+    kernels, globals also survive until ``reset_session()``, idle
+    eviction, or a call that had to be killed; ``meta_data.kernel.runs``
+    is 1 when a call started from an empty namespace. Returns
+    stdout/stderr/returncode plus any files newly created or modified
+    during this call as v2 artifacts. Large files, and files past the
+    per-response budget, come back without content (``oversize`` /
+    ``over_budget``); fetch those with ``download_file``.
 
     Constraints:
         * No network access.
         * Filesystem writes are restricted to the session workspace.
         * Memory / CPU / file-size capped by server config.
-        * Each call gets a fresh interpreter.
+        * Without persistent kernels each call gets a fresh interpreter
+          (commonly used libraries may already be imported).
         * Use ``upload_file`` to bring data in, ``download_file`` to take
           something out.
+        * Calls in the same session run one at a time; busy servers queue
+          calls, and answer with an error when the queue is full.
     """
     record = await _session_for(ctx)
-    record.last_seen_mtimes = snapshot_mtimes(record.workspace)
+    try:
+        async with LIMITER.slot(record.session_id):
+            return await _run_python(record, code, timeout)
+    except ExecutorBusy as e:
+        return _busy_envelope(record, e)
+
+
+async def _run_python(record, code: str, timeout: int) -> Dict[str, Any]:
+    """Body of the ``python`` tool, run while holding a limiter slot.
+
+    Change tracking (see ``artifacts.WorkspaceTracker``) runs in a worker
+    thread so it does not stall other sessions on the event loop.
+    """
+    tracker = await asyncio.to_thread(_begin_tracking, record)
     limits = _limits()
     if timeout > 0:
         limits = SandboxLimits(
@@ -322,43 +492,16 @@ async def python(
             wall_s=min(limits.wall_s, timeout),
         )
 
-    # Wrap user code with auto-savefig of any open matplotlib figures
-    wrapped = (
-        "import sys, traceback\n"
-        "_user_src = " + repr(code) + "\n"
-        "_g = {'__name__': '__main__'}\n"
-        "try:\n"
-        "    exec(compile(_user_src, '<user>', 'exec'), _g)\n"
-        "except SystemExit:\n"
-        "    raise\n"
-        "except BaseException:\n"
-        "    traceback.print_exc()\n"
-        "    sys.exit(1)\n"
-        "try:\n"
-        "    import matplotlib.pyplot as _plt\n"
-        "    for _n in _plt.get_fignums():\n"
-        "        try:\n"
-        "            _plt.figure(_n).savefig(f'plot_{_n}.png')\n"
-        "        except Exception:\n"
-        "            pass\n"
-        "    _plt.close('all')\n"
-        "except Exception:\n"
-        "    pass\n"
-    )
-
     start = time.monotonic()
-    result = run_sandboxed(
-        ["python", "-c", wrapped],
-        workdir=str(record.workspace),
-        limits=limits,
-    )
+    result, mode = await _execute(record, code, limits)
     elapsed = round(time.monotonic() - start, 4)
 
     # Enforce the workspace cap *after* the run. RLIMIT_FSIZE caps each
     # individual file written by the child, but a long-running script can
     # write many files; without this check, user code can fill the pod's
     # disk regardless of CODE_EXECUTOR_V2_WS_CAP_MB.
-    ws_used = workspace_bytes_used(record.workspace)
+    changed = await asyncio.to_thread(tracker.changes)
+    ws_used = tracker.bytes_used
     workspace_cap_exceeded = ws_used > CONFIG.workspace_cap_bytes
     if workspace_cap_exceeded:
         logger.warning(
@@ -370,12 +513,16 @@ async def python(
         except Exception as e:
             logger.error("failed to reset over-cap workspace: %s", e)
         artifacts: list = []
-        ws_used = workspace_bytes_used(record.workspace)
+        artifacts_omitted = 0
+        ws_used = await asyncio.to_thread(workspace_bytes_used, record.workspace)
     else:
-        artifacts = diff_artifacts(
+        artifacts, artifacts_omitted = await asyncio.to_thread(
+            package_artifacts,
             record.workspace,
-            before=record.last_seen_mtimes,
+            changed,
             artifact_cap_bytes=CONFIG.artifact_cap_bytes,
+            budget_bytes=CONFIG.artifact_budget_bytes,
+            max_count=CONFIG.max_artifacts,
         )
 
     is_error = (
@@ -401,6 +548,7 @@ async def python(
         "is_error": is_error,
         "execution_time_sec": elapsed,
         "wall_seconds": result.wall_seconds,
+        "start_mode": mode,
         "session_id": record.session_id,
         "sandbox": {
             "fs": "landlock",
@@ -412,7 +560,11 @@ async def python(
         "workspace_bytes_used": ws_used,
         "workspace_cap_exceeded": workspace_cap_exceeded,
         "artifact_count": len(artifacts),
+        "artifacts_omitted": artifacts_omitted,
+        "change_tracking": tracker.mode,
     }
+    if KERNELS is not None:
+        meta["kernel"] = KERNELS.session_stats(record.session_id)
     return _envelope(
         results=results,
         meta=meta,
@@ -467,6 +619,7 @@ async def upload_file(
         )
     except WorkspaceError as e:
         return _envelope(results={"error": str(e)}, meta={"is_error": True})
+    _workspace_touched(record)
     return _envelope(
         results={"uploaded": safe_name, "bytes": written},
         meta={
@@ -554,6 +707,7 @@ async def write_file(
         )
     except WorkspaceError as e:
         return _envelope(results={"error": str(e)}, meta={"is_error": True})
+    _workspace_touched(record)
     return _envelope(
         results={"path": path, "bytes": bytes_written},
         meta={
@@ -575,6 +729,7 @@ async def delete_file(
         info = delete_path(record.workspace, path)
     except WorkspaceError as e:
         return _envelope(results={"error": str(e)}, meta={"is_error": True})
+    _workspace_touched(record)
     return _envelope(
         results=info,
         meta={
@@ -642,8 +797,17 @@ async def info(ctx: Context) -> Dict[str, Any]:
                 "wall_s": CONFIG.wall_s,
                 "workspace_cap_mb": CONFIG.workspace_cap_mb,
                 "artifact_cap_mb": CONFIG.artifact_cap_mb,
+                "artifact_budget_mb": CONFIG.artifact_budget_mb,
+                "max_artifacts": CONFIG.max_artifacts,
                 "session_ttl_s": CONFIG.session_ttl_s,
             },
+            "execution": LIMITER.stats(),
+            "zygote": ZYGOTE.stats() if ZYGOTE is not None else {"enabled": False},
+            "run_latency": RUN_LATENCY.snapshot(),
+            "persistent_kernel": (
+                {**KERNELS.stats(), "session": KERNELS.session_stats(record.session_id)}
+                if KERNELS is not None else {"enabled": False}
+            ),
             "git_clone_enabled": CONFIG.enable_git_clone,
             "installed_packages": packages,
             "registry": REGISTRY.stats(),
@@ -654,7 +818,8 @@ async def info(ctx: Context) -> Dict[str, Any]:
 
 @mcp.tool
 async def reset_session(ctx: Context) -> Dict[str, Any]:
-    """Wipe the session workspace and clear state."""
+    """Wipe the session workspace and clear state (including the
+    persistent kernel's Python globals, when enabled)."""
     record = await _session_for(ctx)
     await REGISTRY.reset(record.session_id)
     return _envelope(
@@ -684,13 +849,18 @@ if CONFIG.enable_git_clone:
         argv.
         """
         record = await _session_for(ctx)
-        out = run_git_clone(
-            workspace=record.workspace,
-            repo_url=repo_url,
-            pat=pat or None,
-            ref=ref,
-            subdir=subdir or None,
-        )
+        try:
+            async with LIMITER.slot(record.session_id):
+                out = await run_git_clone(
+                    workspace=record.workspace,
+                    repo_url=repo_url,
+                    pat=pat or None,
+                    ref=ref,
+                    subdir=subdir or None,
+                )
+        except ExecutorBusy as e:
+            return _busy_envelope(record, e)
+        _workspace_touched(record)
         return _envelope(
             results=out,
             meta={
@@ -0,0 +1,159 @@
+"""Persistent per-session interpreter for Code Executor v2.
+
+The server starts this through ``_sandbox_launch_v2.py`` exactly like a
+cold ``python`` call -- user+net namespace, rlimits, NO_NEW_PRIVS,
+Landlock on the session workspace -- passing this file's text with
+``python -c`` (the sandbox cannot read it by path). It then runs every
+``python`` call of that session in one shared namespace, so globals
+survive between calls.
+
+Protocol: one JSON object per line.
+
+* server -> kernel on stdin: ``{"source": ..., "epilogue": ..., "cpu_s": N}``
+* kernel -> server on stdout: ``{"returncode": rc, "stdout": ..., "stderr": ...}``
+
+``source`` runs in the shared namespace; ``epilogue`` (e.g. saving open
+figures) runs afterwards in a scratch namespace. While a call runs, fds
+1 and 2 point at capture pipes, so output of subprocesses is collected
+as well; fd 0 is ``/dev/null``. SIGINT interrupts the call with
+``KeyboardInterrupt`` and keeps the namespace. RLIMIT_CPU (set by the
+launcher) is the kernel's lifetime CPU budget; each call lowers the soft
+limit to its own ``cpu_s`` and SIGXCPU interrupts it.
+
+Like the launcher, this file is stdlib-only.
+"""
+
+import builtins
+import json
+import os
+import resource
+import signal
+import sys
+import threading
+import traceback
+
+_CAPTURE_CAP_BYTES = 8 * 1024 * 1024
+_TRUNCATED_NOTE = b"\n[capture truncated]\n"
+_DRAIN_GRACE_S = 2.0
+
+
+class CpuLimitExceeded(BaseException):
+    """Raised in user code when the call's CPU allowance is used up."""
+
+
+def _on_sigxcpu(signum, frame):
+    raise CpuLimitExceeded("CPU time limit exceeded")
+
+
+def _drain(fd, buf):
+    truncated = False
+    with os.fdopen(fd, "rb", buffering=0) as stream:
+        while True:
+            chunk = stream.read(64 * 1024)
+            if not chunk:
+                return
+            room = _CAPTURE_CAP_BYTES - len(buf)
+            if room > 0:
+                buf.extend(chunk[:room])
+            if len(chunk) > room and not truncated:
+                buf.extend(_TRUNCATED_NOTE)
+                truncated = True
+
+
+def _exit_code(exc):
+    code = exc.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code & 0xFF
+    sys.stderr.write(f"{code}\n")
+    return 1
+
+
+def _set_cpu_allowance(cpu_s):
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + max(int(cpu_s), 1)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _run(req, namespace, devnull):
+    captured = [bytearray(), bytearray()]
+    drains = []
+    for target, buf in zip((1, 2), captured):
+        read_fd, write_fd = os.pipe()
+        os.dup2(write_fd, target)
+        os.close(write_fd)
+        thread = threading.Thread(target=_drain, args=(read_fd, buf), daemon=True)
+        thread.start()
+        drains.append(thread)
+
+    code = 0
+    try:
+        if req.get("cpu_s"):
+            _set_cpu_allowance(req["cpu_s"])
+        exec(compile(req["source"], "<user>", "exec"), namespace)
+    except SystemExit as e:
+        code = _exit_code(e)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    try:
+        if req.get("epilogue"):
+            exec(compile(req["epilogue"], "<epilogue>", "exec"),
+                 {"__name__": "__epilogue__", "__builtins__": builtins})
+    except BaseException:
+        # Best effort, like the cold wrapper.
+        pass
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+        os.dup2(devnull, 1)
+        os.dup2(devnull, 2)
+    for thread in drains:
+        # A background process of the user's may still hold the pipe.
+        thread.join(_DRAIN_GRACE_S)
+    return {
+        "returncode": code,
+        "stdout": bytes(captured[0]).decode("utf-8", "replace"),
+        "stderr": bytes(captured[1]).decode("utf-8", "replace"),
+    }
+
+
+def main():
+    control_in = os.fdopen(os.dup(0), "rb")
+    control_out = os.dup(1)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    signal.signal(signal.SIGXCPU, _on_sigxcpu)
+
+    # Look like ``python -c``: ``sys.path[0]`` is already the cwd.
+    namespace = {"__name__": "__main__", "__builtins__": builtins}
+    while True:
+        try:
+            line = control_in.readline()
+        except KeyboardInterrupt:
+            # A late interrupt for a call that already finished.
+            continue
+        if not line:
+            return 0
+        try:
+            reply = _run(json.loads(line), namespace, devnull)
+        except KeyboardInterrupt:
+            # Interrupted outside user code; output of this call is lost.
+            os.dup2(devnull, 1)
+            os.dup2(devnull, 2)
+            reply = {"returncode": 1, "stdout": "", "stderr": "KeyboardInterrupt\n"}
+        payload = (json.dumps(reply, ensure_ascii=False) + "\n").encode("utf-8")
+        while payload:
+            payload = payload[os.write(control_out, payload):]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
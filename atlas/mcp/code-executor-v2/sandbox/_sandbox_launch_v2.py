@@ -287,6 +287,37 @@ def _apply_landlock(workdir: str, extra_read_dirs: List[str]) -> None:
         os.close(ruleset_fd)
 
 
+def _read_dirs_for(target: str) -> List[str]:
+    """Directories to whitelist for read+exec so ``target`` can run.
+
+    Resolved BEFORE Landlock locks us out. We whitelist:
+      * dirname(symlink-path)        -- e.g. <venv>/bin
+      * dirname(symlink-path)/..     -- e.g. <venv>/  (pyvenv.cfg, lib/)
+      * dirname(realpath)            -- the actual binary install dir
+      * dirname(realpath)/..         -- where the actual stdlib lives
+    """
+    extra_read_dirs: List[str] = []
+    resolved = shutil.which(target)
+    candidates = []
+    if resolved:
+        candidates.append(resolved)
+        candidates.append(os.path.realpath(resolved))
+    elif os.path.sep in target:
+        candidates.append(target)
+        candidates.append(os.path.realpath(target))
+    seen = set()
+    for path in candidates:
+        d = os.path.dirname(path)
+        if d and d not in seen:
+            seen.add(d)
+            extra_read_dirs.append(d)
+        parent = os.path.dirname(d)
+        if parent and parent not in seen:
+            seen.add(parent)
+            extra_read_dirs.append(parent)
+    return extra_read_dirs
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
@@ -314,32 +345,7 @@ def main(argv: List[str]) -> int:
         sys.stderr.write("sandbox: no command supplied\n")
         return 2
 
-    # Resolve the target binary BEFORE Landlock locks us out so we can
-    # whitelist its containing directory for read+exec. We whitelist:
-    #   * dirname(symlink-path)        -- e.g. <venv>/bin
-    #   * dirname(symlink-path)/..     -- e.g. <venv>/  (pyvenv.cfg, lib/)
-    #   * dirname(realpath)            -- the actual binary install dir
-    #   * dirname(realpath)/..         -- where the actual stdlib lives
-    extra_read_dirs: List[str] = []
-    target = cmd_argv[0]
-    resolved = shutil.which(target)
-    candidates = []
-    if resolved:
-        candidates.append(resolved)
-        candidates.append(os.path.realpath(resolved))
-    elif os.path.sep in target:
-        candidates.append(target)
-        candidates.append(os.path.realpath(target))
-    seen = set()
-    for path in candidates:
-        d = os.path.dirname(path)
-        if d and d not in seen:
-            seen.add(d)
-            extra_read_dirs.append(d)
-        parent = os.path.dirname(d)
-        if parent and parent not in seen:
-            seen.add(parent)
-            extra_read_dirs.append(parent)
+    extra_read_dirs = _read_dirs_for(cmd_argv[0])
 
     try:
         if not ns.allow_net:
@@ -0,0 +1,248 @@
+"""Fork server ("zygote") for warm Code Executor v2 runs.
+
+Invoked as::
+
+    python /abs/path/_zygote_v2.py --control-fd N [--preload numpy,pandas]
+
+The zygote imports the ``--preload`` modules once, then forks one child
+per ``python`` call. The child applies the same layers as
+``_sandbox_launch_v2.py`` -- user+net namespace, rlimits, NO_NEW_PRIVS,
+Landlock on the session workspace -- and then ``exec``s the user source
+in-process instead of starting a new interpreter. Interpreter startup and
+the preloaded imports are therefore paid once, not per call.
+
+The zygote itself never runs user code and is not sandboxed; it is as
+trusted as the server that starts it.
+
+Protocol (one JSON object per ``SOCK_SEQPACKET`` message on the control
+socket):
+
+* zygote -> server, once: ``{"ready": true, "preloaded": [...],
+  "failed": {name: error}, "startup_s": float}``
+* server -> zygote: ``{"id": N, "workdir": ..., "mem_mb": ..., "cpu_s":
+  ..., "fsize_mb": ..., "nproc": ..., "source": ...}`` with the child's
+  stdout and stderr pipe ends attached as ``SCM_RIGHTS``.
+  Replies ``{"id": N, "pid": pid}``, then ``{"id": N, "status": rc}``
+  when the child exits (``rc`` negative for a signal, as with Popen).
+* server -> zygote: ``{"kill": N}`` SIGKILLs run ``N``'s process group.
+* EOF on the control socket: kill every child and exit.
+
+Like the launcher, this file is stdlib-only and run by absolute path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import builtins
+import json
+import os
+import select
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Dict, List
+
+import _sandbox_launch_v2 as _sandbox
+
+_PR_SET_PDEATHSIG = 1
+_MAX_MESSAGE_BYTES = 1 << 20
+
+
+def _send(control: socket.socket, payload: dict) -> None:
+    try:
+        control.send(json.dumps(payload).encode("utf-8"))
+    except OSError:
+        # Server went away; the main loop sees EOF next.
+        pass
+
+
+def _preload(names: List[str]) -> dict:
+    start = time.monotonic()
+    loaded, failed = [], {}
+    for name in names:
+        try:
+            __import__(name)
+            loaded.append(name)
+        except Exception as e:  # noqa: BLE001 - report any import failure
+            failed[name] = f"{type(e).__name__}: {e}"
+    return {
+        "ready": True,
+        "preloaded": loaded,
+        "failed": failed,
+        "startup_s": round(time.monotonic() - start, 4),
+    }
+
+
+def _exit_code(exc: SystemExit) -> int:
+    code = exc.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code & 0xFF
+    sys.stderr.write(f"{code}\n")
+    return 1
+
+
+def _child(req: dict, out_fd: int, err_fd: int, close_fds: List[int], read_dirs: List[str]) -> None:
+    """Runs in the forked child; never returns."""
+    code = 1
+    try:
+        for fd in close_fds:
+            os.close(fd)
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(out_fd, 1)
+        os.dup2(err_fd, 2)
+        for fd in (devnull, out_fd, err_fd):
+            os.close(fd)
+
+        zygote_pid = os.getppid()
+        try:
+            _sandbox._enter_user_and_net_namespace()
+            # Set after the namespace switch, which clears it.
+            _sandbox._libc().prctl(_PR_SET_PDEATHSIG, signal.SIGKILL, 0, 0, 0)
+            if os.getppid() != zygote_pid:
+                os._exit(1)
+            _sandbox._apply_rlimits(req["mem_mb"], req["cpu_s"], req["fsize_mb"], req["nproc"])
+            _sandbox._apply_landlock(req["workdir"], read_dirs)
+            os.chdir(req["workdir"])
+        except Exception as e:  # noqa: BLE001 - same contract as the launcher
+            os.write(2, f"sandbox setup failed: {e}\n".encode())
+            os._exit(1)
+
+        # Look like ``python -c``: cwd first on sys.path, no script dir.
+        sys.argv = ["-c"]
+        sys.path[0] = ""
+        # Forked children would otherwise share the zygote's RNG state.
+        numpy = sys.modules.get("numpy")
+        if numpy is not None:
+            numpy.random.seed()
+
+        code = 0
+        try:
+            exec(
+                compile(req["source"], "<string>", "exec"),
+                {"__name__": "__main__", "__builtins__": builtins},
+            )
+        except SystemExit as e:
+            code = _exit_code(e)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:  # noqa: BLE001 - exiting regardless
+                pass
+        os._exit(code)
+
+
+def _kill(pid: int) -> None:
+    for kill in (os.killpg, os.kill):
+        try:
+            kill(pid, signal.SIGKILL)
+        except OSError:
+            # Already gone, or not yet a group leader.
+            continue
+
+
+def serve(control: socket.socket, read_dirs: List[str]) -> None:
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    os.set_blocking(wake_w, False)
+    signal.signal(signal.SIGCHLD, lambda *_: None)
+    signal.set_wakeup_fd(wake_w)
+
+    children: Dict[int, int] = {}  # pid -> request id
+    pids: Dict[int, int] = {}  # request id -> pid
+    while True:
+        try:
+            readable, _, _ = select.select([control, wake_r], [], [])
+        except InterruptedError:
+            readable = []
+        if wake_r in readable:
+            try:
+                while os.read(wake_r, 512):
+                    pass
+            except BlockingIOError:
+                pass
+        while children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            rid = children.pop(pid, None)
+            if rid is not None:
+                pids.pop(rid, None)
+                _send(control, {"id": rid, "status": os.waitstatus_to_exitcode(status)})
+        if control not in readable:
+            continue
+
+        msg, fds, _, _ = socket.recv_fds(control, _MAX_MESSAGE_BYTES, 2)
+        if not msg:
+            for pid in children:
+                _kill(pid)
+            return
+        try:
+            req = json.loads(msg)
+        except ValueError:
+            for fd in fds:
+                os.close(fd)
+            continue
+        if "kill" in req:
+            pid = pids.get(req["kill"])
+            if pid is not None:
+                _kill(pid)
+            continue
+        if len(fds) != 2:
+            for fd in fds:
+                os.close(fd)
+            _send(control, {"id": req.get("id"), "status": -1})
+            continue
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            pid = os.fork()
+        except OSError as e:
+            os.write(fds[1], f"sandbox fork failed: {e}\n".encode())
+            for fd in fds:
+                os.close(fd)
+            _send(control, {"id": req["id"], "status": -1})
+            continue
+        if pid == 0:
+            _child(req, fds[0], fds[1], [control.fileno(), wake_r, wake_w], read_dirs)
+        for fd in fds:
+            os.close(fd)
+        children[pid] = req["id"]
+        pids[req["id"]] = pid
+        _send(control, {"id": req["id"], "pid": pid})
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--control-fd", type=int, required=True)
+    parser.add_argument("--preload", default="")
+    ns = parser.parse_args(argv)
+
+    control = socket.socket(fileno=ns.control_fd)
+    # Resolved before any child applies Landlock; see _read_dirs_for.
+    read_dirs = _sandbox._read_dirs_for(sys.executable)
+    names = [n.strip() for n in ns.preload.split(",") if n.strip()]
+    _send(control, _preload(names))
+    serve(control, read_dirs)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
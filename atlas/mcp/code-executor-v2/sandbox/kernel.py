@@ -0,0 +1,339 @@
+"""Server side of the persistent per-session interpreter (``_kernel_v2.py``).
+
+With ``CODE_EXECUTOR_V2_PERSISTENT_KERNEL=1`` every session's ``python``
+calls run in one long-lived interpreter, so Python globals (a loaded
+DataFrame, a fitted model) survive between calls instead of being
+rebuilt each time. The interpreter is started through the same launcher
+as a cold call and keeps all of its layers: user+net namespace, rlimits,
+NO_NEW_PRIVS and Landlock on the session workspace.
+
+``KernelPool`` owns one ``PersistentKernel`` per session and tears it
+down when:
+
+* the session is reset, reaped or destroyed (``SessionRegistry``'s
+  ``on_destroy`` hook),
+* it has been idle for ``CODE_EXECUTOR_V2_KERNEL_IDLE_S`` (checked on
+  every reaper sweep),
+* the kernels together hold more than ``CODE_EXECUTOR_V2_KERNEL_MEM_BUDGET_MB``
+  of resident memory, least recently used first, or
+* a call overran its wall clock and did not stop on SIGINT.
+
+A torn-down kernel is started again, empty, on the session's next call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import signal
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from sandbox.launcher import SandboxLimits, SandboxResult, _scrub_env, launcher_argv
+
+logger = logging.getLogger(__name__)
+
+# Passed with ``python -c``: Landlock does not let the sandbox read this
+# directory.
+_KERNEL_SOURCE = (Path(__file__).resolve().parent / "_kernel_v2.py").read_text()
+
+# A reply carries up to two capped 8 MiB streams, JSON-escaped.
+_REPLY_LIMIT_BYTES = 64 * 1024 * 1024
+# How long an interrupted call gets to unwind before the kernel is killed.
+_INTERRUPT_GRACE_S = 2.0
+_STDERR_TAIL_BYTES = 4096
+
+_STATE_KEPT = "\n[interrupted; Python state from earlier calls was kept]\n"
+_STATE_LOST = "\n[persistent interpreter exited; Python state was lost]\n"
+
+
+class PersistentKernel:
+    """One sandboxed interpreter serving one session, one call at a time."""
+
+    def __init__(self, session_id: str, workdir: str, limits: SandboxLimits) -> None:
+        self.session_id = session_id
+        self.workdir = str(workdir)
+        self.limits = limits
+        self.runs = 0
+        self.started_at = 0.0
+        self.last_used = 0.0
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._stderr_tail = bytearray()
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._proc.pid if self._proc is not None else None
+
+    async def start(self) -> None:
+        self._proc = await asyncio.create_subprocess_exec(
+            *launcher_argv(["python", "-c", _KERNEL_SOURCE], self.workdir, self.limits),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=_scrub_env({}),
+            cwd=self.workdir,
+            limit=_REPLY_LIMIT_BYTES,
+        )
+        self._stderr_task = asyncio.create_task(self._keep_stderr_tail(self._proc.stderr))
+        self.started_at = self.last_used = time.monotonic()
+        logger.info("started persistent kernel for session %s (pid %s)", self.session_id, self.pid)
+
+    async def run(
+        self,
+        source: str,
+        *,
+        epilogue: str = "",
+        cpu_s: int,
+        wall_s: float,
+    ) -> SandboxResult:
+        """Run ``source`` in the shared namespace.
+
+        Past ``wall_s`` the call is interrupted with SIGINT, which keeps
+        the namespace; if it does not stop within a grace period, or the
+        awaiting task is cancelled, the kernel is killed.
+        """
+        async with self._lock:
+            start = time.monotonic()
+            self.runs += 1
+            try:
+                return await self._run_locked(source, epilogue, cpu_s, max(wall_s, 1), start)
+            finally:
+                self.last_used = time.monotonic()
+
+    async def _run_locked(
+        self, source: str, epilogue: str, cpu_s: int, wall_s: float, start: float,
+    ) -> SandboxResult:
+        proc = self._proc
+        if proc is None or proc.returncode is not None:
+            return await self._exited(start)
+        request = json.dumps({"source": source, "epilogue": epilogue, "cpu_s": cpu_s})
+        try:
+            proc.stdin.write(request.encode("utf-8") + b"\n")
+            await proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            return await self._exited(start)
+
+        reply_task = asyncio.ensure_future(proc.stdout.readline())
+        timed_out = False
+        try:
+            done, _ = await asyncio.wait({reply_task}, timeout=wall_s)
+            if not done:
+                timed_out = True
+                self._signal(signal.SIGINT)
+                done, _ = await asyncio.wait({reply_task}, timeout=_INTERRUPT_GRACE_S)
+            if not done:
+                self.kill()
+                result = await self._exited(start)
+                result.timed_out = True
+                result.returncode = -1
+                return result
+            line = reply_task.result()
+        except BaseException:
+            # Cancelled mid-call, or a reply over the size limit: the
+            # protocol cannot be resynchronised.
+            reply_task.cancel()
+            self.kill()
+            raise
+        if not line:
+            return await self._exited(start)
+
+        try:
+            reply = json.loads(line)
+        except ValueError:
+            self.kill()
+            return await self._exited(start)
+        stderr = reply.get("stderr", "")
+        if timed_out:
+            stderr += _STATE_KEPT
+        return SandboxResult(
+            returncode=-1 if timed_out else int(reply.get("returncode", 1)),
+            stdout=reply.get("stdout", ""),
+            stderr=stderr,
+            timed_out=timed_out,
+            wall_seconds=round(time.monotonic() - start, 4),
+        )
+
+    async def _exited(self, start: float) -> SandboxResult:
+        returncode = -1
+        if self._proc is not None:
+            try:
+                returncode = await asyncio.wait_for(self._proc.wait(), timeout=_INTERRUPT_GRACE_S)
+            except asyncio.TimeoutError:
+                self.kill()
+        if self._stderr_task is not None:
+            # Pick up the launcher's last words (e.g. sandbox setup errors).
+            await asyncio.wait({self._stderr_task}, timeout=_INTERRUPT_GRACE_S)
+        tail = bytes(self._stderr_tail).decode("utf-8", "replace")
+        return SandboxResult(
+            returncode=returncode if returncode != 0 else -1,
+            stdout="",
+            stderr=tail + _STATE_LOST,
+            timed_out=False,
+            wall_seconds=round(time.monotonic() - start, 4),
+        )
+
+    def kill(self) -> None:
+        self._signal(signal.SIGKILL)
+
+    def _signal(self, sig: int) -> None:
+        if self._proc is None or self._proc.returncode is not None:
+            return
+        try:
+            self._proc.send_signal(sig)
+        except ProcessLookupError:
+            # Race: exited on its own.
+            pass
+
+    def rss_bytes(self) -> int:
+        """Resident memory of the interpreter (not of processes it spawned)."""
+        if not self.alive:
+            return 0
+        try:
+            with open(f"/proc/{self.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            pass
+        return 0
+
+    async def _keep_stderr_tail(self, stream: Optional[asyncio.StreamReader]) -> None:
+        if stream is None:
+            return
+        while True:
+            chunk = await stream.read(64 * 1024)
+            if not chunk:
+                return
+            self._stderr_tail.extend(chunk)
+            del self._stderr_tail[:-_STDERR_TAIL_BYTES]
+
+
+class KernelPool:
+    """Per-session ``PersistentKernel``s with idle and memory eviction."""
+
+    def __init__(
+        self,
+        *,
+        limits: SandboxLimits,
+        idle_s: int,
+        mem_budget_mb: int,
+    ) -> None:
+        # Lifetime limits of each kernel process; ``limits.cpu_s`` is the
+        # CPU budget of the whole kernel, not of one call.
+        self.limits = limits
+        self.idle_s = idle_s
+        self.mem_budget_bytes = mem_budget_mb * 1024 * 1024
+        self._kernels: Dict[str, PersistentKernel] = {}
+        self.evictions = {"idle": 0, "memory": 0}
+
+    async def run(
+        self,
+        session_id: str,
+        workdir: str,
+        source: str,
+        limits: SandboxLimits,
+        *,
+        epilogue: str = "",
+    ) -> SandboxResult:
+        """Run ``source`` in the session's kernel, starting one if needed.
+
+        Only ``limits.cpu_s`` and ``limits.wall_s`` apply per call; the
+        rest were fixed when the kernel started.
+        """
+        kernel = self._kernels.get(session_id)
+        if kernel is None or not kernel.alive:
+            self.evict_for_memory(exclude=session_id)
+            kernel = PersistentKernel(session_id, workdir, self.limits)
+            await kernel.start()
+            self._kernels[session_id] = kernel
+        result = await kernel.run(
+            source, epilogue=epilogue, cpu_s=limits.cpu_s, wall_s=limits.wall_s,
+        )
+        if not kernel.alive and self._kernels.get(session_id) is kernel:
+            del self._kernels[session_id]
+        self.evict_for_memory(exclude=session_id)
+        return result
+
+    def discard(self, session_id: str) -> None:
+        """Kill the session's kernel, if any; its state is gone."""
+        kernel = self._kernels.pop(session_id, None)
+        if kernel is not None:
+            kernel.kill()
+            logger.info("stopped persistent kernel for session %s", session_id)
+
+    def sweep(self) -> None:
+        """Reaper hook: drop idle kernels, then enforce the memory budget."""
+        cutoff = time.monotonic() - self.idle_s
+        for sid, kernel in list(self._kernels.items()):
+            if not kernel.alive:
+                del self._kernels[sid]
+            elif not kernel.busy and kernel.last_used < cutoff:
+                logger.info("reaping idle persistent kernel for session %s", sid)
+                self.evictions["idle"] += 1
+                self.discard(sid)
+        self.evict_for_memory()
+
+    def evict_for_memory(self, exclude: Optional[str] = None) -> None:
+        """Kill least recently used idle kernels until under the budget.
+
+        ``exclude`` (the session being served) is never evicted here.
+        """
+        if self.mem_budget_bytes <= 0:
+            return
+        usage = {sid: k.rss_bytes() for sid, k in self._kernels.items()}
+        total = sum(usage.values())
+        if total <= self.mem_budget_bytes:
+            return
+        candidates = sorted(
+            (k for sid, k in self._kernels.items() if sid != exclude and not k.busy),
+            key=lambda k: k.last_used,
+        )
+        for kernel in candidates:
+            if total <= self.mem_budget_bytes:
+                break
+            logger.info(
+                "evicting persistent kernel for session %s (%d MiB) under memory pressure",
+                kernel.session_id, usage[kernel.session_id] // (1024 * 1024),
+            )
+            total -= usage[kernel.session_id]
+            self.evictions["memory"] += 1
+            self.discard(kernel.session_id)
+
+    def close(self) -> None:
+        for sid in list(self._kernels):
+            self.discard(sid)
+
+    def session_stats(self, session_id: str) -> Dict[str, Any]:
+        kernel = self._kernels.get(session_id)
+        if kernel is None or not kernel.alive:
+            return {"alive": False}
+        return {
+            "alive": True,
+            "pid": kernel.pid,
+            "runs": kernel.runs,
+            "rss_mb": round(kernel.rss_bytes() / (1024 * 1024), 1),
+            "idle_s": round(time.monotonic() - kernel.last_used, 1),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "live": len(self._kernels),
+            "rss_mb": round(sum(k.rss_bytes() for k in self._kernels.values()) / (1024 * 1024), 1),
+            "mem_budget_mb": self.mem_budget_bytes // (1024 * 1024),
+            "idle_s": self.idle_s,
+            "cpu_budget_s": self.limits.cpu_s,
+            "evictions": dict(self.evictions),
+        }
@@ -4,18 +4,23 @@ The actual security work happens inside ``_sandbox_launch_v2.py`` (the
 child). This module just builds the argv to invoke that wrapper, applies
 a wall-clock timeout, bounds the captured stdout/stderr, and returns a
 structured result.
+
+``run_sandboxed_async`` is what the server uses: the child is driven by
+``asyncio.create_subprocess_exec`` and its pipes are read by coroutines,
+so a long-running call never blocks the event loop that serves every
+other session. ``run_sandboxed`` is a blocking wrapper for scripts and
+tests that are not already inside an event loop.
 """
 
 from __future__ import annotations
 
+import asyncio
 import os
-import selectors
-import subprocess
 import sys
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import Awaitable, Callable, Iterable, List, Mapping, Optional, Sequence
 
 
 # Hard cap on captured bytes per stream. Without this, a runaway
@@ -25,6 +30,10 @@ from typing import Iterable, List, Optional, Tuple
 # floods. Parent truncates to ``_TRUNCATED_NOTE`` when reached.
 _CAPTURE_CAP_BYTES = 8 * 1024 * 1024
 _TRUNCATED_NOTE = b"\n[capture truncated]\n"
+_READ_CHUNK_BYTES = 64 * 1024
+# How long to wait for a killed child to be reaped and its pipes to close
+# before giving up on them.
+_KILL_GRACE_S = 2.0
 
 
 _LAUNCHER_PATH = str(
@@ -57,12 +66,48 @@ def run_sandboxed(
     *,
     allow_net: bool = False,
     extra_env: Optional[dict] = None,
+) -> SandboxResult:
+    """Blocking form of ``run_sandboxed_async``.
+
+    Must not be called from a running event loop; server code awaits
+    ``run_sandboxed_async`` instead.
+    """
+    return asyncio.run(run_sandboxed_async(
+        cmd, workdir, limits, allow_net=allow_net, extra_env=extra_env,
+    ))
+
+
+async def run_sandboxed_async(
+    cmd: Iterable[str],
+    workdir: str,
+    limits: SandboxLimits,
+    *,
+    allow_net: bool = False,
+    extra_env: Optional[dict] = None,
 ) -> SandboxResult:
     """Run ``cmd`` under the v2 sandbox and return the result.
 
     ``allow_net`` is reserved for the gated ``git_clone`` tool. All
-    other callers should leave it ``False``.
+    other callers should leave it ``False``. If the awaiting task is
+    cancelled the child is killed.
     """
+    workdir = str(workdir)
+    return await _run_capped(
+        launcher_argv(cmd, workdir, limits, allow_net=allow_net),
+        env=_scrub_env(extra_env or {}),
+        cwd=workdir,
+        wall_s=max(limits.wall_s, 1),
+    )
+
+
+def launcher_argv(
+    cmd: Iterable[str],
+    workdir: str,
+    limits: SandboxLimits,
+    *,
+    allow_net: bool = False,
+) -> List[str]:
+    """Return the argv that runs ``cmd`` under ``_sandbox_launch_v2.py``."""
     cmd = list(cmd)
     if not cmd:
         raise ValueError("cmd must be non-empty")
@@ -83,92 +128,111 @@ def run_sandboxed(
         argv.append("--allow-net")
     argv.append("--")
     argv.extend(cmd)
+    return argv
 
-    env = _scrub_env(extra_env or {})
 
-    start = time.monotonic()
-    proc = subprocess.Popen(
-        argv,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        env=env,
-        cwd=workdir,
+async def _run_capped(
+    argv: Sequence[str],
+    *,
+    env: Mapping[str, str],
+    cwd: str,
+    wall_s: float,
+) -> SandboxResult:
+    """Run ``argv`` as a direct child with bounded capture and a deadline."""
+    proc = await asyncio.create_subprocess_exec(
+        *argv,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=dict(env),
+        cwd=cwd,
     )
+
+    def kill() -> None:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            # Race: child exited before kill().
+            pass
+
+    return await supervise(proc.stdout, proc.stderr, proc.wait, kill, wall_s=wall_s)
+
+
+async def supervise(
+    stdout: Optional[asyncio.StreamReader],
+    stderr: Optional[asyncio.StreamReader],
+    wait_exit: Callable[[], Awaitable[int]],
+    kill: Callable[[], None],
+    *,
+    wall_s: float,
+) -> SandboxResult:
+    """Collect a running child's output and exit status under a deadline.
+
+    Both pipes are drained until EOF or the deadline. When the deadline
+    passes (or the awaiting task is cancelled) ``kill`` is called and
+    ``timed_out=True`` is returned along with whatever output was
+    captured so far. ``wait_exit`` returns the child's exit status.
+    """
+    start = time.monotonic()
+    out, err = bytearray(), bytearray()
+    readers = asyncio.gather(_read_capped(stdout, out), _read_capped(stderr, err))
+    timed_out = False
+    returncode: Optional[int] = None
     try:
-        stdout_bytes, stderr_bytes, timed_out = _read_with_caps(
-            proc, deadline=start + max(limits.wall_s, 1),
-        )
-    finally:
-        if proc.poll() is None:
+        done, _ = await asyncio.wait({readers}, timeout=wall_s)
+        timed_out = readers not in done
+        if not timed_out:
+            # Pipes hit EOF; the exit status follows promptly.
+            remaining = max(wall_s - (time.monotonic() - start), 0.0)
             try:
-                proc.kill()
-            except OSError:
-                # Race: child exited between poll() and kill(). Nothing
-                # to do — the process is already gone.
-                pass
+                returncode = await asyncio.wait_for(
+                    wait_exit(), timeout=remaining + _KILL_GRACE_S
+                )
+            except asyncio.TimeoutError:
+                timed_out = True
+    finally:
+        if returncode is None:
+            kill()
             try:
-                proc.wait(timeout=2)
-            except subprocess.TimeoutExpired:
-                # Already SIGKILL'd; if reaping somehow stalls beyond 2s
-                # we accept the leak rather than block the request loop.
+                returncode = await asyncio.wait_for(wait_exit(), timeout=_KILL_GRACE_S)
+            except Exception:
+                # Already SIGKILL'd; if reaping stalls we accept the leak
+                # rather than hold the request.
                 pass
+        if not readers.done():
+            # A grandchild may still hold the pipes open; give them a
+            # moment to close, then stop reading.
+            await asyncio.wait({readers}, timeout=_KILL_GRACE_S)
+            readers.cancel()
     elapsed = time.monotonic() - start
-    rc = proc.returncode if proc.returncode is not None else -1
+    rc = returncode if returncode is not None else -1
     return SandboxResult(
         returncode=-1 if timed_out else rc,
-        stdout=stdout_bytes.decode("utf-8", "replace"),
-        stderr=stderr_bytes.decode("utf-8", "replace"),
+        stdout=bytes(out).decode("utf-8", "replace"),
+        stderr=bytes(err).decode("utf-8", "replace"),
         timed_out=timed_out,
         wall_seconds=round(elapsed, 4),
     )
 
 
-def _read_with_caps(
-    proc: "subprocess.Popen[bytes]",
-    *,
-    deadline: float,
-) -> Tuple[bytes, bytes, bool]:
-    """Read bounded bytes from ``proc.stdout``/``stderr`` until exit/deadline.
-
-    Each stream stops accumulating once it reaches ``_CAPTURE_CAP_BYTES``;
-    further bytes from the child are still drained from the pipe (so the
-    child does not block on a full pipe) but discarded. If the deadline
-    passes, the child is killed and ``timed_out=True`` is returned.
-    """
-    sel = selectors.DefaultSelector()
-    if proc.stdout is not None:
-        sel.register(proc.stdout, selectors.EVENT_READ, "stdout")
-    if proc.stderr is not None:
-        sel.register(proc.stderr, selectors.EVENT_READ, "stderr")
-
-    buffers = {"stdout": bytearray(), "stderr": bytearray()}
-    truncated = {"stdout": False, "stderr": False}
-    open_streams = len(sel.get_map())
+async def _read_capped(stream: Optional[asyncio.StreamReader], buf: bytearray) -> None:
+    """Append at most ``_CAPTURE_CAP_BYTES`` of ``stream`` to ``buf``.
 
-    timed_out = False
-    while open_streams > 0:
-        remaining = deadline - time.monotonic()
-        if remaining <= 0:
-            timed_out = True
-            break
-        for key, _ in sel.select(timeout=min(remaining, 0.5)):
-            chunk = key.fileobj.read1(64 * 1024)  # type: ignore[union-attr]
-            name = key.data
-            if not chunk:
-                sel.unregister(key.fileobj)
-                open_streams -= 1
-                continue
-            buf = buffers[name]
-            if len(buf) < _CAPTURE_CAP_BYTES:
-                room = _CAPTURE_CAP_BYTES - len(buf)
-                buf.extend(chunk[:room])
-                if len(chunk) > room and not truncated[name]:
-                    buf.extend(_TRUNCATED_NOTE)
-                    truncated[name] = True
-            # Else: drop on the floor but keep draining the pipe so the
-            # child does not block on a full pipe.
-
-    return bytes(buffers["stdout"]), bytes(buffers["stderr"]), timed_out
+    Bytes past the cap are still drained from the pipe (so the child does
+    not block on a full pipe) but discarded.
+    """
+    if stream is None:
+        return
+    truncated = False
+    while True:
+        chunk = await stream.read(_READ_CHUNK_BYTES)
+        if not chunk:
+            return
+        if len(buf) < _CAPTURE_CAP_BYTES:
+            room = _CAPTURE_CAP_BYTES - len(buf)
+            buf.extend(chunk[:room])
+            if len(chunk) > room and not truncated:
+                buf.extend(_TRUNCATED_NOTE)
+                truncated = True
 
 
 _KEEP_ENV = {
@@ -0,0 +1,297 @@
+"""Server side of the zygote fork server (``_zygote_v2.py``).
+
+With ``CODE_EXECUTOR_V2_ZYGOTE=1`` the server starts one zygote process at
+boot. The zygote pre-imports ``CODE_EXECUTOR_V2_ZYGOTE_PRELOAD`` and forks
+a sandboxed child per ``python`` call, so a call skips interpreter startup
+and the heavy imports. ``Zygote.run`` has the same contract as
+``run_sandboxed_async`` (same limits, capture caps, timeout and kill
+behaviour) and raises ``ZygoteUnavailable`` when the caller should use
+the cold path instead: while the zygote is still importing, after it
+died (it is restarted in the background), or when the source is too
+large for one control message.
+
+BLAS / OpenMP libraries are pinned to one thread in the zygote: forking
+a process whose thread pools are already running leaves the child with
+pools whose threads no longer exist.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from sandbox.launcher import (
+    SandboxLimits,
+    SandboxResult,
+    _scrub_env,
+    run_sandboxed_async,
+    supervise,
+)
+
+logger = logging.getLogger(__name__)
+
+_ZYGOTE_PATH = str(Path(__file__).resolve().parent / "_zygote_v2.py")
+
+# Larger sources go through the cold path; a control message must fit in
+# the socket buffer.
+MAX_SOURCE_BYTES = 64 * 1024
+_RESTART_BACKOFF_S = 30.0
+_ZYGOTE_ENV = {
+    "OPENBLAS_NUM_THREADS": "1",
+    "OMP_NUM_THREADS": "1",
+    "MKL_NUM_THREADS": "1",
+}
+
+
+class ZygoteUnavailable(RuntimeError):
+    """The zygote cannot take this run; use the cold path."""
+
+
+class LatencyStats:
+    """Per-mode (``cold`` / ``warm``) wall-time counters for ``info()``."""
+
+    def __init__(self) -> None:
+        self._runs: Dict[str, Tuple[int, float, float]] = {}
+
+    def record(self, mode: str, seconds: float) -> None:
+        count, total, _ = self._runs.get(mode, (0, 0.0, 0.0))
+        self._runs[mode] = (count + 1, total + seconds, seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            mode: {
+                "runs": count,
+                "mean_s": round(total / count, 4),
+                "last_s": round(last, 4),
+            }
+            for mode, (count, total, last) in self._runs.items()
+        }
+
+
+class Zygote:
+    def __init__(self, preload: Sequence[str]) -> None:
+        self.preload = tuple(preload)
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._sock: Optional[socket.socket] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._restart: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+        self._info: Dict[str, Any] = {}
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._started_at = 0.0
+        self._stopped = False
+        self.restarts = 0
+        # Cold vs warm wall time of importing the preload set, measured
+        # once the zygote is ready (see ``measure_startup``).
+        self.startup_probe: Optional[Dict[str, Any]] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    async def start(self) -> None:
+        """Spawn the zygote; it reports ready once its imports finish."""
+        parent, child = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        try:
+            self._proc = await asyncio.create_subprocess_exec(
+                sys.executable, _ZYGOTE_PATH,
+                "--control-fd", str(child.fileno()),
+                "--preload", ",".join(self.preload),
+                pass_fds=(child.fileno(),),
+                env=_scrub_env(_ZYGOTE_ENV),
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.DEVNULL,
+                cwd="/",
+            )
+        except Exception:
+            parent.close()
+            raise
+        finally:
+            child.close()
+        parent.setblocking(False)
+        self._sock = parent
+        self._started_at = time.monotonic()
+        self._reader = asyncio.create_task(
+            self._read_loop(parent), name="code-executor-v2-zygote"
+        )
+        logger.info("zygote started (pid %s), preloading %s", self._proc.pid, self.preload)
+
+    async def wait_ready(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def stop(self) -> None:
+        self._stopped = True
+        for task in (self._restart, self._reader):
+            if task is not None:
+                task.cancel()
+        if self._sock is not None:
+            # EOF makes the zygote kill its children and exit.
+            self._sock.close()
+            self._sock = None
+        if self._proc is not None and self._proc.returncode is None:
+            try:
+                await asyncio.wait_for(self._proc.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                self._proc.kill()
+                await self._proc.wait()
+
+    async def run(self, source: str, workdir: str, limits: SandboxLimits) -> SandboxResult:
+        """Run ``source`` in a forked, sandboxed child of the zygote."""
+        sock = self._sock
+        if not self.ready or sock is None:
+            self._maybe_restart()
+            raise ZygoteUnavailable("zygote not ready")
+        if len(source.encode("utf-8")) > MAX_SOURCE_BYTES:
+            raise ZygoteUnavailable("source too large for the zygote")
+        workdir = str(workdir)
+        if not os.path.isdir(workdir):
+            raise FileNotFoundError(workdir)
+
+        loop = asyncio.get_running_loop()
+        rid = next(self._ids)
+        exit_status: asyncio.Future = loop.create_future()
+        self._pending[rid] = exit_status
+        transports = []
+        try:
+            readers = []
+            write_ends = []
+            for _ in range(2):
+                read_fd, write_fd = os.pipe()
+                write_ends.append(write_fd)
+                reader = asyncio.StreamReader()
+                transport, _ = await loop.connect_read_pipe(
+                    lambda reader=reader: asyncio.StreamReaderProtocol(reader),
+                    os.fdopen(read_fd, "rb", buffering=0),
+                )
+                transports.append(transport)
+                readers.append(reader)
+            request = {
+                "id": rid,
+                "workdir": workdir,
+                "mem_mb": limits.mem_mb,
+                "cpu_s": limits.cpu_s,
+                "fsize_mb": limits.fsize_mb,
+                "nproc": limits.nproc,
+                "source": source,
+            }
+            try:
+                socket.send_fds(sock, [json.dumps(request).encode("utf-8")], write_ends)
+            except OSError as e:
+                raise ZygoteUnavailable(f"zygote unreachable: {e}") from e
+            finally:
+                for fd in write_ends:
+                    os.close(fd)
+
+            def kill() -> None:
+                try:
+                    sock.send(json.dumps({"kill": rid}).encode("utf-8"))
+                except OSError:
+                    # The zygote is gone, and took the child with it.
+                    pass
+
+            try:
+                return await supervise(
+                    readers[0], readers[1],
+                    lambda: asyncio.shield(exit_status),
+                    kill,
+                    wall_s=max(limits.wall_s, 1),
+                )
+            except ZygoteUnavailable:
+                # The request was sent, so the code may have partly run;
+                # report the failure rather than running it again cold.
+                return SandboxResult(
+                    returncode=-1,
+                    stdout="",
+                    stderr="code executor worker exited during the run\n",
+                    timed_out=False,
+                    wall_seconds=0.0,
+                )
+        finally:
+            self._pending.pop(rid, None)
+            for transport in transports:
+                transport.close()
+
+    async def measure_startup(self, workdir: str, limits: SandboxLimits) -> Dict[str, Any]:
+        """Time importing the preload set cold and warm, for ``info()``."""
+        preloaded = self._info.get("preloaded") or []
+        source = "import " + ", ".join(preloaded) if preloaded else "pass"
+        cold = await run_sandboxed_async(["python", "-c", source], workdir=workdir, limits=limits)
+        warm = await self.run(source, workdir, limits)
+        self.startup_probe = {
+            "source": source,
+            "cold_s": cold.wall_seconds,
+            "warm_s": warm.wall_seconds,
+            "ok": cold.returncode == 0 and warm.returncode == 0,
+        }
+        logger.info("zygote startup probe: %s", self.startup_probe)
+        return self.startup_probe
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "ready": self.ready,
+            "pid": self._proc.pid if self._proc is not None else None,
+            "preloaded": self._info.get("preloaded", []),
+            "preload_failed": self._info.get("failed", {}),
+            "zygote_startup_s": self._info.get("startup_s"),
+            "in_flight": len(self._pending),
+            "restarts": self.restarts,
+            "startup_probe": self.startup_probe,
+        }
+
+    async def _read_loop(self, sock: socket.socket) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                data = await loop.sock_recv(sock, 65536)
+                if not data:
+                    break
+                msg = json.loads(data)
+                if msg.get("ready"):
+                    self._info = msg
+                    self._ready.set()
+                    if msg.get("failed"):
+                        logger.warning("zygote could not preload: %s", msg["failed"])
+                    logger.info(
+                        "zygote ready in %.2fs (preloaded %s)",
+                        msg.get("startup_s", 0.0), msg.get("preloaded"),
+                    )
+                    continue
+                waiter = self._pending.get(msg.get("id"))
+                if waiter is not None and "status" in msg and not waiter.done():
+                    waiter.set_result(int(msg["status"]))
+        except (OSError, ValueError) as e:
+            logger.warning("zygote control channel failed: %s", e)
+        finally:
+            self._ready.clear()
+            for waiter in self._pending.values():
+                if not waiter.done():
+                    waiter.set_exception(ZygoteUnavailable("zygote exited"))
+            if not self._stopped:
+                logger.warning("zygote exited; calls use the cold path until it restarts")
+
+    def _maybe_restart(self) -> None:
+        if self._stopped or (self._restart is not None and not self._restart.done()):
+            return
+        if self._reader is not None and not self._reader.done():
+            return  # still starting up
+        if time.monotonic() - self._started_at < _RESTART_BACKOFF_S:
+            return
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self.restarts += 1
+        self._restart = asyncio.create_task(self.start())
@@ -7,6 +7,11 @@ The directory is wiped on:
 * idle TTL exceeded (background reaper)
 * server shutdown (graceful)
 
+Components that keep per-session state outside the workspace (the
+persistent kernels) hook in with ``on_destroy``, called whenever a
+session's workspace is wiped, and ``on_sweep``, called on every reaper
+pass.
+
 The session_id is derived from the FastMCP context. The session_state
 store gives us per-session persistence of metadata across tool calls.
 """
@@ -18,9 +23,9 @@ import logging
 import shutil
 import time
 import uuid
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 
 logger = logging.getLogger(__name__)
@@ -32,7 +37,9 @@ class SessionRecord:
     workspace: Path
     created_at: float
     last_used: float
-    last_seen_mtimes: Dict[str, float] = field(default_factory=dict)
+    # ``artifacts.WorkspaceTracker``, created on first use; closed and
+    # dropped whenever the workspace is wiped.
+    tracker: Optional[Any] = None
 
 
 class SessionRegistry:
@@ -50,6 +57,8 @@ class SessionRegistry:
         ttl_s: int,
         max_sessions: int,
         reaper_interval_s: int = 300,
+        on_destroy: Optional[Callable[[str], None]] = None,
+        on_sweep: Optional[Callable[[], None]] = None,
     ) -> None:
         self._root = Path(workspaces_dir)
         self._root.mkdir(parents=True, exist_ok=True)
@@ -60,6 +69,8 @@ class SessionRegistry:
         self._lock = asyncio.Lock()
         self._reaper_task: Optional[asyncio.Task] = None
         self._stopped = False
+        self._on_destroy = on_destroy
+        self._on_sweep = on_sweep
 
     async def start(self) -> None:
         """Wipe any stale workspaces from a prior process and start the reaper."""
@@ -123,7 +134,6 @@ class SessionRegistry:
                 raise KeyError(session_id)
             self._destroy_record(record)
             record.workspace.mkdir(parents=True, exist_ok=True)
-            record.last_seen_mtimes = {}
             record.last_used = time.time()
             return record
 
@@ -134,6 +144,16 @@ class SessionRegistry:
                 self._destroy_record(record)
 
     def _destroy_record(self, record: SessionRecord) -> None:
+        if record.tracker is not None:
+            record.tracker.close()
+            record.tracker = None
+        if self._on_destroy is not None:
+            try:
+                self._on_destroy(record.session_id)
+            except Exception as e:
+                logger.warning(
+                    "on_destroy hook failed for %s: %s", record.session_id, e
+                )
         try:
             if record.workspace.exists():
                 shutil.rmtree(record.workspace)
@@ -161,6 +181,11 @@ class SessionRegistry:
                         sid, time.time() - rec.last_used,
                     )
                     self._destroy_record(rec)
+            if self._on_sweep is not None:
+                try:
+                    self._on_sweep()
+                except Exception as e:
+                    logger.warning("on_sweep hook failed: %s", e)
 
     def stats(self) -> Dict[str, object]:
         return {
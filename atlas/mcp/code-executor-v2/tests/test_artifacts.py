@@ -1,9 +1,16 @@
-"""Artifact diff + MIME packaging."""
+"""Workspace change tracking + MIME packaging."""
 import base64
+import os
 import time
 from pathlib import Path
 
-from artifacts import diff_artifacts, mime_for, pick_primary, snapshot_mtimes
+import pytest
+from artifacts import (
+    WorkspaceTracker,
+    mime_for,
+    package_artifacts,
+    pick_primary,
+)
 
 
 def test_mime_known_extensions():
@@ -12,31 +19,30 @@ def test_mime_known_extensions():
     assert mime_for("c.unknown") == ("application/octet-stream", "auto")
 
 
-def test_diff_returns_only_new_files(tmp_path: Path):
-    (tmp_path / "old.txt").write_text("old")
-    before = snapshot_mtimes(tmp_path)
-    time.sleep(0.05)
-    (tmp_path / "new.txt").write_text("new")
-    arts = diff_artifacts(tmp_path, before=before, artifact_cap_bytes=1024)
-    names = [a["name"] for a in arts]
+def _package_changes(tracker):
+    arts, _ = package_artifacts(tracker.workspace, tracker.changes(), artifact_cap_bytes=1024)
+    return arts
+
+
+def test_tracked_run_packages_only_new_files(tracker):
+    tracker.begin()
+    (tracker.workspace / "new.txt").write_text("new")
+    names = [a["name"] for a in _package_changes(tracker)]
     assert "new.txt" in names
     assert "old.txt" not in names
 
 
-def test_diff_returns_modified_files(tmp_path: Path):
-    p = tmp_path / "x.txt"
-    p.write_text("a")
-    before = snapshot_mtimes(tmp_path)
+def test_tracked_run_packages_modified_files(tracker):
+    tracker.begin()
     time.sleep(0.05)
-    p.write_text("b")
-    arts = diff_artifacts(tmp_path, before=before, artifact_cap_bytes=1024)
-    assert any(a["name"] == "x.txt" for a in arts)
+    (tracker.workspace / "old.txt").write_text("b")
+    assert any(a["name"] == "old.txt" for a in _package_changes(tracker))
 
 
 def test_oversize_artifact_referenced_not_inlined(tmp_path: Path):
     big = tmp_path / "huge.bin"
     big.write_bytes(b"\0" * 2048)
-    arts = diff_artifacts(tmp_path, before={}, artifact_cap_bytes=1024)
+    arts, _ = package_artifacts(tmp_path, ["huge.bin"], artifact_cap_bytes=1024)
     assert len(arts) == 1
     assert arts[0].get("oversize") is True
     assert "b64" not in arts[0]
@@ -45,7 +51,7 @@ def test_oversize_artifact_referenced_not_inlined(tmp_path: Path):
 def test_inline_artifact_decodes(tmp_path: Path):
     payload = b"hello world"
     (tmp_path / "x.txt").write_bytes(payload)
-    arts = diff_artifacts(tmp_path, before={}, artifact_cap_bytes=1024)
+    arts, _ = package_artifacts(tmp_path, ["x.txt"], artifact_cap_bytes=1024)
     assert len(arts) == 1
     assert base64.b64decode(arts[0]["b64"]) == payload
 
@@ -65,3 +71,78 @@ def test_pick_primary_falls_back(tmp_path: Path):
 
 def test_pick_primary_empty():
     assert pick_primary([]) is None
+
+
+def test_budget_turns_later_artifacts_into_references(tmp_path: Path):
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (tmp_path / name).write_bytes(b"x" * 600)
+    arts, omitted = package_artifacts(
+        tmp_path, ["a.txt", "b.txt", "c.txt"],
+        artifact_cap_bytes=1024, budget_bytes=1000, max_count=2,
+    )
+    assert omitted == 1
+    assert [a["name"] for a in arts] == ["a.txt", "b.txt"]
+    assert "b64" in arts[0]
+    assert arts[1].get("over_budget") is True
+    assert "b64" not in arts[1]
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "scan"])
+def tracker(request, tmp_path: Path):
+    (tmp_path / "old.txt").write_text("old")
+    t = WorkspaceTracker(tmp_path, use_inotify=request.param)
+    if request.param and t.mode != "inotify":
+        pytest.skip("inotify not available")
+    yield t
+    t.close()
+
+
+def test_tracker_reports_only_changes_since_begin(tracker):
+    ws = tracker.workspace
+    tracker.begin()
+    (ws / "new.txt").write_text("new")
+    (ws / "sub" / "deep").mkdir(parents=True)
+    (ws / "sub" / "deep" / "x.csv").write_text("1,2")
+    os.symlink("/etc/passwd", ws / "link")
+    assert tracker.changes() == ["new.txt", os.path.join("sub", "deep", "x.csv")]
+    assert tracker.bytes_used == len("old") + len("new") + len("1,2")
+
+    (ws / "new.txt").write_text("newer")
+    (ws / "old.txt").unlink()
+    assert tracker.changes() == ["new.txt"]
+    assert tracker.bytes_used == len("newer") + len("1,2")
+
+
+def test_tracker_ignores_changes_made_between_runs(tracker):
+    ws = tracker.workspace
+    tracker.begin()
+    tracker.changes()
+    (ws / "uploaded.txt").write_text("u")
+    tracker.invalidate()
+    tracker.begin()
+    (ws / "made.txt").write_text("m")
+    assert tracker.changes() == ["made.txt"]
+
+
+def test_scan_mode_skips_prerun_walk_when_clean(tmp_path: Path):
+    t = WorkspaceTracker(tmp_path, use_inotify=False)
+    t.begin()
+    t.changes()
+    t.begin()
+    assert t.rescans == 2
+    t.invalidate()
+    t.begin()
+    assert t.rescans == 3
+
+
+def test_inotify_mode_does_not_rescan(tmp_path: Path):
+    t = WorkspaceTracker(tmp_path)
+    if t.mode != "inotify":
+        pytest.skip("inotify not available")
+    try:
+        t.begin()
+        (tmp_path / "a.txt").write_text("a")
+        assert t.changes() == ["a.txt"]
+        assert t.rescans == 1
+    finally:
+        t.close()
@@ -0,0 +1,176 @@
+"""Non-blocking execution: async launcher, limiter, and a concurrent load test.
+
+The launcher tests drive ``_run_capped`` with the parent's interpreter so
+they run on any host; the load test through the full sandbox is skipped
+where the kernel cannot sandbox (as in ``test_sandbox.py``).
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from limiter import ExecutionLimiter, ExecutorBusy
+from sandbox import launcher
+from sandbox.kernel_probe import probe_kernel
+from sandbox.launcher import SandboxLimits, run_sandboxed_async
+
+
+async def _run(code: str, tmp_path: Path, wall_s: float = 10):
+    return await launcher._run_capped(
+        [sys.executable, "-c", code], env=os.environ, cwd=str(tmp_path), wall_s=wall_s,
+    )
+
+
+class _Heartbeat:
+    """Measures the longest stall of the event loop while active."""
+
+    def __init__(self, interval: float = 0.02) -> None:
+        self.interval = interval
+        self.max_gap = 0.0
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._beat())
+        return self
+
+    async def __aexit__(self, *exc):
+        self._task.cancel()
+
+    async def _beat(self) -> None:
+        last = time.monotonic()
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.max_gap = max(self.max_gap, now - last - self.interval)
+            last = now
+
+
+async def test_sessions_progress_independently(tmp_path: Path):
+    """N one-second runs finish in about one second, not N, and the
+    event loop never stalls meanwhile."""
+    sessions = 6
+    limiter = ExecutionLimiter(max_concurrent=sessions)
+    code = "import time; time.sleep(1); print('done')"
+
+    async def session(i: int):
+        ws = tmp_path / f"s{i}"
+        ws.mkdir()
+        async with limiter.slot(f"s{i}"):
+            return await _run(code, ws)
+
+    start = time.monotonic()
+    async with _Heartbeat() as heartbeat:
+        results = await asyncio.gather(*(session(i) for i in range(sessions)))
+    elapsed = time.monotonic() - start
+
+    assert [r.stdout.strip() for r in results] == ["done"] * sessions
+    assert all(r.returncode == 0 and not r.timed_out for r in results)
+    assert elapsed < sessions * 0.5
+    assert heartbeat.max_gap < 0.25
+
+
+async def test_timeout_kills_child_and_keeps_output(tmp_path: Path):
+    res = await _run("import time; print('started', flush=True); time.sleep(30)", tmp_path, wall_s=1)
+    assert res.timed_out
+    assert res.returncode == -1
+    assert "started" in res.stdout
+    assert res.wall_seconds < 5
+
+
+async def test_capture_is_capped(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(launcher, "_CAPTURE_CAP_BYTES", 1000)
+    res = await _run("import sys; sys.stdout.write('x' * 500_000); sys.stderr.write('err')", tmp_path)
+    assert res.returncode == 0
+    assert res.stdout.startswith("x" * 1000)
+    assert res.stdout.endswith("[capture truncated]\n")
+    assert res.stderr == "err"
+
+
+async def test_cancelling_the_caller_kills_the_child(tmp_path: Path):
+    pid_file = tmp_path / "pid"
+    code = f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); time.sleep(30)"
+    task = asyncio.create_task(_run(code, tmp_path, wall_s=60))
+    while not pid_file.exists() or not pid_file.read_text():
+        await asyncio.sleep(0.02)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    pid = int(pid_file.read_text())
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+
+
+async def test_limiter_bounds_global_and_per_session_concurrency():
+    limiter = ExecutionLimiter(max_concurrent=2, max_per_session=1, max_queued=10)
+    peak = {"global": 0, "a": 0}
+    active = {"global": 0, "a": 0}
+
+    async def run(session_id: str):
+        async with limiter.slot(session_id):
+            for key in ("global", session_id):
+                if key in active:
+                    active[key] += 1
+                    peak[key] = max(peak[key], active[key])
+            await asyncio.sleep(0.05)
+            for key in ("global", session_id):
+                if key in active:
+                    active[key] -= 1
+
+    await asyncio.gather(run("a"), run("a"), run("a"), run("b"), run("c"), run("d"))
+    assert peak == {"global": 2, "a": 1}
+    assert limiter.stats()["running"] == 0
+    assert limiter.stats()["queued"] == 0
+    assert limiter._sessions == {}
+
+
+async def test_full_queue_is_rejected():
+    limiter = ExecutionLimiter(max_concurrent=1, max_queued=1)
+    release = asyncio.Event()
+
+    async def hold(session_id: str):
+        async with limiter.slot(session_id):
+            await release.wait()
+
+    running = asyncio.create_task(hold("a"))
+    queued = asyncio.create_task(hold("b"))
+    await asyncio.sleep(0.01)
+    assert limiter.stats()["running"] == 1
+    assert limiter.stats()["queued"] == 1
+
+    with pytest.raises(ExecutorBusy):
+        async with limiter.slot("c"):
+            pass
+
+    release.set()
+    await asyncio.gather(running, queued)
+    async with limiter.slot("c"):
+        assert limiter.stats()["running"] == 1
+
+
+KERNEL = probe_kernel()
+
+
+@pytest.mark.skipif(not KERNEL.all_supported, reason="kernel does not support full sandbox")
+async def test_sandboxed_sessions_progress_independently(tmp_path: Path):
+    limits = SandboxLimits(mem_mb=512, cpu_s=5, fsize_mb=8, nproc=32, wall_s=10)
+    sessions = 4
+
+    async def session(i: int):
+        ws = tmp_path / f"s{i}"
+        ws.mkdir()
+        return await run_sandboxed_async(
+            ["python", "-c", "import time; time.sleep(1); print('done')"],
+            workdir=str(ws),
+            limits=limits,
+        )
+
+    start = time.monotonic()
+    async with _Heartbeat() as heartbeat:
+        results = await asyncio.gather(*(session(i) for i in range(sessions)))
+    assert [r.stdout.strip() for r in results] == ["done"] * sessions
+    assert time.monotonic() - start < sessions * 0.75
+    assert heartbeat.max_gap < 0.25
@@ -0,0 +1,138 @@
+"""Per-session persistent interpreters.
+
+The kernel tests run real sandboxed interpreters, so they are skipped
+where a cold sandboxed run does not work either. The eviction tests use
+stand-in kernels and always run.
+"""
+from __future__ import annotations
+
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from sandbox.kernel import KernelPool
+from sandbox.launcher import SandboxLimits, run_sandboxed
+
+
+def _sandbox_runs() -> bool:
+    try:
+        res = run_sandboxed(
+            ["python", "-c", "pass"], workdir=tempfile.gettempdir(),
+            limits=SandboxLimits(wall_s=10),
+        )
+    except Exception:
+        return False
+    return res.returncode == 0
+
+
+needs_sandbox = pytest.mark.skipif(not _sandbox_runs(), reason="sandboxed runs do not work on this host")
+
+LIMITS = SandboxLimits(mem_mb=512, cpu_s=5, fsize_mb=8, nproc=32, wall_s=10)
+
+
+@pytest.fixture
+def pool():
+    p = KernelPool(limits=LIMITS, idle_s=60, mem_budget_mb=0)
+    yield p
+    p.close()
+
+
+@needs_sandbox
+async def test_globals_survive_between_calls(pool, tmp_path: Path):
+    res = await pool.run("s1", str(tmp_path), "import os\nx = 41\nprint(os.getcwd())", LIMITS)
+    assert res.returncode == 0
+    assert res.stdout == f"{tmp_path}\n"
+
+    res = await pool.run("s1", str(tmp_path), "x += 1\nprint(x)", LIMITS)
+    assert (res.returncode, res.stdout) == (0, "42\n")
+    assert pool.session_stats("s1")["runs"] == 2
+
+    res = await pool.run("s1", str(tmp_path), "try:\n    open('/etc/kernel-escape', 'w')\n"
+                         "except OSError as e:\n    print('denied', type(e).__name__)", LIMITS)
+    assert res.stdout == "denied PermissionError\n"
+
+    res = await pool.run("s1", str(tmp_path), "raise ValueError('boom')", LIMITS)
+    assert res.returncode == 1
+    assert "ValueError: boom" in res.stderr
+    res = await pool.run("s1", str(tmp_path), "import sys; print(x); sys.exit(3)", LIMITS)
+    assert (res.returncode, res.stdout) == (3, "42\n")
+
+
+@needs_sandbox
+async def test_timeout_interrupts_and_keeps_state(pool, tmp_path: Path):
+    await pool.run("s1", str(tmp_path), "x = 1", LIMITS)
+    res = await pool.run(
+        "s1", str(tmp_path), "import time; print('started', flush=True); time.sleep(30)",
+        SandboxLimits(wall_s=1),
+    )
+    assert res.timed_out and res.returncode == -1
+    assert "started" in res.stdout
+    assert "state from earlier calls was kept" in res.stderr
+
+    res = await pool.run("s1", str(tmp_path), "print(x)", LIMITS)
+    assert res.stdout == "1\n"
+
+
+@needs_sandbox
+async def test_discard_and_exit_start_an_empty_kernel(pool, tmp_path: Path):
+    await pool.run("s1", str(tmp_path), "x = 1", LIMITS)
+    pool.discard("s1")
+    assert pool.session_stats("s1") == {"alive": False}
+    res = await pool.run("s1", str(tmp_path), "print('x' in globals())", LIMITS)
+    assert res.stdout == "False\n"
+    assert pool.session_stats("s1")["runs"] == 1
+
+    res = await pool.run("s1", str(tmp_path), "import os; os._exit(0)", LIMITS)
+    assert res.returncode != 0
+    assert "state was lost" in res.stderr
+    assert pool.session_stats("s1") == {"alive": False}
+
+
+class _FakeKernel:
+    def __init__(self, session_id: str, rss_mb: int, last_used: float) -> None:
+        self.session_id = session_id
+        self.rss = rss_mb * 1024 * 1024
+        self.last_used = last_used
+        self.alive = True
+        self.busy = False
+
+    def rss_bytes(self) -> int:
+        return self.rss if self.alive else 0
+
+    def kill(self) -> None:
+        self.alive = False
+
+
+def _pool_with(*kernels: _FakeKernel, idle_s: int = 60, mem_budget_mb: int = 0) -> KernelPool:
+    pool = KernelPool(limits=LIMITS, idle_s=idle_s, mem_budget_mb=mem_budget_mb)
+    for k in kernels:
+        pool._kernels[k.session_id] = k
+    return pool
+
+
+def test_sweep_reaps_idle_kernels_only():
+    now = time.monotonic()
+    idle, fresh, busy = _FakeKernel("idle", 1, now - 120), _FakeKernel("fresh", 1, now), _FakeKernel("busy", 1, now - 120)
+    busy.busy = True
+    pool = _pool_with(idle, fresh, busy)
+
+    pool.sweep()
+
+    assert not idle.alive and fresh.alive and busy.alive
+    assert set(pool._kernels) == {"fresh", "busy"}
+    assert pool.stats()["evictions"] == {"idle": 1, "memory": 0}
+
+
+def test_memory_pressure_evicts_least_recently_used_first():
+    now = time.monotonic()
+    oldest, older, newest = (
+        _FakeKernel("a", 300, now - 30), _FakeKernel("b", 300, now - 20), _FakeKernel("c", 300, now - 10),
+    )
+    pool = _pool_with(oldest, older, newest, mem_budget_mb=700)
+
+    pool.evict_for_memory(exclude="a")
+
+    assert oldest.alive and not older.alive and newest.alive
+    assert pool.stats()["evictions"] == {"idle": 0, "memory": 1}
@@ -87,3 +87,24 @@ async def test_start_wipes_pre_existing(tmp_path: Path):
         assert not leftover.exists()
     finally:
         await reg.stop()
+
+
+@pytest.mark.asyncio
+async def test_hooks_run_on_reset_destroy_and_sweep(tmp_path: Path):
+    destroyed, sweeps = [], []
+    reg = SessionRegistry(
+        tmp_path, ttl_s=60, max_sessions=10, reaper_interval_s=1,
+        on_destroy=destroyed.append, on_sweep=lambda: sweeps.append(1),
+    )
+    await reg.get_or_create("s1")
+    await reg.get_or_create("s2")
+    await reg.reset("s1")
+    await reg.destroy("s2")
+    assert destroyed == ["s1", "s2"]
+
+    await reg.start()
+    try:
+        await asyncio.sleep(1.5)
+        assert sweeps
+    finally:
+        await reg.stop()
@@ -0,0 +1,133 @@
+"""Warm starts through the zygote fork server.
+
+These run real sandboxed children, so they are skipped where a cold
+sandboxed run does not work either. Preloads use stdlib modules so the
+tests do not depend on the data-science stack being installed.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from sandbox import zygote as zygote_module
+from sandbox.launcher import SandboxLimits, run_sandboxed
+from sandbox.zygote import MAX_SOURCE_BYTES, LatencyStats, Zygote, ZygoteUnavailable
+
+
+def _sandbox_runs() -> bool:
+    try:
+        res = run_sandboxed(
+            ["python", "-c", "pass"], workdir=tempfile.gettempdir(),
+            limits=SandboxLimits(wall_s=10),
+        )
+    except Exception:
+        return False
+    return res.returncode == 0
+
+
+pytestmark = pytest.mark.skipif(not _sandbox_runs(), reason="sandboxed runs do not work on this host")
+
+LIMITS = SandboxLimits(mem_mb=512, cpu_s=5, fsize_mb=8, nproc=32, wall_s=10)
+
+
+@pytest.fixture
+async def zygote():
+    z = Zygote(["decimal", "no_such_module_xyz"])
+    await z.start()
+    assert await z.wait_ready(timeout=30)
+    yield z
+    await z.stop()
+
+
+async def test_warm_run_behaves_like_a_fresh_sandboxed_interpreter(zygote, tmp_path: Path):
+    code = (
+        "import os, sys\n"
+        "print(os.getcwd(), 'decimal' in sys.modules, sys.path[0] == '')\n"
+        "open('out.txt', 'w').write('hi')\n"
+        "try:\n"
+        "    open('/etc/zygote-escape', 'w')\n"
+        "except OSError as e:\n"
+        "    print('denied', type(e).__name__)\n"
+        "sys.exit(3)\n"
+    )
+    res = await zygote.run(code, str(tmp_path), LIMITS)
+
+    assert res.returncode == 3
+    assert res.stdout.splitlines() == [f"{tmp_path} True True", "denied PermissionError"]
+    assert (tmp_path / "out.txt").read_text() == "hi"
+    assert zygote.stats()["preloaded"] == ["decimal"]
+    assert "no_such_module_xyz" in zygote.stats()["preload_failed"]
+
+    res = await zygote.run("raise ValueError('boom')", str(tmp_path), LIMITS)
+    assert res.returncode == 1
+    assert "ValueError: boom" in res.stderr
+
+
+async def test_timeouts_and_concurrent_runs(zygote, tmp_path: Path):
+    res = await zygote.run(
+        "import time; print('started', flush=True); time.sleep(30)",
+        str(tmp_path), SandboxLimits(wall_s=1),
+    )
+    assert res.timed_out and res.returncode == -1
+    assert "started" in res.stdout
+
+    results = await asyncio.gather(*(
+        zygote.run("import time; time.sleep(1); print('done')", str(tmp_path), LIMITS)
+        for _ in range(4)
+    ))
+    assert [r.stdout for r in results] == ["done\n"] * 4
+    assert max(r.wall_seconds for r in results) < 3
+
+
+async def test_startup_probe_reports_cold_and_warm(zygote, tmp_path: Path):
+    probe = await zygote.measure_startup(str(tmp_path), LIMITS)
+    assert probe["source"] == "import decimal"
+    assert probe["ok"]
+    assert zygote.stats()["startup_probe"] == probe
+
+
+async def test_falls_back_when_not_ready_or_too_large(tmp_path: Path):
+    z = Zygote([])
+    with pytest.raises(ZygoteUnavailable):
+        await z.run("print(1)", str(tmp_path), LIMITS)
+
+    await z.start()
+    try:
+        assert await z.wait_ready(timeout=30)
+        with pytest.raises(ZygoteUnavailable):
+            await z.run("#" * (MAX_SOURCE_BYTES + 1), str(tmp_path), LIMITS)
+    finally:
+        await z.stop()
+
+
+async def test_zygote_death_aborts_run_then_restarts(zygote, tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(zygote_module, "_RESTART_BACKOFF_S", 0)
+    run = asyncio.create_task(zygote.run("import time; time.sleep(30)", str(tmp_path), LIMITS))
+    await asyncio.sleep(0.3)
+    os.kill(zygote.stats()["pid"], signal.SIGKILL)
+
+    res = await asyncio.wait_for(run, timeout=10)
+    assert res.returncode == -1
+    assert "worker exited" in res.stderr
+
+    with pytest.raises(ZygoteUnavailable):
+        await zygote.run("print(1)", str(tmp_path), LIMITS)
+    assert await zygote.wait_ready(timeout=30)
+    assert zygote.restarts == 1
+    assert (await zygote.run("print(1)", str(tmp_path), LIMITS)).stdout == "1\n"
+
+
+def test_latency_stats():
+    stats = LatencyStats()
+    stats.record("cold", 1.0)
+    stats.record("cold", 2.0)
+    stats.record("warm", 0.1)
+    assert stats.snapshot() == {
+        "cold": {"runs": 2, "mean_s": 1.5, "last_s": 2.0},
+        "warm": {"runs": 1, "mean_s": 0.1, "last_s": 0.1},
+    }